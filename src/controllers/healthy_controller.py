@@ -4,18 +4,20 @@
 `/healthy` is a richer readiness probe that also checks the upstream
 exchange (`DEFAULT_EXCHANGE`).  When the exchange call fails or times out
 the endpoint downgrades to `degraded` so the load balancer can route
-traffic away while the process keeps responding.
+traffic away while the process keeps responding. It shares the exchange's
+circuit breaker with the endpoints (`circuit_breaker`): an open circuit
+reports `degraded` without probing, and the probe's outcome counts towards
+the breaker.
 """
 
 from __future__ import annotations
 
+import contextvars
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from os import getenv
 from typing import Any, Dict
 
-import ccxt
-
 _PROCESS_START_TS = time.time()
 _VERSION = getenv("APP_VERSION", "1.0.0")
 _APP_ID = getenv("APP_ID", "mmk-mcp-indicadors")
@@ -54,15 +56,30 @@ def root() -> Dict[str, Any]:
     return {"message": f"{_APP_ID} OK", "environment": _ENVIRONMENT}
 
 
-def _probe_exchange() -> str:
-    from controllers.metrics.market_data_service import DEFAULT_EXCHANGE
+def _breaker():
+    """Circuit breaker of `DEFAULT_EXCHANGE`'s pool (shared with the endpoints)."""
+    from controllers.metrics.market_data_service import DEFAULT_EXCHANGE, MarketDataService
 
+    return MarketDataService(exchange_name=DEFAULT_EXCHANGE).exchange.pool.breaker
+
+
+def _probe_exchange() -> str:
+    from controllers.metrics.call_accounting import call_service
+    from controllers.metrics.circuit_breaker import OPEN
+    from controllers.metrics.market_data_service import DEFAULT_EXCHANGE, MarketDataService
+
+    if _breaker().state == OPEN:
+        # Endpoints are already failing fast; don't add load. The half-open
+        # probe (this one or an endpoint's) decides when it closes.
+        return "error: circuit open"
     try:
-        client = getattr(ccxt, DEFAULT_EXCHANGE)(
-            {"enableRateLimit": True, "options": {"defaultType": "spot"}}
-        )
+        # The pooled client the endpoints use: the probe exercises the same
+        # session/markets, counts against the same rate-limit budget and
+        # feeds the same circuit breaker.
+        client = MarketDataService(exchange_name=DEFAULT_EXCHANGE).exchange
         with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(client.fetch_ticker, "BTC/USDT")
+            with call_service("healthy"):
+                future = executor.submit(contextvars.copy_context().run, client.fetch_ticker, "BTC/USDT")
             future.result(timeout=_EXCHANGE_PROBE_TIMEOUT_S)
         return "ok"
     except FutureTimeoutError:
@@ -80,6 +97,7 @@ def healthy() -> Dict[str, Any]:
         "status": overall,
         "exchange": DEFAULT_EXCHANGE,
         "exchange_status": exchange_status,
+        "circuit": _breaker().snapshot(),
         "uptime_seconds": int(time.time() - _PROCESS_START_TS),
         "version": _VERSION,
         "environment": _ENVIRONMENT,
@@ -95,8 +95,13 @@ class AveragesService:
             }
         """
         # 1. Obtener datos de mercado
-        df = self._load_market_data()
+        return self._build(self._load_market_data())
 
+    async def execute_async(self) -> Dict[str, Any]:
+        """Igual que `execute`, sin bloquear el event loop en la descarga."""
+        return self._build(await self._load_market_data_async())
+
+    def _build(self, df: pd.DataFrame) -> Dict[str, Any]:
         # 2. Filtrar por rango
         df_range = df.loc[self.start : self.end]
         if df_range.empty or len(df_range) < 2:
@@ -234,3 +239,7 @@ class AveragesService:
         # descargamos un bloque más grande y filtramos localmente.
         df = svc.get_ohlcv(symbol=self.symbol, timeframe=self.timeframe, limit=self.candles_limit)
         return df
+
+    async def _load_market_data_async(self) -> pd.DataFrame:
+        svc = MarketDataService(exchange_name=self.exchange)
+        return await svc.get_ohlcv_async(symbol=self.symbol, timeframe=self.timeframe, limit=self.candles_limit)
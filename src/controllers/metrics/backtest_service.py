@@ -28,8 +28,13 @@ import math
 
 import pandas as pd
 
+from .exchange_clients import BACKTEST, call_priority
 from .indicators_service import IndicatorsService
-from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
+from .market_data_service import (
+    DEFAULT_EXCHANGE,
+    MarketDataService,
+    candle_gap_report,
+)
 from .rules_service import RulesService
 from .sizing_profiles import RiskProfile, atr_sizing_for
 
@@ -54,7 +59,7 @@ _BARS_PER_YEAR = {
     "1w": 52,
 }
 
-# Approximate timeframe -> milliseconds, used when paginating ccxt fetches.
+# Approximate timeframe -> milliseconds, used to size the warm-up window.
 _TIMEFRAME_MS = {
     "1m": 60_000,
     "5m": 5 * 60_000,
@@ -136,6 +141,8 @@ class BacktestService:
         self.max_concurrent_positions = max_concurrent_positions
         self.side = side
         self.warmup_bars = max(50, warmup_bars)
+        # Holes in the downloaded history, filled by `_fetch_paginated`.
+        self.data_gaps: List[Dict[str, Any]] = []
 
     # ------------------------------------------------------------------
     # Public entrypoint
@@ -187,7 +194,7 @@ class BacktestService:
                 equity_curve.append({"time": bar_time.isoformat(), "equity": equity})
                 continue
 
-            indicators = IndicatorsService(slice_df).calculate_all()
+            indicators = IndicatorsService(slice_df).calculate(RulesService.INPUTS | {"atr"})
             rules = rules_service.evaluate(indicators)
             signal = rules.get("signal")
             atr = float(indicators.get("atr") or 0.0)
@@ -225,6 +232,7 @@ class BacktestService:
         metrics["final_equity"] = equity
         metrics["symbol"] = self.symbol
         metrics["timeframe"] = self.timeframe
+        metrics["data_gaps"] = self.data_gaps
         return metrics
 
     # ------------------------------------------------------------------
@@ -452,37 +460,15 @@ class BacktestService:
         svc: MarketDataService,
         since_dt: datetime,
     ) -> pd.DataFrame:
-        exchange = svc.exchange
-        timeframe_ms = _TIMEFRAME_MS.get(self.timeframe, 60 * 60_000)
         since_ms = int(since_dt.timestamp() * 1000)
         end_ms = int(self.end.timestamp() * 1000)
-        # 200, NOT 1000 (known-errors E13): for ranges beyond its recent
-        # window bitget routes `since` to the history-candles endpoint, which
-        # serves at most 200 rows ending at `since + limit * duration`. With
-        # limit=1000 that silently ignores `since` (returns only the latest
-        # ~200 candles) or opens a gap; with limit=200 bitget honours `since`
-        # exactly, so forward pagination is gap-free (matches SetupBacktestService).
-        limit = 200
-        all_rows: List[List[Any]] = []
-        cursor = since_ms
-
-        while cursor < end_ms:
-            batch = exchange.fetch_ohlcv(
-                symbol=self.symbol,
-                timeframe=self.timeframe,
-                since=cursor,
-                limit=limit,
-            )
-            if not batch:
-                break
-            all_rows.extend(batch)
-            last_ts = batch[-1][0]
-            next_cursor = last_ts + timeframe_ms
-            if next_cursor <= cursor:
-                break  # exchange returned older data than asked for
-            cursor = next_cursor
-            if len(batch) < limit:
-                break
+        # Pages of HISTORY_PAGE_LIMIT (200, known-errors E13) so bitget's
+        # history-candles endpoint honours `since` — gap-free, downloaded
+        # concurrently and served from the persistent candle store first when
+        # one is configured.
+        # Queued behind live traffic on the shared exchange budget.
+        with call_priority(BACKTEST):
+            all_rows: List[List[Any]] = svc.fetch_history(self.symbol, self.timeframe, since_ms, end_ms)
 
         if not all_rows:
             raise ValueError("No OHLCV data returned from exchange")
@@ -492,6 +478,9 @@ class BacktestService:
         df = df.drop_duplicates(subset="timestamp").sort_values("timestamp")
         df.set_index("datetime", inplace=True)
         df = df[df.index <= self.end]
+        self.data_gaps = candle_gap_report(
+            df["timestamp"].tolist(), _TIMEFRAME_MS.get(self.timeframe, 60 * 60_000)
+        )
         return df
 
     @staticmethod
@@ -0,0 +1,243 @@
+"""Process-wide cache counters: hits, misses, evictions, fetch cost, size.
+
+Without numbers there is no way to tell whether the OHLCV caches, the
+enriched-frame cache or the ticker cache actually absorb traffic, nor to
+size `_CACHE_MAXSIZE` and the TTLs. Every cache reports into the shared
+`STATS` registry under a ``(cache, timeframe)`` series:
+
+* ``hits`` / ``misses`` — lookups served from memory vs. sent to the exchange
+  (or to `calculate_all` for the enriched frames);
+* ``evictions`` — entries dropped because the cache was full (``maxsize`` too
+  small) and ``expirations`` — entries dropped by their TTL;
+* ``fetches`` / ``fetch_seconds`` / ``fetch_seconds_max`` / ``rows_fetched``
+  — what each miss cost; ``resampled`` — misses built locally from a cached
+  lower timeframe instead (see `ohlcv_resample`); ``stale`` — misses answered
+  with the last cached frame while the exchange's circuit breaker was open;
+* ``entries`` / ``bytes`` — gauges sampled from the live caches at read time
+  (registered with :meth:`CacheStats.register_gauge`).
+
+`STATS.snapshot()` feeds the JSON endpoint and `STATS.render_prometheus()`
+the text exposition format (``/v1/cache/stats`` and ``/v1/cache/metrics``,
+both behind the API key).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from cachetools import Cache, TTLCache
+except Exception:  # pragma: no cover - cachetools is a hard runtime dep
+    Cache = TTLCache = None  # type: ignore[assignment,misc]
+
+# Series label used by caches that are not split by timeframe (tickers).
+NO_TIMEFRAME = "-"
+
+_COUNTERS = (
+    "hits", "misses", "evictions", "expirations", "fetches", "fetch_seconds", "rows_fetched", "resampled", "stale",
+)
+
+_PROMETHEUS_METRICS = (
+    ("hits", "counter", "Cache lookups served from memory"),
+    ("misses", "counter", "Cache lookups that had to fetch or compute"),
+    ("evictions", "counter", "Entries dropped because the cache was full"),
+    ("expirations", "counter", "Entries dropped by their TTL"),
+    ("fetches", "counter", "Fetches or computations run on a miss"),
+    ("fetch_seconds", "counter", "Total seconds spent fetching on misses"),
+    ("fetch_seconds_max", "gauge", "Slowest fetch observed, in seconds"),
+    ("rows_fetched", "counter", "Candle rows fetched on misses"),
+    ("resampled", "counter", "Misses served by resampling a cached lower timeframe"),
+    ("stale", "counter", "Misses answered with a stale frame while the exchange circuit was open"),
+    ("entries", "gauge", "Entries currently held"),
+    ("bytes", "gauge", "Approximate bytes currently held"),
+)
+
+# Gauge callback: {timeframe: (entries, bytes)} for one cache.
+Gauge = Callable[[], Dict[str, Tuple[int, int]]]
+
+
+def frame_bytes(df: Optional[pd.DataFrame]) -> int:
+    """Memory held by a frame's columns and index (shallow, no object deep-scan)."""
+    if df is None:
+        return 0
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+class CacheStats:
+    """Thread-safe registry of per-``(cache, timeframe)`` counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._gauges: Dict[str, Gauge] = {}
+
+    def _bump(self, cache: str, timeframe: Optional[str], **deltas: float) -> None:
+        key = (cache, timeframe or NO_TIMEFRAME)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = dict.fromkeys(_COUNTERS, 0)
+                series["fetch_seconds_max"] = 0.0
+                self._series[key] = series
+            for name, delta in deltas.items():
+                series[name] += delta
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def hit(self, cache: str, timeframe: Optional[str]) -> None:
+        self._bump(cache, timeframe, hits=1)
+
+    def miss(self, cache: str, timeframe: Optional[str]) -> None:
+        self._bump(cache, timeframe, misses=1)
+
+    def evicted(self, cache: str, timeframe: Optional[str], count: int = 1) -> None:
+        self._bump(cache, timeframe, evictions=count)
+
+    def expired(self, cache: str, timeframe: Optional[str], count: int = 1) -> None:
+        self._bump(cache, timeframe, expirations=count)
+
+    def fetched(self, cache: str, timeframe: Optional[str], seconds: float, rows: int = 0) -> None:
+        self._bump(cache, timeframe, fetches=1, fetch_seconds=seconds, rows_fetched=rows)
+        key = (cache, timeframe or NO_TIMEFRAME)
+        with self._lock:
+            series = self._series[key]
+            series["fetch_seconds_max"] = max(series["fetch_seconds_max"], seconds)
+
+    def resampled(self, cache: str, timeframe: Optional[str], seconds: float) -> None:
+        """A miss served locally from a cached lower timeframe (no fetch)."""
+        self._bump(cache, timeframe, resampled=1, fetch_seconds=seconds)
+
+    def stale(self, cache: str, timeframe: Optional[str]) -> None:
+        """A miss answered with an out-of-date frame (exchange circuit open)."""
+        self._bump(cache, timeframe, stale=1)
+
+    def register_gauge(self, cache: str, gauge: Gauge) -> None:
+        """Sample ``gauge`` for the ``entries``/``bytes`` of ``cache`` at read time."""
+        with self._lock:
+            self._gauges[cache] = gauge
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """``{cache: {timeframe: {counter: value}}}`` including the gauges."""
+        with self._lock:
+            series = {key: dict(values) for key, values in self._series.items()}
+            gauges = dict(self._gauges)
+        out: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (cache, timeframe), values in series.items():
+            values["hit_ratio"] = _ratio(values["hits"], values["hits"] + values["misses"])
+            out.setdefault(cache, {})[timeframe] = values
+        for cache, gauge in gauges.items():
+            for timeframe, (entries, size) in gauge().items():
+                values = out.setdefault(cache, {}).setdefault(timeframe, {})
+                values["entries"] = entries
+                values["bytes"] = size
+        return out
+
+    def render_prometheus(self, prefix: str = "mmk_cache") -> str:
+        """The snapshot in the Prometheus text exposition format (0.0.4)."""
+        snapshot = self.snapshot()
+        out: List[str] = []
+        for name, kind, help_text in _PROMETHEUS_METRICS:
+            full = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+            samples = [
+                f'{full}{{cache="{_escape(cache)}",timeframe="{_escape(timeframe)}"}} {_number(values[name])}'
+                for cache, per_tf in sorted(snapshot.items())
+                for timeframe, values in sorted(per_tf.items())
+                if name in values
+            ]
+            if samples:
+                out.append(f"# HELP {full} {help_text}")
+                out.append(f"# TYPE {full} {kind}")
+                out.extend(samples)
+        return "\n".join(out) + "\n"
+
+    def reset(self) -> None:
+        """Zero every counter (gauges stay registered) — useful in tests."""
+        with self._lock:
+            self._series.clear()
+
+
+def _ratio(part: float, whole: float) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+
+def _number(value: Any) -> str:
+    return "NaN" if value is None else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STATS = CacheStats()
+
+
+def _expired_prefix(cache: Any, time: Any) -> List[Tuple[Hashable, Any]]:
+    """``(key, value)`` pairs of a `TTLCache` that have expired by ``time``.
+
+    TTLCache links its entries in expiry order, so the expired ones are a
+    prefix of that list: only the prefix is walked, not every key.
+    """
+    root = cache._TTLCache__root
+    link = root.next
+    items: List[Tuple[Hashable, Any]] = []
+    while link is not root and not time < link.expires:
+        items.append((link.key, Cache.__getitem__(cache, link.key)))
+        link = link.next
+    return items
+
+
+if TTLCache is not None:
+
+    class InstrumentedTTLCache(TTLCache):
+        """`TTLCache` that reports capacity evictions and TTL expirations.
+
+        ``timeframe_of(key)`` names the series an entry belongs to; a cache
+        holding a single timeframe passes ``timeframe`` instead.
+        """
+
+        def __init__(
+            self,
+            maxsize: int,
+            ttl: float,
+            *,
+            name: str,
+            timeframe: Optional[str] = None,
+            timeframe_of: Optional[Callable[[Hashable], Optional[str]]] = None,
+            **kwargs: Any,
+        ) -> None:
+            super().__init__(maxsize, ttl, **kwargs)
+            self.stats_name = name
+            self.stats_timeframe = timeframe
+            self.timeframe_of = timeframe_of
+
+        def _timeframe(self, key: Hashable) -> Optional[str]:
+            if self.timeframe_of is not None:
+                return self.timeframe_of(key)
+            return self.stats_timeframe
+
+        def expire(self, time: Any = None) -> List[Tuple[Hashable, Any]]:
+            """Purge expired entries; returns the ``(key, value)`` pairs removed."""
+            if time is None:
+                time = self.timer()
+            pending = _expired_prefix(self, time)
+            removed = super().expire(time)
+            # cachetools < 5.4 purges without reporting what it removed.
+            expired = pending if removed is None else list(removed)
+            for key, _ in expired:
+                STATS.expired(self.stats_name, self._timeframe(key))
+            return expired
+
+        def popitem(self) -> Tuple[Hashable, Any]:
+            key, value = super().popitem()
+            STATS.evicted(self.stats_name, self._timeframe(key))
+            return key, value
+
+else:  # pragma: no cover
+    InstrumentedTTLCache = None  # type: ignore[assignment,misc]
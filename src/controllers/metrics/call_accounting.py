@@ -0,0 +1,246 @@
+"""Exchange call accounting: what each route actually costs in ccxt calls.
+
+Rate-limit capacity planning needs the number of exchange calls per request
+(how many does one ``/setups/evaluate?rule_version=0.2.1`` cost?), and a
+caching change is only proven by the calls it removes. Every call the
+`ExchangePool` / `AsyncPooledExchange` makes — ``load_markets`` included —
+is counted and timed here, tagged with:
+
+* ``route`` — the endpoint function that caused it (`request_scope`, opened
+  by `middlewares.has_errors`); ``-`` for background work (prewarm, startup);
+* ``service`` — the component issuing it (`call_service`: ``market_data``,
+  ``ohlcv_history``, ``ticker``, ``healthy``); ``-`` when untagged;
+* ``exchange``, ``method`` and the ``symbol`` / ``timeframe`` read from the
+  call's own arguments (``*`` for a multi-symbol ``fetch_tickers``).
+
+Per series the registry keeps ``calls``, ``errors``, ``seconds`` (network
+time only: queueing for the rate-limit budget is reported by
+`exchange_clients.rate_limit_stats`), ``seconds_max`` and ``weight`` (budget
+units charged). `ACCOUNTING.snapshot()` feeds ``/v1/cache/exchange-calls``
+and `ACCOUNTING.render_prometheus()` is appended to ``/v1/cache/metrics``.
+
+Each request also gets a `CallLedger`; with ``EXCHANGE_CALLS_HEADER=1`` its
+summary is returned in the ``X-Exchange-Calls`` response header. Concurrent
+identical misses share one fetch (single flight): its calls are charged to
+the request that led it.
+
+The tags live in a context variable, so they follow ``asyncio`` tasks and
+``asyncio.to_thread``; plain worker threads re-enter the caller's scope with
+``with enter_scope(current_scope()):`` captured before submitting.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+HEADER_ENABLED = getenv("EXCHANGE_CALLS_HEADER", "0").split("#", 1)[0].strip() in ("1", "true", "yes")
+
+# Label of an untagged route / service / symbol / timeframe.
+UNTAGGED = "-"
+# Symbol label of a call covering several symbols at once.
+MANY_SYMBOLS = "*"
+# Series beyond this many fold their symbol into ``other`` (bounded memory
+# and Prometheus cardinality whatever symbols callers ask for).
+_MAX_SERIES = 4096
+_OVERFLOW_SYMBOL = "other"
+
+_COUNTERS = ("calls", "errors", "seconds", "weight")
+
+SeriesKey = Tuple[str, str, str, str, str, str]  # route, service, exchange, method, symbol, timeframe
+_LABELS = ("route", "service", "exchange", "method", "symbol", "timeframe")
+
+
+class CallLedger:
+    """Exchange calls made on behalf of one request (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.weight = 0.0
+        self.by_method: Dict[str, int] = {}
+
+    def add(self, method: str, seconds: float, weight: float, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self.seconds += seconds
+            self.weight += weight
+            self.by_method[method] = self.by_method.get(method, 0) + 1
+
+    def header(self) -> str:
+        """``calls=3; errors=0; weight=3.0; ms=412.3; fetch_ohlcv=2; fetch_ticker=1``."""
+        with self._lock:
+            parts = [
+                f"calls={self.calls}",
+                f"errors={self.errors}",
+                f"weight={round(self.weight, 3)}",
+                f"ms={round(self.seconds * 1000.0, 1)}",
+            ]
+            parts.extend(f"{method}={count}" for method, count in sorted(self.by_method.items()))
+        return "; ".join(parts)
+
+
+class Scope(NamedTuple):
+    route: str = UNTAGGED
+    service: str = UNTAGGED
+    ledger: Optional[CallLedger] = None
+
+
+_SCOPE: ContextVar[Scope] = ContextVar("exchange_call_scope", default=Scope())
+
+
+def current_scope() -> Scope:
+    return _SCOPE.get()
+
+
+@contextmanager
+def enter_scope(scope: Scope) -> Iterator[Scope]:
+    """Run the block under ``scope`` (re-enter a caller's scope in a worker thread)."""
+    token = _SCOPE.set(scope)
+    try:
+        yield scope
+    finally:
+        _SCOPE.reset(token)
+
+
+@contextmanager
+def request_scope(route: str) -> Iterator[CallLedger]:
+    """Charge the block's exchange calls to ``route`` and to a fresh ledger."""
+    ledger = CallLedger()
+    with enter_scope(Scope(route=route, service=current_scope().service, ledger=ledger)):
+        yield ledger
+
+
+@contextmanager
+def call_service(service: str) -> Iterator[None]:
+    """Tag the block's exchange calls with the issuing ``service``."""
+    with enter_scope(current_scope()._replace(service=service)):
+        yield
+
+
+def call_tags(method: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> Tuple[str, str]:
+    """``(symbol, timeframe)`` of a ccxt call, read from its arguments."""
+    symbol = kwargs.get("symbol", kwargs.get("symbols", args[0] if args else None))
+    if isinstance(symbol, (list, tuple, set)):
+        symbol = MANY_SYMBOLS if len(symbol) != 1 else next(iter(symbol))
+    elif not isinstance(symbol, str):
+        symbol = MANY_SYMBOLS if method == "fetch_tickers" else UNTAGGED
+    timeframe = kwargs.get("timeframe")
+    if timeframe is None and method == "fetch_ohlcv" and len(args) > 1:
+        timeframe = args[1]
+    return symbol, timeframe if isinstance(timeframe, str) else UNTAGGED
+
+
+class CallAccounting:
+    """Process-wide per-series exchange call counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: Dict[SeriesKey, Dict[str, float]] = {}
+
+    def record(
+        self,
+        exchange: str,
+        method: str,
+        args: Sequence[Any],
+        kwargs: Dict[str, Any],
+        seconds: float,
+        weight: float,
+        failed: bool = False,
+    ) -> None:
+        scope = current_scope()
+        symbol, timeframe = call_tags(method, args, kwargs)
+        key: SeriesKey = (scope.route, scope.service, exchange, method, symbol, timeframe)
+        with self._lock:
+            values = self._series.get(key)
+            if values is None:
+                if len(self._series) >= _MAX_SERIES:
+                    key = key[:4] + (_OVERFLOW_SYMBOL, timeframe)
+                values = self._series.setdefault(key, {**dict.fromkeys(_COUNTERS, 0.0), "seconds_max": 0.0})
+            values["calls"] += 1
+            values["errors"] += int(failed)
+            values["seconds"] += seconds
+            values["weight"] += weight
+            values["seconds_max"] = max(values["seconds_max"], seconds)
+        if scope.ledger is not None:
+            scope.ledger.add(method, seconds, weight, failed)
+
+    @contextmanager
+    def timed(
+        self, exchange: str, method: str, args: Sequence[Any], kwargs: Dict[str, Any], weight: float
+    ) -> Iterator[None]:
+        """Time the block as one ``method`` call and record it (failed if it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(exchange, method, args, kwargs, time.perf_counter() - started, weight, failed=True)
+            raise
+        self.record(exchange, method, args, kwargs, time.perf_counter() - started, weight)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """``{"series": [...], "routes": {route: totals}}``, busiest series first."""
+        with self._lock:
+            items = [(key, dict(values)) for key, values in self._series.items()]
+        series: List[Dict[str, Any]] = []
+        routes: Dict[str, Dict[str, float]] = {}
+        for key, values in items:
+            series.append({**dict(zip(_LABELS, key)), **_rounded(values)})
+            totals = routes.setdefault(key[0], dict.fromkeys(_COUNTERS, 0.0))
+            for name in _COUNTERS:
+                totals[name] += values[name]
+        series.sort(key=lambda row: (-row["calls"], row["route"], row["method"], row["symbol"]))
+        return {
+            "series": series,
+            "routes": {route: _rounded(totals) for route, totals in sorted(routes.items())},
+        }
+
+    def render_prometheus(self, prefix: str = "mmk_exchange_call") -> str:
+        """The counters in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted((key, dict(values)) for key, values in self._series.items())
+        if not items:
+            return ""
+        out: List[str] = []
+        for name, kind, help_text in _PROMETHEUS_METRICS:
+            full = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+            out.append(f"# HELP {full} {help_text}")
+            out.append(f"# TYPE {full} {kind}")
+            for key, values in items:
+                labels = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(_LABELS, key))
+                out.append(f"{full}{{{labels}}} {float(values[name])!r}")
+        return "\n".join(out) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+_PROMETHEUS_METRICS = (
+    ("calls", "counter", "Exchange calls made"),
+    ("errors", "counter", "Exchange calls that raised"),
+    ("seconds", "counter", "Total seconds spent in exchange calls (budget queueing excluded)"),
+    ("seconds_max", "gauge", "Slowest exchange call observed, in seconds"),
+    ("weight", "counter", "Rate-limit budget units charged"),
+)
+
+
+def _rounded(values: Dict[str, float]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, value in values.items():
+        out[name] = int(value) if name in ("calls", "errors") else round(value, 6)
+    return out
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+ACCOUNTING = CallAccounting()
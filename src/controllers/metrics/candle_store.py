@@ -0,0 +1,210 @@
+"""Persistent, append-only OHLCV candle store (SQLite).
+
+Backtests replay years of history, and every run used to download the whole
+range again 200 candles at a time (bitget's history-candles endpoint caps a
+page at 200 rows, see known-errors E13) — a 2-year F0 gate run spent nearly
+all of its wall-clock time on serial pagination. Closed candles are
+immutable, so once downloaded they can be kept on disk and reused by every
+later run and every process restart.
+
+Layout: one SQLite file holding two tables.
+
+* ``candles`` — one row per CLOSED candle, primary key
+  ``(exchange, symbol, timeframe, ts)``. Writes are ``INSERT OR IGNORE``: the
+  store is append-only, a candle is never rewritten once persisted. The
+  forming candle is never written (it still repaints).
+* ``coverage`` — half-open ``[start_ms, end_ms)`` intervals of open
+  timestamps that were fully downloaded. Absent candles inside a covered
+  interval are genuine exchange gaps (pre-listing history, maintenance
+  windows), so they are not re-requested on every run. Overlapping or
+  adjacent intervals are merged on insert to keep the table tiny.
+
+The store is opt-in: it is enabled by pointing ``CANDLE_STORE_PATH`` at a
+writable file (a Cloud Run instance has an ephemeral disk, so it only pays
+off for long-lived workers and local F0 gate runs). With the variable unset
+``get_candle_store()`` returns ``None`` and callers paginate exactly as
+before.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from os import getenv
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS candles (
+        exchange TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        open REAL NOT NULL,
+        high REAL NOT NULL,
+        low REAL NOT NULL,
+        close REAL NOT NULL,
+        volume REAL NOT NULL,
+        PRIMARY KEY (exchange, symbol, timeframe, ts)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coverage (
+        exchange TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL,
+        start_ms INTEGER NOT NULL,
+        end_ms INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS coverage_series ON coverage (exchange, symbol, timeframe)",
+)
+
+Interval = Tuple[int, int]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Merge overlapping/adjacent half-open intervals, sorted by start."""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_intervals(start: int, end: int, covered: Sequence[Interval]) -> List[Interval]:
+    """Parts of ``[start, end)`` not inside any of the (merged) ``covered``."""
+    gaps: List[Interval] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class CandleStore:
+    """Thread-safe SQLite candle store keyed by (exchange, symbol, timeframe)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # One connection shared behind a lock: SQLite serialises writers
+        # anyway, and FastAPI's threadpool would otherwise need one
+        # connection per worker thread.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def read(
+        self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int
+    ) -> List[List[Any]]:
+        """Stored candles with open time in ``[start_ms, end_ms)``, ascending."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT ts, open, high, low, close, volume FROM candles "
+                "WHERE exchange = ? AND symbol = ? AND timeframe = ? AND ts >= ? AND ts < ? "
+                "ORDER BY ts",
+                (exchange, symbol, timeframe, int(start_ms), int(end_ms)),
+            )
+            return [list(row) for row in cursor.fetchall()]
+
+    def coverage(self, exchange: str, symbol: str, timeframe: str) -> List[Interval]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT start_ms, end_ms FROM coverage "
+                "WHERE exchange = ? AND symbol = ? AND timeframe = ?",
+                (exchange, symbol, timeframe),
+            )
+            return merge_intervals((int(a), int(b)) for a, b in cursor.fetchall())
+
+    def missing_ranges(
+        self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int
+    ) -> List[Interval]:
+        """Sub-ranges of ``[start_ms, end_ms)`` that were never downloaded."""
+        return subtract_intervals(int(start_ms), int(end_ms), self.coverage(exchange, symbol, timeframe))
+
+    # ------------------------------------------------------------------
+    # Writes (append-only)
+    # ------------------------------------------------------------------
+    def append(
+        self, exchange: str, symbol: str, timeframe: str, rows: Iterable[Sequence[Any]]
+    ) -> None:
+        """Persist closed candles; existing candles are never overwritten."""
+        records = [
+            (exchange, symbol, timeframe, int(row[0]), float(row[1]), float(row[2]),
+             float(row[3]), float(row[4]), float(row[5] or 0.0))
+            for row in rows
+        ]
+        if not records:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO candles "
+                "(exchange, symbol, timeframe, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+
+    def mark_covered(
+        self, exchange: str, symbol: str, timeframe: str, start_ms: int, end_ms: int
+    ) -> None:
+        """Record ``[start_ms, end_ms)`` as fully downloaded (merging neighbours)."""
+        if end_ms <= start_ms:
+            return
+        key = (exchange, symbol, timeframe)
+        with self._lock, self._conn:
+            existing = self._conn.execute(
+                "SELECT start_ms, end_ms FROM coverage "
+                "WHERE exchange = ? AND symbol = ? AND timeframe = ?",
+                key,
+            ).fetchall()
+            merged = merge_intervals(
+                [(int(a), int(b)) for a, b in existing] + [(int(start_ms), int(end_ms))]
+            )
+            self._conn.execute(
+                "DELETE FROM coverage WHERE exchange = ? AND symbol = ? AND timeframe = ?",
+                key,
+            )
+            self._conn.executemany(
+                "INSERT INTO coverage (exchange, symbol, timeframe, start_ms, end_ms) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [key + interval for interval in merged],
+            )
+
+
+_STORE: Optional[CandleStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_candle_store() -> Optional[CandleStore]:
+    """Process-wide store from ``CANDLE_STORE_PATH`` (``None`` when unset)."""
+    global _STORE
+    path = getenv("CANDLE_STORE_PATH", "").split("#", 1)[0].strip()
+    if not path:
+        return None
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != path:
+            _STORE = CandleStore(path)
+        return _STORE
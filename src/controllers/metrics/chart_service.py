@@ -10,6 +10,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Tuple, Optional
 import pandas as pd
 
+from .indicator_cache import enriched
 from .indicators_service import IndicatorsService
 from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
 
@@ -89,7 +90,15 @@ class ChartService:
         
         # 2. Obtener datos con fallback
         chart_data, actual_timeframe = self._fetch_chart_data(optimal_timeframe)
-        
+        return self._build(optimal_timeframe, chart_data, actual_timeframe)
+
+    async def execute_async(self) -> Dict[str, Any]:
+        """Igual que `execute`, sin bloquear el event loop en la descarga."""
+        optimal_timeframe = self._determine_optimal_timeframe()
+        chart_data, actual_timeframe = await self._fetch_chart_data_async(optimal_timeframe)
+        return self._build(optimal_timeframe, chart_data, actual_timeframe)
+
+    def _build(self, optimal_timeframe: str, chart_data: pd.DataFrame, actual_timeframe: str) -> Dict[str, Any]:
         # 3. Procesar datos para el gráfico
         processed_data = self._process_chart_data(chart_data)
 
@@ -99,12 +108,14 @@ class ChartService:
         # 5. Konkorde series aligned 1:1 with the returned candles (same
         #    window — the forming candle stays included like the rest of the
         #    chart; new field, backward-compatible).
-        konkorde_series = self._calculate_konkorde_series(chart_data)
+        #    Both panels share the enriched-frame cache (`indicator_cache`).
+        source = (self.exchange, self.symbol, actual_timeframe)
+        konkorde_series = self._calculate_konkorde_series(chart_data, source=source)
 
         # 6. Oscillator panels (ADX +DI/-DI, BBWP, AO) as series aligned 1:1
         #    with the candles — same treatment as Konkorde (new fields,
         #    backward-compatible; the dashboard renders them as sub-panels).
-        oscillators = self._calculate_indicator_series(chart_data)
+        oscillators = self._calculate_indicator_series(chart_data, source=source)
 
         return {
             "symbol": self.symbol,
@@ -167,17 +178,8 @@ class ChartService:
     def _fetch_chart_data(self, optimal_timeframe: str) -> Tuple[pd.DataFrame, str]:
         """Obtiene datos con fallback a timeframes alternativos."""
         market_service = MarketDataService(exchange_name=self.exchange)
-        
-        # Lista de timeframes a intentar (empezando por el óptimo)
-        timeframes_to_try = [optimal_timeframe]
-        
-        # Agregar alternativas más granulares y menos granulares
-        current_priority = self.TIMEFRAMES[optimal_timeframe]["priority"]
-        for tf, config in sorted(self.TIMEFRAMES.items(), key=lambda x: abs(x[1]["priority"] - current_priority)):
-            if tf not in timeframes_to_try:
-                timeframes_to_try.append(tf)
-        
-        for timeframe in timeframes_to_try:
+
+        for timeframe in self._timeframes_to_try(optimal_timeframe):
             try:
                 max_candles = self.TIMEFRAMES[timeframe]["max_candles"]
                 # Charts are display-only: keep the forming candle so the UI
@@ -202,6 +204,37 @@ class ChartService:
         # Si ningún timeframe funciona, usar el último disponible
         raise ValueError(f"No se pudieron obtener datos para {self.symbol} en {self.exchange}")
 
+    async def _fetch_chart_data_async(self, optimal_timeframe: str) -> Tuple[pd.DataFrame, str]:
+        """Versión async de `_fetch_chart_data` (mismo orden de fallback)."""
+        market_service = MarketDataService(exchange_name=self.exchange)
+
+        for timeframe in self._timeframes_to_try(optimal_timeframe):
+            try:
+                df = await market_service.get_ohlcv_async(
+                    symbol=self.symbol,
+                    timeframe=timeframe,
+                    limit=self.TIMEFRAMES[timeframe]["max_candles"],
+                    drop_forming=False,
+                )
+                df_filtered = df.loc[self.start:self.end]
+                if len(df_filtered) >= 10:
+                    return df_filtered, timeframe
+            except Exception:
+                continue
+
+        raise ValueError(f"No se pudieron obtener datos para {self.symbol} en {self.exchange}")
+
+    def _timeframes_to_try(self, optimal_timeframe: str) -> List[str]:
+        # Lista de timeframes a intentar (empezando por el óptimo)
+        timeframes_to_try = [optimal_timeframe]
+
+        # Agregar alternativas más granulares y menos granulares
+        current_priority = self.TIMEFRAMES[optimal_timeframe]["priority"]
+        for tf, config in sorted(self.TIMEFRAMES.items(), key=lambda x: abs(x[1]["priority"] - current_priority)):
+            if tf not in timeframes_to_try:
+                timeframes_to_try.append(tf)
+        return timeframes_to_try
+
     def _process_chart_data(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Procesa el DataFrame para formato JSON optimizado para gráficos."""
         chart_points = []
@@ -220,8 +253,28 @@ class ChartService:
         
         return chart_points
 
+    # `IndicatorsService.STEPS` behind each panel group.
+    KONKORDE_STEPS = ("konkorde",)
+    OSCILLATOR_STEPS = ("adx", "bbwp", "bbwp_owner", "ao", "trend_speed")
+
+    @staticmethod
+    def _enriched_series(
+        df: pd.DataFrame, steps: Tuple[str, ...], source: Optional[Tuple[str, str, str]]
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Frame carrying the columns of ``steps`` plus their last values.
+
+        ``source`` is ``(exchange, symbol, timeframe)`` of ``df``; with it
+        the computation is shared through `indicator_cache`.
+        """
+        fields = {key for step, keys, _ in IndicatorsService.STEPS if step in steps for key in keys}
+        exchange, symbol, timeframe = source or (None, None, None)
+        frame, result = enriched(df, exchange=exchange, symbol=symbol, timeframe=timeframe, fields=fields)
+        return frame, result
+
     @staticmethod
-    def _calculate_konkorde_series(df: pd.DataFrame) -> Dict[str, List[Optional[float]]]:
+    def _calculate_konkorde_series(
+        df: pd.DataFrame, *, source: Optional[Tuple[str, str, str]] = None
+    ) -> Dict[str, List[Optional[float]]]:
         """Konkorde lines (marron/verde/azul) aligned 1:1 with `df`.
 
         Computed with `IndicatorsService` over the SAME window as the chart
@@ -231,11 +284,10 @@ class ChartService:
         """
         if df.empty:
             return {"marron": [], "verde": [], "azul": []}
-        service = IndicatorsService(df)
-        service.calculate_konkorde()
+        frame, _ = ChartService._enriched_series(df, ChartService.KONKORDE_STEPS, source)
 
         def _clean(column: str) -> List[Optional[float]]:
-            return [None if pd.isna(v) else float(v) for v in service.df[column]]
+            return [None if pd.isna(v) else float(v) for v in frame[column]]
 
         return {
             "marron": _clean("konkorde_marron"),
@@ -244,7 +296,9 @@ class ChartService:
         }
 
     @staticmethod
-    def _calculate_indicator_series(df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_indicator_series(
+        df: pd.DataFrame, *, source: Optional[Tuple[str, str, str]] = None
+    ) -> Dict[str, Any]:
         """ADX(+DI/-DI), BBWP and AO series aligned 1:1 with `df`.
 
         Same contract as `_calculate_konkorde_series`: computed with
@@ -265,11 +319,10 @@ class ChartService:
         }
         if df.empty:
             return empty
-        service = IndicatorsService(df)
-        oscillators = service.calculate_oscillators()
+        frame, oscillators = ChartService._enriched_series(df, ChartService.OSCILLATOR_STEPS, source)
 
         def _clean(column: str) -> List[Optional[float]]:
-            return [None if pd.isna(v) else float(v) for v in service.df[column]]
+            return [None if pd.isna(v) else float(v) for v in frame[column]]
 
         return {
             "adx": {
@@ -284,7 +337,7 @@ class ChartService:
             # Speed Analyzer panel, so the dashboard can be compared 1:1
             # against the owner's chart. `ao`/`bbwp` above stay untouched.
             "ao_diff": _clean("ao_diff"),
-            "ao_color": [None if v is None else str(v) for v in service.df["ao_color"]],
+            "ao_color": [None if v is None else str(v) for v in frame["ao_color"]],
             "bbwp_owner": {
                 "bbwp": _clean("bbwp_owner"),
                 "ma5": _clean("bbwp_owner_ma5"),
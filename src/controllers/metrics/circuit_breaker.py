@@ -0,0 +1,255 @@
+"""Per-exchange circuit breaker: fail fast while an exchange is degraded.
+
+When bitget degrades, every request used to wait for the full ccxt timeout
+before `has_errors` turned it into a 500, holding the event loop's tasks and
+the worker threads of every endpoint meanwhile. Each `ExchangePool` now owns
+a `CircuitBreaker` that every market-data and ticker call goes through
+(threaded and asyncio alike):
+
+* **closed** — calls pass; each outcome is recorded in a sliding window of
+  ``CIRCUIT_WINDOW_S`` seconds. Once the window holds ``CIRCUIT_MIN_CALLS``
+  calls and either the share of failures reaches ``CIRCUIT_ERROR_RATE`` or
+  the share of calls slower than ``CIRCUIT_SLOW_CALL_S`` reaches
+  ``CIRCUIT_SLOW_RATE``, the breaker opens;
+* **open** — calls raise `CircuitOpenError` immediately (no budget wait, no
+  network). `MarketDataService` answers from the last cached frame instead,
+  flagged stale (`mark_stale`, ``X-Data-Stale`` header); without one the
+  route fails fast with a 503 and ``Retry-After``;
+* **half-open** — after ``CIRCUIT_OPEN_S`` one probe call is let through: a
+  healthy answer closes the breaker, a failure re-opens it.
+
+Only transport-level trouble counts as a failure (`ccxt.NetworkError`:
+timeouts, DDoS protection, exchange not available; plain socket errors). A
+bad symbol or any other `ccxt.ExchangeError` is the caller's problem, not the
+exchange's health. The `/healthy` probe goes through the same pool, so it
+feeds the same breaker and reports its state.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Set, Tuple
+
+import ccxt
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(getenv(name, str(default)).split("#", 1)[0].strip())
+    except ValueError:
+        return default
+
+
+ENABLED = getenv("CIRCUIT_BREAKER", "1").split("#", 1)[0].strip() not in ("0", "false", "no")
+
+
+class CircuitOpenError(ccxt.ExchangeNotAvailable):
+    """Raised instead of calling an exchange whose breaker is open."""
+
+    def __init__(self, exchange: str, retry_after_s: float) -> None:
+        super().__init__(f"{exchange} no disponible temporalmente (circuito abierto)")
+        self.exchange = exchange
+        self.retry_after_s = retry_after_s
+
+
+def is_failure(exc: BaseException) -> bool:
+    """Whether ``exc`` says something about the exchange's health."""
+    return isinstance(exc, (ccxt.NetworkError, TimeoutError, ConnectionError)) and not isinstance(
+        exc, CircuitOpenError
+    )
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding window of outcomes."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_s: float = _env_float("CIRCUIT_WINDOW_S", 30.0),
+        min_calls: int = int(_env_float("CIRCUIT_MIN_CALLS", 10)),
+        error_rate: float = _env_float("CIRCUIT_ERROR_RATE", 0.5),
+        slow_call_s: float = _env_float("CIRCUIT_SLOW_CALL_S", 5.0),
+        slow_rate: float = _env_float("CIRCUIT_SLOW_RATE", 0.8),
+        open_s: float = _env_float("CIRCUIT_OPEN_S", 15.0),
+        enabled: bool = ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.window_s = window_s
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.slow_call_s = slow_call_s
+        self.slow_rate = slow_rate
+        self.open_s = open_s
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._reason: Optional[str] = None
+        # (time, failed, slow) per finished call.
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self._counts = {"rejected": 0, "opened": 0}
+
+    # ------------------------------------------------------------------
+    # Call protocol
+    # ------------------------------------------------------------------
+    def before_call(self) -> bool:
+        """Admit a call (``True`` if it is the half-open probe) or raise."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            remaining = self._opened_at + self.open_s - self._clock()
+            if self._state == OPEN and remaining <= 0:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._counts["rejected"] += 1
+        raise CircuitOpenError(self.name, max(remaining, 1.0))
+
+    def record(self, seconds: float, error: Optional[BaseException] = None, probe: bool = False) -> None:
+        """Outcome of an admitted call (``error`` is the exception it raised)."""
+        if not self.enabled:
+            return
+        if error is not None and not isinstance(error, Exception):
+            # Cancelled or interrupted: says nothing either way.
+            if probe:
+                with self._lock:
+                    self._probing = False
+            return
+        failed = error is not None and is_failure(error)
+        slow = seconds >= self.slow_call_s
+        now = self._clock()
+        with self._lock:
+            if probe:
+                self._probed(now, failed, slow)
+            elif self._state == CLOSED:
+                self._observe(now, failed, slow)
+
+    # ------------------------------------------------------------------
+    # State transitions (caller holds ``_lock``)
+    # ------------------------------------------------------------------
+    def _probed(self, now: float, failed: bool, slow: bool) -> None:
+        """Half-open probe finished: close on success, re-open otherwise."""
+        self._probing = False
+        if failed or slow:
+            self._trip(now, "probe failed" if failed else "probe slow")
+            return
+        self._state = CLOSED
+        self._reason = None
+        self._window.clear()
+
+    def _observe(self, now: float, failed: bool, slow: bool) -> None:
+        """Add a closed-state outcome to the window; trip past either rate."""
+        self._window.append((now, failed, slow))
+        while self._window and self._window[0][0] < now - self.window_s:
+            self._window.popleft()
+        calls = len(self._window)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for _, f, _ in self._window if f)
+        slows = sum(1 for _, _, s in self._window if s)
+        if failures / calls >= self.error_rate:
+            self._trip(now, f"error rate {failures}/{calls}")
+        elif slows / calls >= self.slow_rate:
+            self._trip(now, f"slow calls {slows}/{calls}")
+
+    def _trip(self, now: float, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._reason = reason
+        self._window.clear()
+        self._counts["opened"] += 1
+
+    @contextmanager
+    def guard(self) -> Iterator[Callable[[], None]]:
+        """``with breaker.guard() as start:`` — admit, time and record one call.
+
+        Call the yielded ``start()`` right before the network call, so time
+        spent queued for the rate-limit budget is not taken for exchange
+        latency.
+        """
+        probe = self.before_call()
+        started = [time.perf_counter()]
+
+        def start() -> None:
+            started[0] = time.perf_counter()
+
+        try:
+            yield start
+        except BaseException as exc:
+            self.record(time.perf_counter() - started[0], exc, probe)
+            raise
+        self.record(time.perf_counter() - started[0], None, probe)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() >= self._opened_at + self.open_s:
+                return HALF_OPEN
+            return self._state
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            calls = len(self._window)
+            failures = sum(1 for _, f, _ in self._window if f)
+            return {
+                "state": state,
+                "reason": self._reason,
+                "window_calls": calls,
+                "window_failures": failures,
+                "opened": self._counts["opened"],
+                "rejected": self._counts["rejected"],
+                "retry_after_s": (
+                    round(max(0.0, self._opened_at + self.open_s - self._clock()), 3) if state == OPEN else 0.0
+                ),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._probing = False
+            self._reason = None
+            self._window.clear()
+
+
+# ----------------------------------------------------------------------
+# Stale answers
+# ----------------------------------------------------------------------
+_STALE: ContextVar[Optional[Set[str]]] = ContextVar("stale_sources", default=None)
+
+
+@contextmanager
+def stale_scope() -> Iterator[Set[str]]:
+    """Collect the stale sources `mark_stale` reports while the block runs."""
+    sources: Set[str] = set()
+    token = _STALE.set(sources)
+    try:
+        yield sources
+    finally:
+        _STALE.reset(token)
+
+
+def mark_stale(source: str) -> None:
+    """Record that the current request was answered from stale data."""
+    sources = _STALE.get()
+    if sources is not None:
+        sources.add(source)
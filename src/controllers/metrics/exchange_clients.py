@@ -0,0 +1,685 @@
+"""Process-wide, pre-warmed pool of ccxt clients per exchange.
+
+Every request used to build a brand-new `ccxt.binance` / `ccxt.bitget`
+instance (`MarketDataService.__init__`, the backtest fetchers, the health
+probe). A fresh instance starts with no loaded markets — its first call
+pays a `load_markets` round trip — with a new HTTP session (no keep-alive)
+and with its own rate-limit clock, so N concurrent instances throttle as if
+each were alone and together overrun the exchange's limits.
+
+`get_exchange(name, factory)` instead returns one `PooledExchange` per
+exchange for the whole process. It is a drop-in stand-in for a ccxt client:
+
+* every `fetch_*` / `load_markets` call leases one of at most
+  ``EXCHANGE_POOL_SIZE`` real clients (default 4) for the duration of the
+  call, so concurrent threads never share a ccxt instance (ccxt sync clients
+  are not thread-safe) and each pooled client keeps its `requests` session
+  alive across requests;
+* markets are loaded once per exchange and handed to every client the pool
+  creates later (`set_markets`), never re-downloaded per request;
+* the per-instance ccxt throttle is replaced by one process-wide
+  `TokenBucket` per exchange that meters ALL calls to it, whichever client
+  (threaded or asyncio) and whichever service makes them. It refills at the
+  exchange's ``rateLimit`` and every call is charged its endpoint weight
+  (`ENDPOINT_WEIGHTS`), so a 24h-tickers dump costs what the exchange
+  charges for it rather than one ordinary request;
+* callers queue by priority (`call_priority`): live requests pre-empt the
+  prewarm, which pre-empts backtest pagination, but a queued call ages
+  (``EXCHANGE_PRIORITY_AGING_S``), so sustained live load delays lower
+  priorities without starving them. The time spent queued is recorded per
+  priority (`rate_limit_stats`, ``/v1/cache/metrics``);
+* every call is counted and timed per route, service, symbol and timeframe
+  (`call_accounting`).
+
+`warm_up()` loads markets at startup (see `web_server.start_fastapi`) so the
+first live request does not pay for it.
+
+`get_async_exchange(pooled, async_factory)` is the asyncio counterpart used by
+`MarketDataService.get_ohlcv_async`: one `ccxt.async_support` client per
+running event loop (an aiohttp session is bound to its loop, and one client
+multiplexes any number of concurrent coroutines), fed the same markets and
+metered by the same budget as the threaded pool it is attached to.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from weakref import WeakKeyDictionary
+
+from .call_accounting import ACCOUNTING
+from .circuit_breaker import CircuitBreaker
+from .hedging import mark_round_trip
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(getenv(name, str(default)).split("#", 1)[0].strip()))
+    except ValueError:
+        return default
+
+
+POOL_SIZE = _env_int("EXCHANGE_POOL_SIZE", 4)
+
+# Same client config every call site used to build by hand.
+CLIENT_CONFIG: Dict[str, Any] = {
+    # Throttling is done process-wide by each pool's `TokenBucket`; a
+    # per-instance throttle would let `POOL_SIZE` clients run at `POOL_SIZE`
+    # times the rate.
+    "enableRateLimit": False,
+    "options": {"defaultType": "spot"},
+}
+
+
+def client_config() -> Dict[str, Any]:
+    """A fresh copy of `CLIENT_CONFIG` (ccxt mutates the dict it is given)."""
+    return dict(CLIENT_CONFIG, options=dict(CLIENT_CONFIG["options"]))
+
+
+# Priorities of the callers sharing an exchange's budget, most urgent first.
+# Live requests (HTTP/MCP evaluations, tickers, the health probe) pre-empt the
+# candle-close prewarm, which pre-empts backtest pagination.
+LIVE = "live"
+BACKGROUND = "background"
+BACKTEST = "backtest"
+PRIORITIES = (LIVE, BACKGROUND, BACKTEST)
+_PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITIES)}
+
+_PRIORITY: ContextVar[str] = ContextVar("exchange_call_priority", default=LIVE)
+
+
+def current_priority() -> str:
+    return _PRIORITY.get()
+
+
+@contextmanager
+def call_priority(priority: str) -> Iterator[None]:
+    """Run the exchange calls made inside the block at ``priority``.
+
+    The priority lives in a context variable, so it follows `asyncio` tasks
+    and `asyncio.to_thread`; plain worker threads must re-enter the block
+    (see `market_data_service._paginate_ohlcv`).
+    """
+    if priority not in _PRIORITY_RANK:
+        raise ValueError(f"Prioridad desconocida: {priority}. Válidas: {', '.join(PRIORITIES)}")
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+# Cost of each unified call, in ccxt cost units (1 unit = ``rateLimit`` ms of
+# budget), mirroring the costs ccxt 4.2 declares for the endpoints behind
+# them. binance: klines / single ticker 0.4 (request weight 2 of the
+# 6000/min budget), all-symbol 24h tickers 16, exchangeInfo 4 per market
+# type loaded. bitget: 1 per call on every public endpoint.
+ENDPOINT_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "binance": {
+        "fetch_ohlcv": 0.4,
+        "fetch_ticker": 0.4,
+        "fetch_tickers": 16.0,
+        "load_markets": 12.0,
+    },
+    "bitget": {
+        "fetch_ohlcv": 1.0,
+        "fetch_ticker": 1.0,
+        "fetch_tickers": 1.0,
+        "load_markets": 2.0,
+    },
+}
+DEFAULT_WEIGHT = 1.0
+
+
+def endpoint_weight(exchange: str, method: str) -> float:
+    return ENDPOINT_WEIGHTS.get(exchange, {}).get(method, DEFAULT_WEIGHT)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(getenv(name, str(default)).split("#", 1)[0].strip()))
+    except ValueError:
+        return default
+
+
+# Bucket capacity, in seconds of refill: how much idle budget may be spent
+# in one burst.
+RATE_BURST_S = _env_float("EXCHANGE_RATE_BURST_S", 1.0)
+# Seconds of queueing each priority step is worth: a call waits behind
+# higher-priority calls that arrive at most ``rank x`` this much after it.
+# 0 serves priorities strictly (lower ones can starve under live load).
+PRIORITY_AGING_S = _env_float("EXCHANGE_PRIORITY_AGING_S", 10.0)
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "weight", "priority", "enqueued", "order")
+
+    def __init__(self, rank: int, seq: int, weight: float, priority: str, aging_s: float) -> None:
+        self.rank = rank
+        self.seq = seq
+        self.weight = weight
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        # Queue position: arrival pushed back by the priority's aging handicap.
+        self.order = (self.enqueued + rank * aging_s, seq) if aging_s > 0 else (rank, seq)
+
+
+class TokenBucket:
+    """Weighted token bucket with a priority queue of waiting callers.
+
+    Refills at ``rate`` units per second up to ``capacity``. Callers are
+    served by priority, then arrival: a live call arriving while backtest
+    pages are queued goes to the front of the queue. With ``aging_s > 0`` a
+    waiter's priority is an arrival handicap of ``rank x aging_s`` seconds
+    instead of an absolute rank, so a backtest page queued for ``2 x
+    aging_s`` is served before live calls arriving after that — lower
+    priorities keep a share of the budget under sustained live load. A call
+    heavier than the whole capacity (``load_markets`` on a small bucket) is
+    let through once the bucket is full and drives it negative, so the
+    calls after it pay the debt. ``rate <= 0`` disables throttling but keeps
+    the accounting.
+
+    Threads block on a condition variable; coroutines poll with
+    `asyncio.sleep`, both on the same queue, so sync and async traffic share
+    one budget.
+    """
+
+    def __init__(self, rate: float, capacity: float, aging_s: float = PRIORITY_AGING_S) -> None:
+        self.rate = max(0.0, rate)
+        self.capacity = max(0.0, capacity)
+        self.aging_s = max(0.0, aging_s)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: {"granted": 0, "waited": 0, "wait_seconds": 0.0, "wait_seconds_max": 0.0, "weight": 0.0}
+            for name in PRIORITIES
+        }
+
+    # ------------------------------------------------------------------
+    # Queue bookkeeping (caller holds ``_cond``)
+    # ------------------------------------------------------------------
+    def _enqueue(self, weight: float, priority: str) -> _Waiter:
+        if priority not in _PRIORITY_RANK:
+            raise ValueError(f"Prioridad desconocida: {priority}. Válidas: {', '.join(PRIORITIES)}")
+        waiter = _Waiter(_PRIORITY_RANK[priority], next(self._seq), max(0.0, weight), priority, self.aging_s)
+        index = len(self._queue)
+        while index and self._queue[index - 1].order > waiter.order:
+            index -= 1
+        self._queue.insert(index, waiter)
+        return waiter
+
+    def _discard(self, waiter: _Waiter) -> None:
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+            self._cond.notify_all()
+
+    def _poll(self, waiter: _Waiter) -> float:
+        """Grant ``waiter`` if it is its turn (returns 0), else the delay to retry."""
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        needed = min(waiter.weight, self.capacity)
+        if self.rate <= 0 or (self._queue[0] is waiter and self._tokens >= needed):
+            self._queue.remove(waiter)
+            if self.rate > 0:
+                self._tokens -= waiter.weight
+            waited = now - waiter.enqueued
+            stats = self._stats[waiter.priority]
+            stats["granted"] += 1
+            stats["weight"] += waiter.weight
+            if waited > 0.001:
+                stats["waited"] += 1
+            stats["wait_seconds"] += waited
+            stats["wait_seconds_max"] = max(stats["wait_seconds_max"], waited)
+            self._cond.notify_all()
+            return 0.0
+        # Time for the bucket to cover everyone ahead plus this caller.
+        ahead = 0.0
+        for queued in self._queue:
+            if queued is waiter:
+                break
+            ahead += queued.weight
+        return max((ahead + needed - self._tokens) / self.rate, 0.001)
+
+    # ------------------------------------------------------------------
+    # Acquisition
+    # ------------------------------------------------------------------
+    def acquire(self, weight: float = DEFAULT_WEIGHT, priority: str = LIVE) -> None:
+        """Block until ``weight`` units are granted to this ``priority``."""
+        with self._cond:
+            waiter = self._enqueue(weight, priority)
+            try:
+                delay = self._poll(waiter)
+                while delay > 0:
+                    self._cond.wait(delay)
+                    delay = self._poll(waiter)
+            except BaseException:
+                self._discard(waiter)
+                raise
+
+    async def acquire_async(self, weight: float = DEFAULT_WEIGHT, priority: str = LIVE) -> None:
+        """Coroutine counterpart of :meth:`acquire` (never blocks the loop)."""
+        with self._cond:
+            waiter = self._enqueue(weight, priority)
+            delay = self._poll(waiter)
+        try:
+            while delay > 0:
+                await asyncio.sleep(delay)
+                with self._cond:
+                    delay = self._poll(waiter)
+        except BaseException:
+            with self._cond:
+                self._discard(waiter)
+            raise
+
+    def try_acquire(self, weight: float = DEFAULT_WEIGHT, priority: str = LIVE) -> bool:
+        """Grant ``weight`` units only if that needs no waiting at all."""
+        with self._cond:
+            waiter = self._enqueue(weight, priority)
+            if self._poll(waiter) > 0:
+                self._discard(waiter)
+                return False
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = {name: 0 for name in PRIORITIES}
+            for waiter in self._queue:
+                queued[waiter.priority] += 1
+            return {
+                "rate_per_s": self.rate,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 4),
+                "priorities": {
+                    name: dict(values, queued=queued[name]) for name, values in self._stats.items()
+                },
+            }
+
+
+class ExchangePool:
+    """Bounded pool of ccxt clients for one exchange."""
+
+    def __init__(self, name: str, factory: Callable[[Dict[str, Any]], Any], size: int = POOL_SIZE) -> None:
+        self.name = name
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # Serialises the one-off `load_markets` so a cold burst of concurrent
+        # requests downloads markets once instead of once per client.
+        self._markets_lock = threading.Lock()
+        self._created = 0
+        # First client created: serves attribute reads without a lease.
+        self._reference: Optional[Any] = None
+        self._markets: Optional[Dict[str, Any]] = None
+        self._currencies: Optional[Dict[str, Any]] = None
+        self.budget: Optional[TokenBucket] = None
+        self.breaker = CircuitBreaker(name)
+
+    # ------------------------------------------------------------------
+    # Client lifecycle
+    # ------------------------------------------------------------------
+    def _new_client(self) -> Any:
+        client = self.factory(client_config())
+        self._ensure_budget(client)
+        with self._lock:
+            if self._reference is None:
+                self._reference = client
+            markets, currencies = self._markets, self._currencies
+        if markets is not None and hasattr(client, "set_markets"):
+            client.set_markets(markets, currencies)
+        return client
+
+    def _ensure_budget(self, client: Any) -> None:
+        """Size the exchange budget from the first client's ``rateLimit``."""
+        with self._lock:
+            if self.budget is None:
+                rate_limit_ms = float(getattr(client, "rateLimit", 0) or 0)
+                rate = 1000.0 / rate_limit_ms if rate_limit_ms > 0 else 0.0
+                self.budget = TokenBucket(rate, max(rate * RATE_BURST_S, 1.0))
+
+    def acquire(self, method: str) -> None:
+        """Wait for the budget of one ``method`` call at the caller's priority."""
+        if self.budget is None:
+            with self.lease():
+                pass  # the first client sizes the budget
+        self.budget.acquire(endpoint_weight(self.name, method), current_priority())
+
+    def try_acquire(self, method: str) -> bool:
+        """Take the budget of one ``method`` call only if it is free right now."""
+        if self.budget is None:
+            with self.lease():
+                pass
+        return self.budget.try_acquire(endpoint_weight(self.name, method), current_priority())
+
+    def reference_client(self) -> Any:
+        """A pool client for plain attribute reads, without leasing it.
+
+        Reading ``id``, ``rateLimit`` or ``timeframes`` needs no exclusive
+        use, so it neither waits for nor holds one of the ``size`` clients.
+        """
+        if self._reference is None:
+            with self.lease():
+                pass  # the first client becomes the reference
+        return self._reference
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Borrow a client exclusively; blocks while all ``size`` are busy."""
+        client = None
+        try:
+            client = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    client = self._new_client()
+                except BaseException:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                client = self._idle.get()
+        try:
+            yield client
+        finally:
+            self._remember_markets(client)
+            self._idle.put(client)
+
+    def _remember_markets(self, client: Any) -> None:
+        markets = getattr(client, "markets", None)
+        if not markets or self._markets is not None:
+            return
+        with self._lock:
+            if self._markets is None:
+                self._markets = markets
+                self._currencies = getattr(client, "currencies", None)
+
+    def _ensure_markets(self, client: Any) -> None:
+        """Give ``client`` the pool's markets, loading them on first use only."""
+        if getattr(client, "markets", None) or not hasattr(client, "load_markets"):
+            return
+        with self._markets_lock:
+            markets, currencies = self._markets, self._currencies
+            if markets is None:
+                weight = endpoint_weight(self.name, "load_markets")
+                self.budget.acquire(weight, current_priority())
+                with ACCOUNTING.timed(self.name, "load_markets", (), {}, weight):
+                    client.load_markets()
+                self._remember_markets(client)
+            elif hasattr(client, "set_markets"):
+                client.set_markets(markets, currencies)
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run ``client.<method>(*args, **kwargs)`` on a leased, budgeted client."""
+        cached_markets = method == "load_markets" and not kwargs.get("reload") and not (args and args[0])
+        if cached_markets:
+            with self.lease() as client:
+                self._ensure_markets(client)
+                return client.markets
+        return self._call(method, args, kwargs, charged=False)
+
+    def call_charged(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """`call` for a call whose budget was already granted by `try_acquire`."""
+        return self._call(method, args, kwargs, charged=True)
+
+    def _call(self, method: str, args: Any, kwargs: Dict[str, Any], charged: bool) -> Any:
+        with self.breaker.guard() as start:
+            # Budget first, client second: a backtest page queued behind live
+            # traffic must not sit on one of the pool's clients meanwhile.
+            if not charged:
+                self.acquire(method)
+            with self.lease() as client:
+                start()
+                mark_round_trip()
+                self._ensure_markets(client)
+                with ACCOUNTING.timed(self.name, method, args, kwargs, endpoint_weight(self.name, method)):
+                    return getattr(client, method)(*args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    @property
+    def markets_loaded(self) -> bool:
+        return self._markets is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": self._idle.qsize(),
+            "markets_loaded": self.markets_loaded,
+            "rate_limit": self.budget.stats() if self.budget is not None else None,
+            "circuit": self.breaker.snapshot(),
+        }
+
+
+class PooledExchange:
+    """ccxt-client facade that routes network calls through an `ExchangePool`.
+
+    ``fetch_*`` methods and ``load_markets`` run on a leased, budgeted
+    client and any other method on a leased client. Plain attributes (``id``,
+    ``rateLimit``, ``timeframes``, ...) are read from the pool's reference
+    client without a lease, so introspection never queues behind calls.
+    """
+
+    def __init__(self, pool: ExchangePool) -> None:
+        self.pool = pool
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("fetch_") or attr == "load_markets":
+            def _pooled_call(*args: Any, **kwargs: Any) -> Any:
+                return self.pool.call(attr, *args, **kwargs)
+
+            _pooled_call.__name__ = attr
+            return _pooled_call
+        value = getattr(self.pool.reference_client(), attr)
+        if not callable(value):
+            return value
+
+        def _leased_call(*args: Any, **kwargs: Any) -> Any:
+            with self.pool.lease() as client:
+                return getattr(client, attr)(*args, **kwargs)
+
+        _leased_call.__name__ = attr
+        return _leased_call
+
+
+class AsyncPooledExchange:
+    """asyncio facade over one exchange, attached to its threaded `ExchangePool`.
+
+    ``await facade.fetch_ohlcv(...)`` runs on a ``ccxt.async_support`` client
+    owned by the current event loop. Markets come from (and, when first
+    loaded here, go back to) the threaded pool, and every call waits on the
+    pool's budget, so sync and async traffic share one rate-limit budget.
+    """
+
+    def __init__(self, sync: PooledExchange, factory: Callable[[Dict[str, Any]], Any]) -> None:
+        self.sync = sync
+        self.pool = sync.pool
+        self.factory = factory
+        self._clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = WeakKeyDictionary()
+        self._market_locks: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = WeakKeyDictionary()
+
+    def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self.factory(client_config())
+            self.pool._ensure_budget(client)
+            self._clients[loop] = client
+            self._market_locks[loop] = asyncio.Lock()
+        return client
+
+    async def _ensure_markets(self, client: Any) -> None:
+        if getattr(client, "markets", None):
+            return
+        async with self._market_locks[asyncio.get_running_loop()]:
+            if getattr(client, "markets", None):
+                return
+            if self.pool._markets is not None:
+                client.set_markets(self.pool._markets, self.pool._currencies)
+                return
+            weight = endpoint_weight(self.pool.name, "load_markets")
+            await self.pool.budget.acquire_async(weight, current_priority())
+            with ACCOUNTING.timed(self.pool.name, "load_markets", (), {}, weight):
+                await client.load_markets()
+            self.pool._remember_markets(client)
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        client = self._client()
+        if method == "load_markets":
+            await self._ensure_markets(client)
+            return client.markets
+        return await self._call(client, method, args, kwargs, charged=False)
+
+    async def call_charged(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """`call` for a call whose budget was already granted (`ExchangePool.try_acquire`)."""
+        return await self._call(self._client(), method, args, kwargs, charged=True)
+
+    async def _call(self, client: Any, method: str, args: Any, kwargs: Dict[str, Any], charged: bool) -> Any:
+        with self.pool.breaker.guard() as start:
+            await self._ensure_markets(client)
+            weight = endpoint_weight(self.pool.name, method)
+            if not charged:
+                await self.pool.budget.acquire_async(weight, current_priority())
+            start()
+            mark_round_trip()
+            with ACCOUNTING.timed(self.pool.name, method, args, kwargs, weight):
+                return await getattr(client, method)(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        if not attr.startswith("fetch_"):
+            raise AttributeError(attr)
+
+        async def _pooled_call(*args: Any, **kwargs: Any) -> Any:
+            return await self.call(attr, *args, **kwargs)
+
+        _pooled_call.__name__ = attr
+        return _pooled_call
+
+    async def close(self) -> None:
+        """Close the current loop's client (its aiohttp session)."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+
+_POOLS: Dict[str, PooledExchange] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_exchange(name: str, factory: Callable[[Dict[str, Any]], Any]) -> PooledExchange:
+    """The process-wide pooled client for exchange ``name``."""
+    with _POOLS_LOCK:
+        pooled = _POOLS.get(name)
+        if pooled is None or pooled.pool.factory is not factory:
+            pooled = PooledExchange(ExchangePool(name, factory))
+            _POOLS[name] = pooled
+        return pooled
+
+
+_ASYNC_POOLS: Dict[str, AsyncPooledExchange] = {}
+
+
+def get_async_exchange(
+    pooled: PooledExchange, factory: Callable[[Dict[str, Any]], Any]
+) -> AsyncPooledExchange:
+    """The process-wide asyncio facade attached to the threaded ``pooled``."""
+    with _POOLS_LOCK:
+        facade = _ASYNC_POOLS.get(pooled.pool.name)
+        if facade is None or facade.sync is not pooled or facade.factory is not factory:
+            facade = AsyncPooledExchange(pooled, factory)
+            _ASYNC_POOLS[pooled.pool.name] = facade
+        return facade
+
+
+async def close_async_clients() -> None:
+    """Close every asyncio client owned by the running loop (app shutdown)."""
+    with _POOLS_LOCK:
+        facades = list(_ASYNC_POOLS.values())
+    for facade in facades:
+        await facade.close()
+
+
+def warm_up(exchanges: Iterable[str], registry: Dict[str, Callable[[Dict[str, Any]], Any]]) -> List[str]:
+    """Load markets once for each exchange; returns the ones that failed.
+
+    Failures are logged, never raised: a cold pool still works, its first
+    request simply pays the `load_markets` round trip.
+    """
+    failed: List[str] = []
+    for name in exchanges:
+        factory = registry.get(name)
+        if factory is None:
+            continue
+        try:
+            get_exchange(name, factory).load_markets()
+        except Exception as exc:  # pragma: no cover - depends on network
+            _LOGGER.warning("Could not pre-load %s markets: %s", name, exc)
+            failed.append(name)
+    return failed
+
+
+def reset_pools() -> None:
+    """Forget every pool — useful in tests."""
+    with _POOLS_LOCK:
+        _POOLS.clear()
+        _ASYNC_POOLS.clear()
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    with _POOLS_LOCK:
+        return {name: pooled.pool.stats() for name, pooled in _POOLS.items()}
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-exchange budget state and queue-wait counters per priority."""
+    with _POOLS_LOCK:
+        pools = [pooled.pool for pooled in _POOLS.values()]
+    return {pool.name: pool.budget.stats() for pool in pools if pool.budget is not None}
+
+
+_PROMETHEUS_METRICS = (
+    ("granted", "counter", "Exchange calls let through the rate-limit budget"),
+    ("waited", "counter", "Exchange calls that had to queue for budget"),
+    ("wait_seconds", "counter", "Total seconds exchange calls spent queued for budget"),
+    ("wait_seconds_max", "gauge", "Longest queue wait observed, in seconds"),
+    ("weight", "counter", "Budget units consumed"),
+    ("queued", "gauge", "Exchange calls currently queued for budget"),
+)
+
+
+def render_prometheus(prefix: str = "mmk_ratelimit") -> str:
+    """`rate_limit_stats` in the Prometheus text exposition format."""
+    stats = rate_limit_stats()
+    out: List[str] = []
+    for name, kind, help_text in _PROMETHEUS_METRICS:
+        full = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+        samples = [
+            f'{full}{{exchange="{exchange}",priority="{priority}"}} {float(values[name])!r}'
+            for exchange, budget in sorted(stats.items())
+            for priority, values in budget["priorities"].items()
+        ]
+        if samples:
+            out.append(f"# HELP {full} {help_text}")
+            out.append(f"# TYPE {full} {kind}")
+            out.extend(samples)
+    return "\n".join(out) + "\n" if out else ""
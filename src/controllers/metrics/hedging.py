@@ -0,0 +1,268 @@
+"""Hedged exchange requests: cut the tail latency of ``fetch_ohlcv``.
+
+The p99 of the market-data endpoints is dominated by the occasional
+multi-second ``fetch_ohlcv`` straggler (a slow exchange node, a retransmit),
+not by the typical call. A hedged request bounds that tail: when the first
+call has not answered within the ``OHLCV_HEDGE_PERCENTILE``-th percentile of
+recent latencies for its series (`latency_key`: exchange, timeframe and
+depth bucket), an identical second call is issued and
+whichever answers first wins (the asyncio loser is cancelled; a threaded one
+is left to finish and its answer dropped).
+
+A hedge is extra load on the exchange, so it is only sent when the
+rate-limit budget can pay for it right now (`ExchangePool.try_acquire`) —
+it never queues, and never delays anyone else's call. Until
+``OHLCV_HEDGE_MIN_SAMPLES`` latencies have been observed no hedge is sent,
+and the hedge delay never drops below ``OHLCV_HEDGE_MIN_DELAY_MS``. The
+latencies are exchange round trips only: the pool stamps the start of the
+network call (`mark_round_trip`), so time queued for the rate-limit budget
+or for a free client never inflates the percentile — and the hedge delay
+is counted from that same stamp, so a call still queued is never hedged as
+a straggler.
+
+Opt-in: ``OHLCV_HEDGE_PERCENTILE`` unset or ``0`` leaves every call as is.
+`HedgePolicy.stats` (``/v1/cache/hedging``) reports per series the
+calls made, how many were hedged, how many hedges won and how many were
+skipped for lack of budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar
+from os import getenv
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar, Union
+
+import numpy as np
+
+T = TypeVar("T")
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ohlcv-hedge")
+
+
+class _RoundTrip:
+    """Start of the call `HedgePolicy` is timing, and the event told when it goes out."""
+
+    __slots__ = ("started", "sent")
+
+    def __init__(self, sent: Optional[Union[threading.Event, asyncio.Event]] = None) -> None:
+        self.started = time.perf_counter()
+        self.sent = sent
+
+
+# The round trip being timed in this context, moved forward by
+# `mark_round_trip` once the request actually goes out.
+_ROUND_TRIP: ContextVar[Optional[_RoundTrip]] = ContextVar("hedge_round_trip", default=None)
+
+
+def mark_round_trip() -> None:
+    """Stamp the start of the exchange round trip of the call being timed.
+
+    Called by the exchange pool right before the network call, once the
+    rate-limit budget and a client are granted; a no-op outside a hedged call.
+    """
+    trip = _ROUND_TRIP.get()
+    if trip is not None:
+        trip.started = time.perf_counter()
+        if trip.sent is not None:
+            trip.sent.set()
+
+
+def latency_key(exchange: str, timeframe: str, limit: Optional[int]) -> str:
+    """History key of a ``fetch_ohlcv``: ``"<exchange>:<timeframe>:<depth>"``.
+
+    A 5-candle tail refresh and a 1000-candle download do not share a
+    latency profile, so the depth is bucketed to the next power of two.
+    """
+    depth = 1 << max(0, int(limit) - 1).bit_length() if limit else 0
+    return f"{exchange}:{timeframe}:{depth}"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(getenv(name, str(default)).split("#", 1)[0].strip())
+    except ValueError:
+        return default
+
+
+class HedgePolicy:
+    """Percentile-triggered hedging with per-key latency history and stats."""
+
+    def __init__(
+        self,
+        *,
+        percentile: float,
+        min_samples: int = 20,
+        min_delay_s: float = 0.05,
+        window: int = 256,
+    ) -> None:
+        if not 0 <= percentile < 100:
+            raise ValueError(f"Percentil de cobertura inválido: {percentile} (0 = desactivado, <100)")
+        self.percentile = percentile
+        self.min_samples = max(1, min_samples)
+        self.min_delay_s = max(0.0, min_delay_s)
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        return cls(
+            percentile=_env_float("OHLCV_HEDGE_PERCENTILE", 0.0),
+            min_samples=int(_env_float("OHLCV_HEDGE_MIN_SAMPLES", 20)),
+            min_delay_s=_env_float("OHLCV_HEDGE_MIN_DELAY_MS", 50.0) / 1000.0,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0
+
+    # ------------------------------------------------------------------
+    # Latency history
+    # ------------------------------------------------------------------
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            history = self._latencies.get(key)
+            if history is None:
+                history = self._latencies[key] = deque(maxlen=self.window)
+            history.append(seconds)
+
+    def delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging (``None``: not enough history yet)."""
+        with self._lock:
+            history = list(self._latencies.get(key, ()))
+        if len(history) < self.min_samples:
+            return None
+        return max(float(np.percentile(history, self.percentile)), self.min_delay_s)
+
+    def _count(self, key: str, name: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                key, {"calls": 0, "hedged": 0, "hedge_wins": 0, "primary_wins": 0, "budget_skips": 0}
+            )
+            stats[name] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """``{key: counters + hedge_rate, hedge_win_rate, delay_s}``."""
+        with self._lock:
+            snapshot = {key: dict(values) for key, values in self._stats.items()}
+        for key, values in snapshot.items():
+            values["hedge_rate"] = round(values["hedged"] / values["calls"], 4) if values["calls"] else None
+            values["hedge_win_rate"] = round(values["hedge_wins"] / values["hedged"], 4) if values["hedged"] else None
+            delay = self.delay(key)
+            values["delay_s"] = round(delay, 4) if delay is not None else None
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def _timed(self, key: str, fn: Callable[[], T], trip: Optional[_RoundTrip] = None) -> T:
+        trip = trip or _RoundTrip()
+        token = _ROUND_TRIP.set(trip)
+        try:
+            result = fn()
+        finally:
+            _ROUND_TRIP.reset(token)
+        self.observe(key, time.perf_counter() - trip.started)
+        return result
+
+    def call(
+        self,
+        key: str,
+        primary: Callable[[], T],
+        hedge: Callable[[], T],
+        can_hedge: Callable[[], bool],
+    ) -> T:
+        """Run ``primary``; past the hedge delay, also ``hedge`` if ``can_hedge()``.
+
+        ``can_hedge`` is called at most once, only when the hedge is due, and
+        must reserve whatever the hedge consumes (the rate-limit budget).
+        The delay runs from the moment ``primary`` goes out on the network
+        (`mark_round_trip`), not from the call: time spent queued for the
+        budget or a client is not straggling, and a ``primary`` that never
+        reaches the network is never hedged.
+        """
+        self._count(key, "calls")
+        delay = self.delay(key)
+        if delay is None:
+            return self._timed(key, primary)
+        trip = _RoundTrip(threading.Event())
+        first = _EXECUTOR.submit(contextvars.copy_context().run, self._timed, key, primary, trip)
+        first.add_done_callback(lambda _: trip.sent.set())  # failed before going out
+        trip.sent.wait()
+        done, _ = wait([first], timeout=max(0.0, trip.started + delay - time.perf_counter()))
+        if done:
+            return first.result()
+        if not can_hedge():
+            self._count(key, "budget_skips")
+            return first.result()
+        self._count(key, "hedged")
+        second = _EXECUTOR.submit(contextvars.copy_context().run, self._timed, key, hedge)
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._count(key, "hedge_wins" if future is second else "primary_wins")
+                    return future.result()
+                error = error or future.exception()
+        raise error  # both failed
+
+    async def call_async(
+        self,
+        key: str,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+        can_hedge: Callable[[], bool],
+    ) -> T:
+        """Awaitable :meth:`call`; the losing request is cancelled."""
+        self._count(key, "calls")
+        delay = self.delay(key)
+        if delay is None:
+            return await self._timed_async(key, primary)
+        trip = _RoundTrip(asyncio.Event())
+        first = asyncio.ensure_future(self._timed_async(key, primary, trip))
+        first.add_done_callback(lambda _: trip.sent.set())  # failed before going out
+        tasks = {first}
+        try:
+            await trip.sent.wait()
+            done, _ = await asyncio.wait(tasks, timeout=max(0.0, trip.started + delay - time.perf_counter()))
+            if done:
+                return first.result()
+            if not can_hedge():
+                self._count(key, "budget_skips")
+                return await first
+            self._count(key, "hedged")
+            second = asyncio.ensure_future(self._timed_async(key, hedge))
+            tasks.add(second)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._count(key, "hedge_wins" if task is second else "primary_wins")
+                        return task.result()
+                    error = error or task.exception()
+            raise error  # both failed
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _timed_async(self, key: str, fn: Callable[[], Awaitable[T]], trip: Optional[_RoundTrip] = None) -> T:
+        trip = trip or _RoundTrip()
+        token = _ROUND_TRIP.set(trip)
+        try:
+            result = await fn()
+        finally:
+            _ROUND_TRIP.reset(token)
+        self.observe(key, time.perf_counter() - trip.started)
+        return result
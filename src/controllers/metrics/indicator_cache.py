@@ -0,0 +1,233 @@
+"""Enriched-frame cache shared by every live endpoint.
+
+`/v1/metrics/get`, `/v1/movements/`, `/v1/charts/` and `/v1/setups/evaluate`
+all ran `IndicatorsService` on the same candles again within the same candle:
+a dashboard refresh or an MCP client polling paid for the full indicator
+compute on every call. `enriched` runs it once per frame and serves every
+later caller — whichever service asks — from memory.
+
+Entries are keyed by what the result depends on: ``(exchange, symbol,
+timeframe, last candle ts, first candle ts, rows, last candle OHLCV, params)``.
+The timestamps and row count pin the window (EMA seeds and percentile
+windows depend on its length, so ``limit`` 500 and 1000 are different
+entries); the last candle's values make a frame that still carries the
+forming candle (the charts) miss as soon as that candle moves. Like the
+OHLCV cache keys, a key becomes unreachable when the next candle closes; the
+TTL only bounds memory.
+
+An entry remembers which `IndicatorsService.STEPS` it holds. A caller asking
+for more (`IndicatorsService.calculate` projections: movements needs only the
+rule inputs, the chart only Konkorde and the oscillators) computes just the
+missing steps on top of the cached frame, and the entry grows. Concurrent
+misses on one key share a single computation (`single_flight`). With
+``SHARED_CACHE_URL`` set, entries are also published to the cross-instance
+tier (`shared_cache`) with their result dict, under the same key.
+
+Cached frames are stored on read-only column arrays, like the OHLCV cache's
+blocks: writing into one raises "assignment destination is read-only"
+instead of corrupting the entry. Callers get a shallow copy, so adding
+columns of their own never touches the cache. Results are deep-copied per
+call (``trend_speed_stats`` and the other nested dicts and lists included),
+so a caller editing its payload cannot change what later requests see.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from os import getenv
+from typing import Any, Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from cachetools import TTLCache
+except Exception:  # pragma: no cover - cachetools is a hard runtime dep
+    TTLCache = None  # type: ignore[assignment]
+
+from .cache_stats import STATS, InstrumentedTTLCache, frame_bytes
+from .indicators_service import IndicatorsService
+from .shared_cache import decode_frame_extra, encode_frame, get_shared_cache, shared_key
+from .single_flight import SingleFlight
+
+CACHE_MAXSIZE = int(getenv("ENRICHED_CACHE_MAXSIZE", "128").split("#", 1)[0].strip())
+CACHE_TTL_S = 4 * 60 * 60
+
+_ALL_STEPS: FrozenSet[str] = frozenset(step for step, _, _ in IndicatorsService.STEPS)
+
+# Keys are (exchange, symbol, timeframe, last ts, first ts, rows, last OHLCV,
+# bbwp_lookback); the timeframe stays at index 2 for the stats series.
+CacheKey = Tuple[Any, ...]
+
+
+class Entry(NamedTuple):
+    frame: pd.DataFrame
+    result: Dict[str, Any]  # every key the steps below fill
+    steps: FrozenSet[str]
+
+
+class Enriched(NamedTuple):
+    frame: pd.DataFrame  # OHLCV plus the columns of every step computed so far
+    result: Dict[str, Any]  # the requested keys (all of them without `fields`)
+
+
+_CACHE: Optional["TTLCache"] = (
+    InstrumentedTTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_S, name="enriched", timeframe_of=lambda key: key[2])
+    if TTLCache is not None
+    else None
+)
+_LOCK = threading.Lock()
+_FLIGHTS = SingleFlight()
+
+
+def enriched(
+    raw: pd.DataFrame,
+    *,
+    exchange: Optional[str] = None,
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+    bbwp_lookback: int = 252,
+) -> Enriched:
+    """Indicators for ``raw``, computed at most once per frame.
+
+    ``fields`` selects result keys as `IndicatorsService.calculate` does
+    (ValueError on an unknown one). Without ``exchange``/``symbol``/
+    ``timeframe`` the frame is not identifiable and nothing is cached.
+    """
+    wanted = None if fields is None else frozenset(fields)
+    steps = _ALL_STEPS if wanted is None else frozenset(IndicatorsService.resolve_steps(wanted))
+    key = cache_key(raw, exchange, symbol, timeframe, bbwp_lookback)
+    if key is None or _CACHE is None:
+        service = IndicatorsService(raw, bbwp_lookback=bbwp_lookback)
+        result = service.calculate_all() if wanted is None else service.calculate(wanted)
+        return Enriched(service.df, result)
+
+    entry = _lookup(key)
+    while entry is None or not steps <= entry.steps:
+        # A caller that waited on someone else's (smaller) computation loops
+        # and extends the entry it got.
+        entry, _ = _FLIGHTS.do(key, lambda base=entry: _compute(key, raw, base, steps, bbwp_lookback))
+    frame = entry.frame.copy(deep=False)
+    names = entry.result if wanted is None else wanted
+    return Enriched(frame, {name: copy.deepcopy(entry.result[name]) for name in names})
+
+
+def cache_key(
+    raw: pd.DataFrame,
+    exchange: Optional[str],
+    symbol: Optional[str],
+    timeframe: Optional[str],
+    bbwp_lookback: int = 252,
+) -> Optional[CacheKey]:
+    """Key of ``raw``'s indicators, or ``None`` if the frame cannot be pinned."""
+    if not exchange or not symbol or not timeframe or raw.empty or "timestamp" not in raw.columns:
+        return None
+    stamps = raw["timestamp"]
+    last = raw.iloc[-1]
+    candle = tuple(float(last[column]) for column in ("open", "high", "low", "close", "volume"))
+    return (
+        exchange.lower(), symbol, timeframe, int(stamps.iloc[-1]), int(stamps.iloc[0]), len(raw), candle, bbwp_lookback
+    )
+
+
+def clear() -> None:
+    if _CACHE is not None:
+        with _LOCK:
+            _CACHE.clear()
+
+
+def _lookup(key: CacheKey) -> Optional[Entry]:
+    with _LOCK:
+        entry = _CACHE.get(key)
+    if entry is not None:
+        STATS.hit("enriched", key[2])
+        return entry
+    STATS.miss("enriched", key[2])
+    entry = _shared_entry(key)
+    if entry is not None:
+        with _LOCK:
+            _CACHE[key] = entry
+    return entry
+
+
+def _compute(
+    key: CacheKey, raw: pd.DataFrame, base: Optional[Entry], steps: FrozenSet[str], bbwp_lookback: int
+) -> Entry:
+    with _LOCK:
+        current = _CACHE.get(key)
+    if current is not None and (base is None or len(current.steps) > len(base.steps)):
+        base = current  # grown by another caller since our lookup
+        if steps <= base.steps:
+            return base
+
+    started = time.perf_counter()
+    if base is None:
+        service = IndicatorsService(raw, bbwp_lookback=bbwp_lookback)
+        if steps == _ALL_STEPS:
+            result = service.calculate_all()
+        else:
+            result = service.run_steps(step for step, _, _ in IndicatorsService.STEPS if step in steps)
+        entry = Entry(_read_only(service.df), result, steps)
+    else:
+        # Dependencies of the missing steps are in `base` or among them.
+        service = IndicatorsService(base.frame, bbwp_lookback=bbwp_lookback)
+        missing = [step for step, _, _ in IndicatorsService.STEPS if step in steps and step not in base.steps]
+        result = {**base.result, **service.run_steps(missing)}
+        entry = Entry(_read_only(service.df), result, base.steps | steps)
+    STATS.fetched("enriched", key[2], time.perf_counter() - started, len(raw))
+
+    with _LOCK:
+        _CACHE[key] = entry
+    shared = get_shared_cache()
+    if shared is not None:
+        payload = encode_frame(entry.frame, {"result": entry.result, "steps": sorted(entry.steps)})
+        if payload is not None:
+            shared.set(shared_key("enriched", key), payload, CACHE_TTL_S)
+    return entry
+
+
+def _shared_entry(key: CacheKey) -> Optional[Entry]:
+    """Entry another instance computed for ``key`` (shared tier)."""
+    shared = get_shared_cache()
+    if shared is None:
+        return None
+    payload = shared.get(shared_key("enriched", key))
+    if payload is not None:
+        try:
+            frame, extra = decode_frame_extra(payload)
+            entry = Entry(_read_only(frame), extra["result"], frozenset(extra["steps"]))
+        except Exception:
+            entry = None
+        if entry is not None:
+            STATS.hit("enriched_shared", key[2])
+            return entry
+    STATS.miss("enriched_shared", key[2])
+    return None
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` rebuilt on one non-writeable array per column (no data copied)."""
+    columns = {}
+    for name in df.columns:
+        values = np.ascontiguousarray(df[name].to_numpy())
+        values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _gauge() -> Dict[str, Any]:
+    if _CACHE is None:
+        return {}
+    with _LOCK:
+        items = list(_CACHE.items())
+    sizes: Dict[str, Any] = {}
+    for key, entry in items:
+        entries, size = sizes.get(key[2], (0, 0))
+        sizes[key[2]] = (entries + 1, size + frame_bytes(entry.frame))
+    return sizes
+
+
+STATS.register_gauge("enriched", _gauge)
@@ -1,10 +1,11 @@
-from typing import Dict, Any, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import pandas_ta_classic as ta
 
 from .bbwp_owner import bbwp_owner_series
+from .rolling_rank import rolling_percentile_rank
 from .trend_speed import trend_speed_analyzer
 
 
@@ -13,11 +14,41 @@ class IndicatorsService:
 
     Columns are added to the internal DataFrame and a dict with the latest
     (last candle) values is returned to the caller.
+
+    Indicators are computed in steps (`STEPS`); `calculate(fields)` runs only
+    the steps the requested result keys need, plus the steps those read
+    from (Konkorde reuses the RSI column).
     """
 
+    # Steps in `calculate_all` order: (step, result keys it fills, steps
+    # whose `self.df` columns it reads). Each step is `_calc_<step>`.
+    STEPS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+        ("rsi", ("rsi14",), ()),
+        ("adx", ("adx14", "plus_di", "minus_di"), ()),
+        ("bbwp", ("bbw", "bbwp", "bbwp_ma4"), ()),
+        ("bbwp_owner", ("bbwp_owner", "bbwp_owner_ma5"), ()),
+        ("ao", ("ao", "ao_diff", "ao_color", "ao_color_change"), ()),
+        ("ma50", ("sma50", "ema50"), ()),
+        ("ma200", ("sma200", "ema200"), ()),
+        (
+            "konkorde",
+            ("konkorde_azul", "konkorde_verde", "konkorde_marron", "konkorde_value", "konkorde_signal"),
+            ("rsi",),
+        ),
+        ("macd", ("macd", "macd_signal", "macd_histogram"), ()),
+        ("stoch_rsi", ("stoch_rsi_k", "stoch_rsi_d"), ()),
+        ("atr", ("atr",), ()),
+        ("volatility", ("volatility_20",), ()),
+        ("trend_speed", ("trend_speed", "trend_speed_raw", "trend_speed_dyn_ema", "trend_speed_stats"), ()),
+    )
+    #: Every result key `calculate` accepts.
+    FIELDS: FrozenSet[str] = frozenset(key for _, keys, _ in STEPS for key in keys)
+
     def __init__(self, df: pd.DataFrame, *, bbwp_lookback: int = 252):
-        # Work on a copy to avoid mutating the caller's DataFrame.
-        self.df = df.copy()
+        # Shallow copy: indicator columns are only ever added, never written
+        # into the OHLCV ones, so the caller's frame is left untouched without
+        # duplicating its data (cached market frames are read-only anyway).
+        self.df = df.copy(deep=False)
         self.bbwp_lookback = bbwp_lookback
 
     @staticmethod
@@ -32,21 +63,49 @@ class IndicatorsService:
     # Main entrypoint
     # ---------------------------------------------------------------------
     def calculate_all(self) -> Dict[str, Any]:
-        result: Dict[str, Any] = {}
+        return self.calculate()
 
-        self._calc_rsi(result)
-        self._calc_adx(result)
-        self._calc_bbwp(result)
-        self._calc_bbwp_owner(result)
-        self._calc_ao(result)
-        self._calc_moving_averages(result)
-        self._calc_konkorde(result)
-        self._calc_momentum_indicators(result)
-        self._calc_volatility_indicators(result)
-        self._calc_trend_speed(result)
+    def calculate(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Compute only what the result keys in `fields` need (all if None).
+
+        Runs the steps producing `fields` and their dependencies, in
+        `calculate_all` order, and returns exactly the requested keys (same
+        values as `calculate_all`). Raises ValueError on an unknown key.
+        """
+        if fields is None:
+            return self.run_steps(step for step, _, _ in self.STEPS)
+        wanted = frozenset(fields)
+        result = self.run_steps(self.resolve_steps(wanted))
+        return {key: value for key, value in result.items() if key in wanted}
 
+    def run_steps(self, steps: Iterable[str]) -> Dict[str, Any]:
+        """Run exactly `steps`, in the given order; every key they fill.
+
+        The columns of their dependencies must already be on `self.df`
+        (`indicator_cache` extends a cached frame this way).
+        """
+        result: Dict[str, Any] = {}
+        for step in steps:
+            getattr(self, f"_calc_{step}")(result)
         return result
 
+    @classmethod
+    def resolve_steps(cls, fields: Iterable[str]) -> List[str]:
+        """Steps needed for `fields`, dependencies included, in run order."""
+        fields = set(fields)
+        unknown = fields - cls.FIELDS
+        if unknown:
+            raise ValueError(f"Campos de indicadores no soportados: {', '.join(sorted(unknown))}")
+        depends = {step: needs for step, _, needs in cls.STEPS}
+        pending = [step for step, keys, _ in cls.STEPS if fields.intersection(keys)]
+        needed = set()
+        while pending:
+            step = pending.pop()
+            if step not in needed:
+                needed.add(step)
+                pending.extend(depends[step])
+        return [step for step, _, _ in cls.STEPS if step in needed]
+
     def calculate_konkorde(self) -> Dict[str, Any]:
         """Compute ONLY the Konkorde block (cheaper than `calculate_all`).
 
@@ -54,9 +113,7 @@ class IndicatorsService:
         `konkorde_verde` and `konkorde_marron` columns; the returned dict
         carries the last-candle values (same keys as `calculate_all`).
         """
-        result: Dict[str, Any] = {}
-        self._calc_konkorde(result)
-        return result
+        return self.calculate(next(keys for step, keys, _ in self.STEPS if step == "konkorde"))
 
     def calculate_oscillators(self) -> Dict[str, Any]:
         """Compute ONLY the ADX / BBWP / AO oscillators (cheaper than
@@ -126,11 +183,9 @@ class IndicatorsService:
         bb = ta.bbands(self.df["close"], length=20, std=2)
         bbw = (bb["BBU_20_2.0"] - bb["BBL_20_2.0"]) / bb["BBM_20_2.0"] * 100
         self.df["bbw"] = bbw
-        # Percentile rank of the current BBW value within the rolling window.
-        self.df["bbwp"] = bbw.rolling(self.bbwp_lookback, min_periods=1).apply(
-            lambda x: x.rank(pct=True).iloc[-1] * 100,
-            raw=False,
-        )
+        # Percentile rank of the current BBW value within the rolling window
+        # (pandas `rank(pct=True)` semantics, see `rolling_rank`).
+        self.df["bbwp"] = rolling_percentile_rank(bbw, self.bbwp_lookback, min_periods=1) * 100
         # Smoothed BBWP for visual confirmation (kept for backwards compat).
         self.df["bbwp_ma4"] = self.df["bbwp"].rolling(4).mean()
 
@@ -200,16 +255,21 @@ class IndicatorsService:
             return "to_red"
         return None
 
-    def _calc_moving_averages(self, result: Dict[str, Any]):
-        for period in [50, 200]:
-            sma_name = f"sma{period}"
-            ema_name = f"ema{period}"
-            self.df[sma_name] = ta.sma(self.df["close"], length=period)
-            self.df[ema_name] = ta.ema(self.df["close"], length=period)
-            last_sma = self.df[sma_name].dropna().iloc[-1] if self.df[sma_name].dropna().size else 0.0
-            last_ema = self.df[ema_name].dropna().iloc[-1] if self.df[ema_name].dropna().size else 0.0
-            result[sma_name] = float(last_sma)
-            result[ema_name] = float(last_ema)
+    def _calc_ma50(self, result: Dict[str, Any]):
+        self._calc_moving_averages(result, 50)
+
+    def _calc_ma200(self, result: Dict[str, Any]):
+        self._calc_moving_averages(result, 200)
+
+    def _calc_moving_averages(self, result: Dict[str, Any], period: int):
+        sma_name = f"sma{period}"
+        ema_name = f"ema{period}"
+        self.df[sma_name] = ta.sma(self.df["close"], length=period)
+        self.df[ema_name] = ta.ema(self.df["close"], length=period)
+        last_sma = self.df[sma_name].dropna().iloc[-1] if self.df[sma_name].dropna().size else 0.0
+        last_ema = self.df[ema_name].dropna().iloc[-1] if self.df[ema_name].dropna().size else 0.0
+        result[sma_name] = float(last_sma)
+        result[ema_name] = float(last_ema)
 
     def _calc_konkorde(self, result: Dict[str, Any]):
         """Konkorde indicator by Blai5.
@@ -302,9 +362,7 @@ class IndicatorsService:
         std25 = tprice.rolling(25).std(ddof=0)
         b1 = (tprice - sma25) / (2 * std25.replace(0, np.nan)) * 100.0
 
-        rsi14 = ta.rsi(close, length=14)
-        if rsi14 is None:
-            rsi14 = pd.Series(np.nan, index=df.index)
+        rsi14 = df["rsi14"]  # `_calc_rsi` (a declared dependency)
 
         # Re-centre the 0-100 oscillators (RSI, MFI) on zero so they share
         # the same axis as the already 0-centred B1/OscP/OscN. Without this
@@ -345,8 +403,8 @@ class IndicatorsService:
             return "bearish_weak"
         return "neutral"
 
-    def _calc_momentum_indicators(self, result: Dict[str, Any]):
-        """Additional momentum indicators that complement the main set."""
+    def _calc_macd(self, result: Dict[str, Any]):
+        """MACD(12, 26, 9): momentum complement to the main set."""
         # MACD — pandas_ta returns None when the series is too short for the
         # default 26-period EMA, fall back to NaN values rather than crashing.
         try:
@@ -365,7 +423,8 @@ class IndicatorsService:
             result["macd_signal"] = 0.0
             result["macd_histogram"] = 0.0
 
-        # Stochastic RSI
+    def _calc_stoch_rsi(self, result: Dict[str, Any]):
+        """Stochastic RSI (14, 14, 3, 3)."""
         try:
             stoch_rsi = ta.stochrsi(self.df["close"], length=14)
         except Exception:
@@ -377,9 +436,8 @@ class IndicatorsService:
             result["stoch_rsi_k"] = 0.0
             result["stoch_rsi_d"] = 0.0
 
-    def _calc_volatility_indicators(self, result: Dict[str, Any]):
-        """Volatility indicators that complement BBW/BBWP."""
-        # Average True Range (ATR)
+    def _calc_atr(self, result: Dict[str, Any]):
+        """Average True Range (ATR 14), used for position sizing."""
         try:
             atr = ta.atr(self.df["high"], self.df["low"], self.df["close"], length=14)
         except Exception:
@@ -389,6 +447,8 @@ class IndicatorsService:
         self.df["atr14"] = atr
         result["atr"] = self._safe_last(atr)
 
+    def _calc_volatility(self, result: Dict[str, Any]):
+        """Realised volatility complementing BBW/BBWP."""
         # Realised volatility (rolling stdev of returns) expressed in %.
         returns = self.df["close"].pct_change()
         volatility = returns.rolling(20).std() * 100
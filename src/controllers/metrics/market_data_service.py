@@ -3,10 +3,13 @@
 Public exchange OHLCV calls are inherently rate-limited and a single
 request can take hundreds of milliseconds, so we keep the most recent N
 candles in a `cachetools.TTLCache` keyed by `(exchange, symbol, timeframe,
-limit, expected_last_closed_candle_ts)`.  The last component binds every
+expected_last_closed_candle_ts)`.  The last component binds every
 entry to the candle it represents: it changes the instant a new candle
 closes, so a cache hit can never return a repainted/stale candle — the
-entry simply becomes unreachable and a fresh fetch happens.
+entry simply becomes unreachable and a fresh fetch happens.  `limit` is
+deliberately NOT in the key: `/metrics/get` (500), `ChartService` (1000) and
+`AveragesService` (1500) share one entry per candle, smaller limits being
+served as tail slices of the deepest frame fetched so far.
 
 There is one cache *per timeframe*, each carrying its own TTL (the candle
 duration, capped at 6h).  A single shared cache would inherit the TTL of
@@ -16,26 +19,80 @@ blind for ~11h on 2026-07-13).  The candle-bound key prevents staleness as
 long as the grid anchors below match the exchanges' real candle grids; the
 TTL cap bounds the damage if one ever drifts.
 
-A per-key `asyncio.Lock` would be ideal but ccxt is sync, so we settle for
-a coarse-grained `threading.Lock` to keep the cache thread-safe.  Cache
-misses still hit ccxt; cache hits return a defensive copy of the
-DataFrame so callers cannot mutate the shared object.
+A rotated key does not have to mean a full refetch: the most recent frame per
+`(exchange, symbol, timeframe)` is kept aside, and when the next candle
+closes only the candles since its last row are fetched (`since=`) and
+spliced on, dropping the head to keep `limit` rows. On low timeframes that
+turns a 500-candle download at every close into a 2-candle one.
+
+A coarse-grained `threading.Lock` keeps the cache thread-safe, and misses are
+coalesced per key (`single_flight.SingleFlight`): when every client misses
+the same key at a candle close, one of them fetches and the rest wait for
+its result instead of each issuing an identical exchange call.
+
+Cache entries are stored compactly: one read-only structured numpy block of
+candles (`_pack`; float32 volume whenever that is lossless, no separate
+datetime index), and all caches together are bounded by a byte budget
+(``MARKET_DATA_CACHE_MB``) with LRU eviction (`_CacheBudget`, a running byte
+total kept as entries are inserted, evicted and expire). A cache hit returns a frame whose
+columns are zero-copy views of that block (`_unpack`) instead of a defensive
+`DataFrame.copy()` — a caller writing into a cell gets "assignment
+destination is read-only" rather than silently corrupting the shared entry.
+Adding columns to the returned frame is fine (new columns live only on the
+caller's frame), which is all the indicator services do.
+
+With ``SHARED_CACHE_URL`` set, a miss first looks in the cross-instance tier
+(`shared_cache`) under the same candle-bound key, and every exchange fetch is
+published there, so scaled-out instances download each candle once.
+
+While an exchange's circuit breaker is open (`circuit_breaker`), a miss is
+answered from the series' last cached frame, flagged stale, instead of
+failing.
+
+`get_ohlcv_async` is the asyncio twin of `get_ohlcv` for the `async def`
+routes: same caches, same keys, same tail refresh and the same in-flight
+table, but the exchange call is awaited on a `ccxt.async_support` client
+(see `exchange_clients.get_async_exchange`) instead of blocking the event
+loop.
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from os import getenv
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import ccxt
+import ccxt.async_support as ccxt_async
+import numpy as np
 import pandas as pd
 
+from .cache_stats import STATS, InstrumentedTTLCache
+from .call_accounting import call_service, current_scope, enter_scope
+from .candle_store import get_candle_store
+from .circuit_breaker import CircuitOpenError, mark_stale
+from .replay_exchange import ReplayExchange
+from .shared_cache import decode_arrays, encode_arrays, get_shared_cache, shared_key
+from .exchange_clients import (
+    AsyncPooledExchange,
+    PooledExchange,
+    call_priority,
+    current_priority,
+    get_async_exchange,
+    get_exchange,
+)
+from .hedging import HedgePolicy, latency_key
+from .single_flight import SingleFlight
+
 try:
-    from cachetools import TTLCache
+    from cachetools import Cache, TTLCache
 except Exception:  # pragma: no cover - cachetools is a hard runtime dep
-    TTLCache = None  # type: ignore[assignment]
+    Cache = TTLCache = None  # type: ignore[assignment,misc]
 
 
 _TIMEFRAME_TO_SECONDS: Dict[str, int] = {
@@ -81,12 +138,188 @@ def _grid_offset_ms(timeframe: str, exchange: Optional[str]) -> int:
     return _GRID_ANCHOR_OFFSET_MS.get(timeframe, 0)
 
 
+# Compact candle storage: one structured block per cache entry instead of a
+# DataFrame (no separate datetime index, no per-column block overhead).
+_CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+_CANDLE_DTYPES = {
+    volume: np.dtype([("timestamp", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"), ("volume", volume)])
+    for volume in ("<f4", "<f8")
+}
+# Volume is stored as float32 when that loses nothing (every value survives
+# the round trip exactly); "1" forces float32 (~7 significant digits).
+_FLOAT32_VOLUME = getenv("MARKET_DATA_FLOAT32_VOLUME", "0").split("#", 1)[0].strip() in ("1", "true", "yes")
+
+
+def _pack(df: pd.DataFrame) -> np.ndarray:
+    """Read-only structured block holding ``df``'s candles."""
+    volume = df["volume"].to_numpy(dtype=float)
+    narrow = volume.astype(np.float32)
+    compact = _FLOAT32_VOLUME or bool(np.array_equal(narrow.astype(float), volume, equal_nan=True))
+    block = np.empty(len(df), dtype=_CANDLE_DTYPES["<f4" if compact else "<f8"])
+    block["timestamp"] = df["timestamp"].to_numpy(dtype=np.int64)
+    for name in ("open", "high", "low", "close"):
+        block[name] = df[name].to_numpy(dtype=float)
+    block["volume"] = narrow if compact else volume
+    block.flags.writeable = False
+    return block
+
+
+def _unpack(block: np.ndarray, rows: Optional[int] = None) -> pd.DataFrame:
+    """Read-only frame over the last ``rows`` candles of ``block``.
+
+    Price and timestamp columns are zero-copy views of the block; a float32
+    volume is widened back to float64 (a small copy) so every consumer keeps
+    computing in float64 exactly as before. The datetime index is rebuilt
+    from the timestamps.
+    """
+    if rows is not None and len(block) > rows:
+        block = block[len(block) - rows:]
+    columns = {name: block[name] for name in _CANDLE_FIELDS}
+    if columns["volume"].dtype != np.float64:
+        volume = columns["volume"].astype(np.float64)
+        volume.flags.writeable = False
+        columns["volume"] = volume
+    index = pd.DatetimeIndex(
+        (columns["timestamp"] * 1_000_000).view("M8[ns]"), name="datetime"
+    ).tz_localize("UTC")
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
 class _CacheEntry:
-    __slots__ = ("df", "lock")
+    __slots__ = ("block", "lock", "limit", "homes", "charged")
 
-    def __init__(self, df: pd.DataFrame):
-        self.df = df
+    def __init__(self, block: np.ndarray, limit: int):
+        self.block = block
+        self.limit = limit  # the `limit` the frame was fetched with
         self.lock = threading.Lock()
+        self.homes: List[Tuple[Any, Any]] = []  # (map, key) pairs holding it
+        self.charged = 0  # bytes counted for it in `_CacheBudget.bytes`
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return _unpack(self.block)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.block.nbytes)
+
+
+class _CacheBudget:
+    """Running byte total and LRU order of the entries the caches hold.
+
+    An entry can sit in two maps at once (its timeframe cache and the
+    tail-refresh map) and is counted once, from the first map that takes it
+    until the last one lets go. Callers hold ``MarketDataService._CACHE_LOCK``.
+    """
+
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.lru: "OrderedDict[_CacheEntry, None]" = OrderedDict()
+
+    def hold(self, entry: _CacheEntry, home: Any, key: Any) -> None:
+        if any(held is home and held_key == key for held, held_key in entry.homes):
+            return
+        if not entry.homes:
+            entry.charged = entry.nbytes
+            self.bytes += entry.charged
+        self.lru[entry] = None
+        self.lru.move_to_end(entry)
+        entry.homes.append((home, key))
+
+    def release(self, entry: _CacheEntry, home: Any, key: Any) -> None:
+        homes = [(held, held_key) for held, held_key in entry.homes if not (held is home and held_key == key)]
+        if len(homes) == len(entry.homes):
+            return
+        entry.homes = homes
+        if not homes:
+            self.bytes -= entry.charged
+            self.lru.pop(entry, None)
+
+    def touch(self, entry: _CacheEntry) -> None:
+        if entry in self.lru:
+            self.lru.move_to_end(entry)
+
+    def resize(self, entry: _CacheEntry) -> None:
+        """Re-count an entry whose block was replaced in place."""
+        if entry.homes:
+            self.bytes += entry.nbytes - entry.charged
+            entry.charged = entry.nbytes
+        self.touch(entry)
+
+    def clear(self) -> None:
+        for entry in self.lru:
+            entry.homes = []
+        self.lru.clear()
+        self.bytes = 0
+
+
+if InstrumentedTTLCache is not None:
+
+    class _EntryCache(InstrumentedTTLCache):
+        """TTL map of `_CacheEntry` values that keeps a `_CacheBudget` current.
+
+        Every way an entry leaves (overwrite, capacity eviction, TTL purge,
+        ``del``/``pop``) releases it from the budget.
+        """
+
+        def __init__(self, maxsize: int, ttl: float, *, budget: _CacheBudget, **kwargs: Any) -> None:
+            super().__init__(maxsize, ttl, **kwargs)
+            self.budget = budget
+
+        def __setitem__(self, key: Any, entry: _CacheEntry) -> None:
+            previous = Cache.__getitem__(self, key) if Cache.__contains__(self, key) else None
+            super().__setitem__(key, entry)
+            if previous is not None and previous is not entry:
+                self.budget.release(previous, self, key)
+            self.budget.hold(entry, self, key)
+
+        def __delitem__(self, key: Any) -> None:
+            entry = Cache.__getitem__(self, key)
+            try:
+                super().__delitem__(key)
+            finally:
+                self.budget.release(entry, self, key)
+
+        def expire(self, time: Any = None) -> List[Tuple[Any, Any]]:
+            expired = super().expire(time)
+            for key, entry in expired:
+                self.budget.release(entry, self, key)
+            return expired
+
+else:  # pragma: no cover
+    _EntryCache = None  # type: ignore[assignment,misc]
+
+
+def _tail_frames(maxsize: int, ttl: float, budget: _CacheBudget) -> Optional[Any]:
+    """The tail-refresh map: last frame per ``(exchange, symbol, timeframe)``."""
+    if _EntryCache is None:
+        return None
+    return _EntryCache(maxsize, ttl, budget=budget, name=_TAIL_STATS_NAME, timeframe_of=lambda key: key[2])
+
+
+def _tail(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    """Last ``rows`` rows — what a fetch with ``limit=rows`` would have returned."""
+    return df if len(df) <= rows else df.iloc[len(df) - rows:]
+
+
+def _view(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    """Zero-copy :func:`_tail` handed to callers.
+
+    A shallow copy: it shares the (read-only) column arrays but is a frame of
+    its own, so callers adding columns neither touch the cached frame nor
+    trip pandas' SettingWithCopyWarning.
+    """
+    return _tail(df, rows).copy(deep=False)
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` rebuilt on one non-writeable array per column (no data copied)."""
+    columns = {}
+    for name in df.columns:
+        values = np.ascontiguousarray(df[name].to_numpy())
+        values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
 
 
 def _now() -> float:
@@ -121,12 +354,285 @@ def expected_last_closed_candle_ts(
     return forming_open_ms - duration_ms
 
 
+# Page size for `since`-anchored history downloads. 200, NOT 1000
+# (known-errors E13): for ranges beyond its recent window bitget routes
+# `since` to the history-candles endpoint, which serves at most 200 rows
+# ending at `since + limit * duration` — with limit=1000 that silently ignores
+# `since` (returns only the latest ~200 candles) or opens a gap; with
+# limit=200 bitget honours `since` exactly, so forward pagination is gap-free.
+HISTORY_PAGE_LIMIT = 200
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(getenv(name, str(default)).split("#", 1)[0].strip()))
+    except ValueError:
+        return default
+
+
+# Pages of a history download fetched at once. Every page goes through the
+# exchange's client pool, whose shared budget keeps the whole download
+# inside the exchange's rate limit however many pages are in flight.
+HISTORY_CONCURRENCY = _env_int("HISTORY_FETCH_CONCURRENCY", 4)
+
+# Cache misses of one `get_ohlcv_many` call fetched at once (threaded path;
+# the async path awaits them all and lets the exchange budget pace them).
+BULK_CONCURRENCY = _env_int("OHLCV_BULK_CONCURRENCY", 8)
+
+# One `get_ohlcv_many` request: (symbol, timeframe, limit).
+OhlcvRequest = Tuple[str, str, int]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _plan_many(
+    requests: Sequence[OhlcvRequest],
+) -> Tuple[List[OhlcvRequest], Dict[Tuple[str, str], int]]:
+    """Distinct requests (in order) and the deepest limit per series."""
+    wanted = list(dict.fromkeys((symbol, timeframe, int(limit)) for symbol, timeframe, limit in requests))
+    deepest: Dict[Tuple[str, str], int] = {}
+    for symbol, timeframe, limit in wanted:
+        deepest[(symbol, timeframe)] = max(limit, deepest.get((symbol, timeframe), 0))
+    return wanted, deepest
+
+
+def history_page_starts(since_ms: int, end_ms: int, duration_ms: int) -> List[int]:
+    """``since`` of every page needed to cover candle opens ``[since_ms, end_ms)``.
+
+    The candle grid is fixed, so page ``k`` is simply the ``k``-th run of
+    ``HISTORY_PAGE_LIMIT`` grid slots after ``since_ms`` — no page depends on
+    the previous one's last row.
+    """
+    return list(range(int(since_ms), int(end_ms), HISTORY_PAGE_LIMIT * duration_ms))
+
+
+def find_candle_gaps(timestamps: Sequence[int], duration_ms: int) -> List[Tuple[int, int]]:
+    """Half-open ``[start, end)`` ranges of candle opens missing inside ``timestamps``.
+
+    Only holes between the first and the last candle count: history that
+    starts late (pre-listing) or stops early is not a gap.
+    """
+    ordered = sorted({int(ts) for ts in timestamps})
+    return [
+        (prev + duration_ms, cur)
+        for prev, cur in zip(ordered, ordered[1:])
+        if cur - prev > duration_ms
+    ]
+
+
+def candle_gap_report(timestamps: Sequence[int], duration_ms: int) -> List[Dict[str, Any]]:
+    """:func:`find_candle_gaps` as JSON-ready ``{start, end, missing_candles}`` dicts."""
+    return [
+        {
+            "start": pd.Timestamp(start, unit="ms", tz="UTC").isoformat(),
+            "end": pd.Timestamp(end, unit="ms", tz="UTC").isoformat(),
+            "missing_candles": (end - start) // duration_ms,
+        }
+        for start, end in find_candle_gaps(timestamps, duration_ms)
+    ]
+
+
+def _paginate_ohlcv(
+    exchange: Any, symbol: str, timeframe: str, since_ms: int, end_ms: int, duration_ms: int
+) -> List[List[Any]]:
+    """Fetch candle opens ``[since_ms, end_ms)`` as concurrent fixed windows.
+
+    Rows come back deduplicated and sorted; holes inside the range are
+    logged (see :func:`find_candle_gaps`).
+    """
+    pages = _fetch_history_pages(exchange, symbol, timeframe, since_ms, end_ms, duration_ms)
+    return _merge_history_pages(pages, symbol, timeframe, since_ms, end_ms, duration_ms)
+
+
+def _fetch_history_pages(
+    exchange: Any, symbol: str, timeframe: str, since_ms: int, end_ms: int, duration_ms: int
+) -> List[Tuple[int, List[List[Any]]]]:
+    """``(page since, rows)`` of every page covering ``[since_ms, end_ms)``."""
+    starts = history_page_starts(since_ms, end_ms, duration_ms)
+    # Worker threads do not inherit context variables: carry the caller's
+    # rate-limit priority and call-accounting scope over explicitly.
+    priority = current_priority()
+    scope = current_scope()
+
+    def fetch_page(page_since: int) -> List[List[Any]]:
+        with call_priority(priority), enter_scope(scope), call_service("ohlcv_history"):
+            return exchange.fetch_ohlcv(
+                symbol=symbol, timeframe=timeframe, since=page_since, limit=HISTORY_PAGE_LIMIT
+            ) or []
+
+    if len(starts) <= 1 or HISTORY_CONCURRENCY <= 1:
+        batches = [fetch_page(page_since) for page_since in starts]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(HISTORY_CONCURRENCY, len(starts)), thread_name_prefix="ohlcv-history"
+        ) as executor:
+            batches = list(executor.map(fetch_page, starts))
+    return list(zip(starts, batches))
+
+
+def _merge_history_pages(
+    pages: List[Tuple[int, List[List[Any]]]],
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    end_ms: int,
+    duration_ms: int,
+) -> List[List[Any]]:
+    by_ts: Dict[int, List[Any]] = {}
+    for _, batch in pages:
+        for row in batch:
+            by_ts.setdefault(int(row[0]), row)
+    rows = [by_ts[ts] for ts in sorted(by_ts)]
+
+    gaps = find_candle_gaps(
+        [ts for ts in by_ts if since_ms <= ts < end_ms], duration_ms
+    )
+    if gaps:
+        missing = sum((end - start) // duration_ms for start, end in gaps)
+        _LOGGER.warning(
+            "OHLCV history %s %s: %d missing candle(s) in %d gap(s), first at %d",
+            symbol, timeframe, missing, len(gaps), gaps[0][0],
+        )
+    return rows
+
+
+def _listing_confirmed_from(pages: List[Tuple[int, List[List[Any]]]], first_ts: int) -> Optional[int]:
+    """Earliest page start the exchange confirmed has no candle before ``first_ts``.
+
+    A page asked from ``since`` that answers with candles starting at the
+    first candle of the download says nothing exists in between: history
+    before the listing. An empty page confirms nothing — it may just have
+    been a transient exchange hiccup.
+    """
+    confirmed = [
+        since for since, batch in pages
+        if batch and since < first_ts and min(int(row[0]) for row in batch) == first_ts
+    ]
+    return min(confirmed, default=None)
+
+
+def _returned_runs(
+    timestamps: Sequence[int], start_ms: int, end_ms: int, duration_ms: int, listed_from: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """Parts of ``[start_ms, end_ms)`` a download actually covered.
+
+    Holes between returned candles (an empty or short page) are left out,
+    so the next call asks the exchange for them again instead of serving
+    them as gaps forever. The stretch before the first candle only counts
+    as covered from ``listed_from`` on — where the exchange confirmed it is
+    pre-listing history (:func:`_listing_confirmed_from`) — and the covered
+    range stops after the last candle.
+    """
+    runs = []
+    run_start = min(timestamps) if listed_from is None else max(start_ms, listed_from)
+    for hole_start, hole_end in find_candle_gaps(timestamps, duration_ms):
+        runs.append((run_start, hole_start))
+        run_start = hole_end
+    runs.append((run_start, min(end_ms, max(timestamps) + duration_ms)))
+    return runs
+
+
+def fetch_ohlcv_history(
+    exchange: Any,
+    *,
+    exchange_name: str,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    end_ms: int,
+) -> List[List[Any]]:
+    """Raw OHLCV rows covering candle opens ``since_ms .. end_ms`` (inclusive).
+
+    Without a candle store (``CANDLE_STORE_PATH`` unset) the whole range is
+    downloaded as concurrent fixed-size pages (:func:`_paginate_ohlcv`).
+    With a store, the CLOSED part of the range is served from disk and only
+    the sub-ranges never downloaded before hit the exchange (and are then
+    persisted); the part past the last closed candle — the forming candle —
+    is always fetched live and never stored. Rows may come back unsorted,
+    overlap or overshoot ``end_ms``: callers dedupe, sort and cut, as before.
+    """
+    duration_s = _TIMEFRAME_TO_SECONDS.get(timeframe)
+    duration_ms = (duration_s or 60 * 60) * 1000
+    stop_ms = end_ms + 1  # half-open bound on candle opens
+    store = get_candle_store() if duration_s is not None else None
+    if store is None:
+        return _paginate_ohlcv(exchange, symbol, timeframe, since_ms, stop_ms, duration_ms)
+
+    last_closed = expected_last_closed_candle_ts(timeframe, exchange=exchange_name)
+    closed_stop_ms = min(stop_ms, last_closed + duration_ms)
+
+    for gap_start, gap_end in store.missing_ranges(exchange_name, symbol, timeframe, since_ms, closed_stop_ms):
+        pages = _fetch_history_pages(exchange, symbol, timeframe, gap_start, gap_end, duration_ms)
+        fetched = _merge_history_pages(pages, symbol, timeframe, gap_start, gap_end, duration_ms)
+        closed = [row for row in fetched if int(row[0]) <= last_closed]
+        if not closed:
+            continue
+        store.append(exchange_name, symbol, timeframe, closed)
+        timestamps = [int(row[0]) for row in closed]
+        listed_from = _listing_confirmed_from(pages, min(timestamps))
+        for covered_start, covered_end in _returned_runs(
+            timestamps, gap_start, gap_end, duration_ms, listed_from
+        ):
+            store.mark_covered(exchange_name, symbol, timeframe, covered_start, covered_end)
+
+    rows = store.read(exchange_name, symbol, timeframe, since_ms, closed_stop_ms)
+    if closed_stop_ms < stop_ms:
+        rows.extend(_paginate_ohlcv(exchange, symbol, timeframe, closed_stop_ms, stop_ms, duration_ms))
+    return rows
+
+
+# Concurrent cache misses on the same candle-bound key share one fetch.
+_IN_FLIGHT = SingleFlight()
+
+# Series name of the per-timeframe OHLCV caches in `cache_stats.STATS`.
+_STATS_NAME = "ohlcv"
+# Straggler hedging of fetch_ohlcv (opt-in, see `hedging`).
+HEDGE = HedgePolicy.from_env()
+# Stats series of the cross-instance tier (see `shared_cache`).
+_SHARED_STATS_NAME = "ohlcv_shared"
+# Stats series of the tail-refresh map (`MarketDataService._TAIL_FRAMES`).
+_TAIL_STATS_NAME = "ohlcv_tail"
+
+
 # Default exchange for every endpoint/service. Binance geo-blocks US IPs
 # (HTTP 451), and every cloud deployment lives in a US region, so the safe
 # code default is bitget — binance can still be selected explicitly via the
 # DEFAULT_EXCHANGE env var or the per-request `exchange` query param.
 DEFAULT_EXCHANGE = getenv("DEFAULT_EXCHANGE", "bitget").lower()
 
+# Incremental tail refresh (on by default): when the candle-bound key rotates,
+# splice the few candles since the previous frame's last row onto it instead
+# of re-downloading the whole `limit`-row window. "0" restores full refetches.
+_TAIL_REFRESH_ENABLED = getenv("MARKET_DATA_TAIL_REFRESH", "1").split("#", 1)[0].strip() not in ("0", "false", "no")
+
+# Local higher-timeframe resampling (opt-in, see `ohlcv_resample`): base
+# timeframes, e.g. "15m,1h", fetched at least `RESAMPLE_BASE_LIMIT` deep, from
+# whose cached series a missing higher timeframe is aggregated locally when
+# the grids nest and the base covers `limit` complete candles. Anything else
+# is fetched natively, as before.
+RESAMPLE_BASES: Tuple[str, ...] = tuple(
+    tf.strip()
+    for tf in getenv("OHLCV_RESAMPLE_BASE", "").split("#", 1)[0].split(",")
+    if tf.strip() in _TIMEFRAME_TO_SECONDS
+)
+RESAMPLE_BASE_LIMIT = _env_int("OHLCV_RESAMPLE_BASE_LIMIT", 1000)
+
+
+# The offline fixture replay serves fabricated candles read from
+# `tests/fixtures`, which the deployed image does not ship: it is only
+# registered as an exchange when explicitly enabled (benchmarks, load tests,
+# the test suite).
+REPLAY_EXCHANGE_ENABLED = getenv("REPLAY_EXCHANGE_ENABLED", "0").split("#", 1)[0].strip() in ("1", "true", "yes")
+
+
+# asyncio counterparts of the ccxt classes in SUPPORTED_EXCHANGES. Keyed by
+# the sync class: a registry entry swapped for anything else (a stub in tests)
+# has no native async client and `get_ohlcv_async` runs it in a worker thread.
+_ASYNC_COUNTERPARTS = {
+    ccxt.binance: ccxt_async.binance,
+    ccxt.bitget: ccxt_async.bitget,
+}
+
 
 class MarketDataService:
     """OHLCV fetcher backed by a shared TTL cache."""
@@ -134,29 +640,47 @@ class MarketDataService:
     SUPPORTED_EXCHANGES = {
         "binance": ccxt.binance,
         "bitget": ccxt.bitget,
+        # Offline fixture replay for benchmarks / load tests (never the default).
+        **({"replay": ReplayExchange} if REPLAY_EXCHANGE_ENABLED else {}),
     }
 
     # Class-level caches so all instances share data.  One cache per timeframe
-    # (each with its own correct TTL); every cache is capped at 256 keys to
-    # avoid unbounded memory growth in long-running processes.
+    # (each with its own correct TTL); every cache is capped at 256 keys, and
+    # all of them together (tail frames included) at `_CACHE_BUDGET_BYTES` of
+    # candle data (`MARKET_DATA_CACHE_MB`), so memory stays predictable
+    # whatever mix of 200- and 1500-row frames is cached.
     _CACHE_MAXSIZE = 256
+    _CACHE_BUDGET_BYTES = _env_int("MARKET_DATA_CACHE_MB", 64) * 1024 * 1024
     # Belt-and-braces TTL cap: staleness is normally prevented by the
     # candle-bound key, but if a grid anchor in _GRID_ANCHOR_OFFSET_MS were
     # ever wrong for some exchange/timeframe, a stale entry could only outlive
     # its candle until this cap — hours, never days.
     _CACHE_TTL_CAP_S = 6 * 60 * 60
-    _CACHES: Dict[str, "TTLCache[Tuple[str, str, str, int, Optional[int]], _CacheEntry]"] = {}
+    _CACHES: Dict[str, "TTLCache[Tuple[str, str, str, Optional[int]], _CacheEntry]"] = {}
+    # Guards every map below and `_BUDGET`; all inserts and removals happen
+    # under it, so the byte total and the LRU order stay exact.
     _CACHE_LOCK = threading.Lock()
+    _BUDGET = _CacheBudget()
+    # Most recent frame per (exchange, symbol, timeframe), kept past its key's
+    # rotation so the next candle only needs a tail refresh. A refresh is only
+    # attempted while at most this many candles are missing; beyond that one
+    # full `limit` fetch is as cheap and needs no splicing.
+    _TAIL_FRAMES: "TTLCache[Tuple[str, str, str], _CacheEntry]" = _tail_frames(4 * _CACHE_MAXSIZE, _CACHE_TTL_CAP_S, _BUDGET)
+    _TAIL_REFRESH_MAX_CANDLES = 50
 
     def __init__(self, exchange_name: str = DEFAULT_EXCHANGE) -> None:
         exchange_name = exchange_name.lower()
         if exchange_name not in self.SUPPORTED_EXCHANGES:
             raise ValueError(f"Exchange no soportado: {exchange_name}")
         self.exchange_name = exchange_name
-        self.exchange = self.SUPPORTED_EXCHANGES[exchange_name]({
-            "enableRateLimit": True,
-            "options": {"defaultType": "spot"},
-        })
+        # Shared, pre-warmed client pool: markets, HTTP sessions and the
+        # rate-limit clock survive across requests (see exchange_clients).
+        factory = self.SUPPORTED_EXCHANGES[exchange_name]
+        self.exchange = get_exchange(exchange_name, factory)
+        async_factory = _ASYNC_COUNTERPARTS.get(factory)
+        self.async_exchange = (
+            get_async_exchange(self.exchange, async_factory) if async_factory is not None else None
+        )
 
     # ------------------------------------------------------------------
     # Cache helpers
@@ -177,15 +701,58 @@ class MarketDataService:
             cache = cls._CACHES.get(timeframe)
             if cache is None:
                 ttl = max(min(_TIMEFRAME_TO_SECONDS.get(timeframe, 3600), cls._CACHE_TTL_CAP_S), 60)
-                cache = TTLCache(maxsize=cls._CACHE_MAXSIZE, ttl=ttl)
+                cache = _EntryCache(
+                    maxsize=cls._CACHE_MAXSIZE, ttl=ttl, budget=cls._BUDGET, name=_STATS_NAME, timeframe=timeframe
+                )
                 cls._CACHES[timeframe] = cache
             return cache
 
+    @classmethod
+    def _cache_gauge(cls) -> Dict[str, Tuple[int, int]]:
+        """``{timeframe: (entries, bytes)}`` of the live caches (for `STATS`)."""
+        sizes: Dict[str, Tuple[int, int]] = {}
+        with cls._CACHE_LOCK:
+            for timeframe, cache in cls._CACHES.items():
+                entries = list(cache.values())
+                sizes[timeframe] = (len(entries), sum(entry.nbytes for entry in entries))
+        return sizes
+
+    @classmethod
+    def _enforce_budget(cls) -> None:
+        """Evict least recently used entries while over ``_CACHE_BUDGET_BYTES``.
+
+        `_BUDGET` keeps the byte total as entries come and go, so a publish
+        under budget costs one comparison. Over it, expired entries are
+        purged first, then entries leave in LRU order, each from every map
+        holding it (its timeframe cache and the tail-refresh map), which is
+        what actually frees its block.
+        """
+        budget = cls._BUDGET
+        with cls._CACHE_LOCK:
+            if budget.bytes <= cls._CACHE_BUDGET_BYTES:
+                return
+            for cache in cls._CACHES.values():
+                cache.expire()
+            if cls._TAIL_FRAMES is not None:
+                cls._TAIL_FRAMES.expire()
+            while budget.bytes > cls._CACHE_BUDGET_BYTES and budget.lru:
+                entry = next(iter(budget.lru))
+                timeframe = entry.homes[0][1][2]
+                for home, key in list(entry.homes):
+                    try:
+                        del home[key]
+                    except KeyError:  # expired since the purge above
+                        budget.release(entry, home, key)
+                STATS.evicted(_STATS_NAME, timeframe)
+
     @classmethod
     def clear_cache(cls) -> None:
         """Drop every cached entry — useful in tests."""
         with cls._CACHE_LOCK:
             cls._CACHES.clear()
+            cls._BUDGET.clear()
+            if cls._TAIL_FRAMES is not None:
+                cls._TAIL_FRAMES = _tail_frames(cls._TAIL_FRAMES.maxsize, cls._TAIL_FRAMES.ttl, cls._BUDGET)
 
     # ------------------------------------------------------------------
     # Public API
@@ -208,8 +775,13 @@ class MarketDataService:
         opt out with ``drop_forming=False``.
 
         The cache always stores the raw exchange payload; the forming-candle
-        filter is applied on the returned copy, so cached data can serve both
-        modes.
+        filter is applied on the returned view, so cached data can serve both
+        modes. ``limit`` is not part of the key: an entry serves any request
+        up to the limit it was fetched with (a tail slice is exactly what the
+        exchange returns for a smaller limit), and a larger request grows the
+        entry in place. The frame returned is a read-only view of the cached
+        one (see the module docstring): add columns freely, but copy it
+        before writing into existing cells.
         """
         # Bind the key to the candle that *should* be the last closed one right
         # now: the moment a new candle closes this component steps forward, the
@@ -217,29 +789,518 @@ class MarketDataService:
         # a stale candle. The exchange matters: some grids (binance 3d) are
         # anchored differently per exchange.
         candle_ts = expected_last_closed_candle_ts(timeframe, exchange=self.exchange_name)
-        key = (self.exchange_name, symbol, timeframe, int(limit), candle_ts)
+        key = (self.exchange_name, symbol, timeframe, candle_ts)
+        limit = int(limit)
         cache = self._get_cache(timeframe) if use_cache else None
 
-        if cache is not None:
-            entry = cache.get(key)
-            if entry is not None:
-                with entry.lock:
-                    df = entry.df.copy()
+        if cache is None:
+            raw_ohlcv: List[List[Any]] = self._fetch_ohlcv(
+                symbol=symbol, timeframe=timeframe, limit=limit
+            )
+            df = self._to_frame(raw_ohlcv)
+            return self._drop_forming_candle(df, timeframe) if drop_forming else df
+
+        while True:
+            df = self._cache_hit(cache, key, limit)
+            if df is not None:
+                STATS.hit(_STATS_NAME, timeframe)
                 return self._drop_forming_candle(df, timeframe) if drop_forming else df
+            # Single flight: concurrent misses on this key wait for one fetch
+            # and then re-read the cache (the leader may have fetched fewer
+            # rows than a waiter needs; that waiter then leads a grow fetch).
+            try:
+                df, shared = _IN_FLIGHT.do(
+                    key, lambda: self._fetch_into_cache(cache, key, symbol, timeframe, limit, candle_ts)
+                )
+            except CircuitOpenError as exc:
+                return self._stale_or_raise(exc, symbol, timeframe, limit, drop_forming)
+            if not shared:
+                STATS.miss(_STATS_NAME, timeframe)
+                break
 
-        raw_ohlcv: List[List[Any]] = self.exchange.fetch_ohlcv(
-            symbol=symbol, timeframe=timeframe, limit=limit
-        )
-        df = pd.DataFrame(raw_ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-        df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        df.set_index("datetime", inplace=True)
+        result = _view(df, limit)
+        return self._drop_forming_candle(result, timeframe) if drop_forming else result
+
+    async def get_ohlcv_async(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        limit: int = 500,
+        use_cache: bool = True,
+        drop_forming: bool = True,
+    ) -> pd.DataFrame:
+        """Awaitable :meth:`get_ohlcv`: same arguments, caches and result.
+
+        Cache hits are served without leaving the event loop; misses await
+        the exchange, coalesced with any sync or async miss on the same key.
+        """
+        candle_ts = expected_last_closed_candle_ts(timeframe, exchange=self.exchange_name)
+        key = (self.exchange_name, symbol, timeframe, candle_ts)
+        limit = int(limit)
+        cache = self._get_cache(timeframe) if use_cache else None
+
+        if cache is None:
+            raw_ohlcv = await self._fetch_ohlcv_async(symbol=symbol, timeframe=timeframe, limit=limit)
+            df = self._to_frame(raw_ohlcv)
+            return self._drop_forming_candle(df, timeframe) if drop_forming else df
 
-        if cache is not None:
-            cache[key] = _CacheEntry(df)
+        while True:
+            df = self._cache_hit(cache, key, limit)
+            if df is not None:
+                STATS.hit(_STATS_NAME, timeframe)
+                return self._drop_forming_candle(df, timeframe) if drop_forming else df
+            try:
+                df, shared = await _IN_FLIGHT.do_async(
+                    key, lambda: self._fetch_into_cache_async(cache, key, symbol, timeframe, limit, candle_ts)
+                )
+            except CircuitOpenError as exc:
+                return self._stale_or_raise(exc, symbol, timeframe, limit, drop_forming)
+            if not shared:
+                STATS.miss(_STATS_NAME, timeframe)
+                break
 
-        result = df.copy()
+        result = _view(df, limit)
         return self._drop_forming_candle(result, timeframe) if drop_forming else result
 
+    def get_ohlcv_many(
+        self,
+        requests: Sequence[OhlcvRequest],
+        use_cache: bool = True,
+        drop_forming: bool = True,
+        return_exceptions: bool = False,
+    ) -> Dict[OhlcvRequest, Union[pd.DataFrame, BaseException]]:
+        """Bulk :meth:`get_ohlcv` for a universe scan: ``{request: frame}``.
+
+        Requests are deduplicated per ``(symbol, timeframe)``: each series is
+        looked up (or fetched) once at the deepest ``limit`` asked for, and
+        every request gets its tail slice of it. Cache hits are served
+        inline; the misses are fetched concurrently (``BULK_CONCURRENCY``
+        threads, all metered by the exchange's rate-limit budget at the
+        caller's priority). With ``return_exceptions=True`` a failed series
+        maps its requests to the exception instead of raising it.
+        """
+        wanted, deepest = _plan_many(requests)
+        frames: Dict[Tuple[str, str], Union[pd.DataFrame, BaseException]] = {}
+        misses: List[Tuple[str, str, int]] = []
+        for (symbol, timeframe), limit in deepest.items():
+            hit = self._peek_cache(symbol, timeframe, limit) if use_cache else None
+            if hit is not None:
+                frames[(symbol, timeframe)] = hit
+            else:
+                misses.append((symbol, timeframe, limit))
+
+        priority = current_priority()
+        scope = current_scope()
+
+        def fetch(miss: Tuple[str, str, int]) -> Union[pd.DataFrame, BaseException]:
+            symbol, timeframe, limit = miss
+            try:
+                with call_priority(priority), enter_scope(scope):
+                    return self.get_ohlcv(symbol, timeframe, limit, use_cache=use_cache, drop_forming=False)
+            except Exception as exc:
+                return exc
+
+        if len(misses) <= 1 or BULK_CONCURRENCY <= 1:
+            fetched = [fetch(miss) for miss in misses]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(BULK_CONCURRENCY, len(misses)), thread_name_prefix="ohlcv-bulk"
+            ) as executor:
+                fetched = list(executor.map(fetch, misses))
+        for (symbol, timeframe, _), frame in zip(misses, fetched):
+            frames[(symbol, timeframe)] = frame
+        return self._slice_many(wanted, frames, drop_forming, return_exceptions)
+
+    async def get_ohlcv_many_async(
+        self,
+        requests: Sequence[OhlcvRequest],
+        use_cache: bool = True,
+        drop_forming: bool = True,
+        return_exceptions: bool = False,
+    ) -> Dict[OhlcvRequest, Union[pd.DataFrame, BaseException]]:
+        """Awaitable :meth:`get_ohlcv_many` (misses awaited concurrently)."""
+        wanted, deepest = _plan_many(requests)
+        series = list(deepest.items())
+        fetched = await asyncio.gather(
+            *(
+                self.get_ohlcv_async(symbol, timeframe, limit, use_cache=use_cache, drop_forming=False)
+                for (symbol, timeframe), limit in series
+            ),
+            return_exceptions=True,
+        )
+        frames = {key: frame for (key, _), frame in zip(series, fetched)}
+        return self._slice_many(wanted, frames, drop_forming, return_exceptions)
+
+    def _peek_cache(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """The cached frame (raw, forming candle included) or ``None`` on a miss."""
+        cache = self._get_cache(timeframe)
+        if cache is None:
+            return None
+        candle_ts = expected_last_closed_candle_ts(timeframe, exchange=self.exchange_name)
+        df = self._cache_hit(cache, (self.exchange_name, symbol, timeframe, candle_ts), limit)
+        if df is not None:
+            STATS.hit(_STATS_NAME, timeframe)
+        return df
+
+    def _slice_many(
+        self,
+        wanted: List[OhlcvRequest],
+        frames: Dict[Tuple[str, str], Union[pd.DataFrame, BaseException]],
+        drop_forming: bool,
+        return_exceptions: bool,
+    ) -> Dict[OhlcvRequest, Union[pd.DataFrame, BaseException]]:
+        out: Dict[OhlcvRequest, Union[pd.DataFrame, BaseException]] = {}
+        for request in wanted:
+            symbol, timeframe, limit = request
+            frame = frames[(symbol, timeframe)]
+            if isinstance(frame, BaseException):
+                if not return_exceptions:
+                    raise frame
+                out[request] = frame
+                continue
+            view = _view(frame, limit)
+            out[request] = self._drop_forming_candle(view, timeframe) if drop_forming else view
+        return out
+
+    async def _fetch_ohlcv_async(self, **params: Any) -> List[List[Any]]:
+        """``fetch_ohlcv`` without blocking the event loop.
+
+        Uses the native asyncio client while ``self.exchange`` is still the
+        pooled client; an injected client (tests, scripts) is honoured by
+        running its sync call in a worker thread.
+        """
+        facade = self.async_exchange
+        if facade is None or self.exchange is not facade.sync:
+            return await asyncio.to_thread(self._fetch_ohlcv, **params)
+        with call_service("market_data"):
+            if HEDGE.enabled and isinstance(facade, AsyncPooledExchange):
+                return await HEDGE.call_async(
+                    latency_key(self.exchange_name, params["timeframe"], params.get("limit")),
+                    lambda: facade.call("fetch_ohlcv", **params),
+                    lambda: facade.call_charged("fetch_ohlcv", **params),
+                    lambda: facade.pool.try_acquire("fetch_ohlcv"),
+                )
+            return await facade.fetch_ohlcv(**params)
+
+    def _fetch_ohlcv(self, **params: Any) -> List[List[Any]]:
+        """``exchange.fetch_ohlcv``, hedged against stragglers when enabled.
+
+        Only the pooled client is hedged (the hedge needs its budget); an
+        injected client is called as is.
+        """
+        with call_service("market_data"):
+            if HEDGE.enabled and isinstance(self.exchange, PooledExchange):
+                pool = self.exchange.pool
+                return HEDGE.call(
+                    latency_key(self.exchange_name, params["timeframe"], params.get("limit")),
+                    lambda: pool.call("fetch_ohlcv", **params),
+                    lambda: pool.call_charged("fetch_ohlcv", **params),
+                    lambda: pool.try_acquire("fetch_ohlcv"),
+                )
+            return self.exchange.fetch_ohlcv(**params)
+
+    def _stale_or_raise(
+        self, exc: CircuitOpenError, symbol: str, timeframe: str, limit: int, drop_forming: bool
+    ) -> pd.DataFrame:
+        """Last frame cached for the series while its exchange's breaker is open.
+
+        Without a frame to fall back on, ``exc`` (the breaker's rejection) is
+        raised. The frame is flagged
+        with ``df.attrs["stale"]`` and reported through `mark_stale`. Its
+        last row was the forming candle when it was fetched, so it is
+        dropped for closed-candle callers whatever the clock says now.
+        """
+        entry = None
+        if self._TAIL_FRAMES is not None:
+            with self._CACHE_LOCK:
+                entry = self._TAIL_FRAMES.get((self.exchange_name, symbol, timeframe))
+        if entry is None:
+            raise exc
+        with entry.lock:
+            df = _unpack(entry.block, min(limit, entry.limit))
+        if drop_forming and not df.empty:
+            df = df.iloc[:-1].copy(deep=False)
+        df.attrs["stale"] = True
+        STATS.stale(_STATS_NAME, timeframe)
+        mark_stale(f"{self.exchange_name}:{symbol}:{timeframe}")
+        return df
+
+    @classmethod
+    def _cache_hit(cls, cache: Any, key: Tuple[Any, ...], limit: int) -> Optional[pd.DataFrame]:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        with entry.lock:
+            if entry.limit < limit:
+                return None
+            df = _unpack(entry.block, limit)
+        with cls._CACHE_LOCK:
+            cls._BUDGET.touch(entry)
+        return df
+
+    def _fetch_into_cache(
+        self,
+        cache: Any,
+        key: Tuple[Any, ...],
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        candle_ts: Optional[int],
+    ) -> pd.DataFrame:
+        """Fetch (resample, tail refresh or full) and publish the frame; returns it at full depth."""
+        started = time.perf_counter()
+        resampled = self._resample_from_cache(symbol, timeframe, limit)
+        if resampled is not None:
+            STATS.resampled(_STATS_NAME, timeframe, time.perf_counter() - started)
+            return self._publish(cache, key, symbol, timeframe, resampled, limit)
+        shared = self._shared_lookup(key, timeframe, limit)
+        if shared is not None:
+            return self._publish(cache, key, symbol, timeframe, *shared)
+        limit = self._fetch_depth(timeframe, limit)
+        refreshed, rows = None, 0
+        plan = self._tail_refresh_plan(symbol, timeframe, limit, candle_ts)
+        if plan is not None:
+            batch: List[List[Any]] = self._fetch_ohlcv(
+                symbol=symbol, timeframe=timeframe, since=plan[1], limit=plan[2] + 1
+            )
+            rows += len(batch or ())
+            refreshed = self._splice_tail(plan, batch)
+        if refreshed is not None:
+            df, depth = refreshed
+        else:
+            raw_ohlcv: List[List[Any]] = self._fetch_ohlcv(
+                symbol=symbol, timeframe=timeframe, limit=limit
+            )
+            rows += len(raw_ohlcv)
+            df, depth = self._to_frame(raw_ohlcv), limit
+        STATS.fetched(_STATS_NAME, timeframe, time.perf_counter() - started, rows)
+        published = self._publish(cache, key, symbol, timeframe, df, depth)
+        self._shared_store(cache, key, published, depth)
+        return published
+
+    async def _fetch_into_cache_async(
+        self,
+        cache: Any,
+        key: Tuple[Any, ...],
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        candle_ts: Optional[int],
+    ) -> pd.DataFrame:
+        """Async :meth:`_fetch_into_cache`."""
+        started = time.perf_counter()
+        resampled = self._resample_from_cache(symbol, timeframe, limit)
+        if resampled is not None:
+            STATS.resampled(_STATS_NAME, timeframe, time.perf_counter() - started)
+            return self._publish(cache, key, symbol, timeframe, resampled, limit)
+        shared = await asyncio.to_thread(self._shared_lookup, key, timeframe, limit)
+        if shared is not None:
+            return self._publish(cache, key, symbol, timeframe, *shared)
+        limit = self._fetch_depth(timeframe, limit)
+        refreshed, rows = None, 0
+        plan = self._tail_refresh_plan(symbol, timeframe, limit, candle_ts)
+        if plan is not None:
+            batch = await self._fetch_ohlcv_async(
+                symbol=symbol, timeframe=timeframe, since=plan[1], limit=plan[2] + 1
+            )
+            rows += len(batch or ())
+            refreshed = self._splice_tail(plan, batch)
+        if refreshed is not None:
+            df, depth = refreshed
+        else:
+            raw_ohlcv = await self._fetch_ohlcv_async(symbol=symbol, timeframe=timeframe, limit=limit)
+            rows += len(raw_ohlcv)
+            df, depth = self._to_frame(raw_ohlcv), limit
+        STATS.fetched(_STATS_NAME, timeframe, time.perf_counter() - started, rows)
+        published = self._publish(cache, key, symbol, timeframe, df, depth)
+        await asyncio.to_thread(self._shared_store, cache, key, published, depth)
+        return published
+
+    @staticmethod
+    def _shared_lookup(key: Tuple[Any, ...], timeframe: str, limit: int) -> Optional[Tuple[pd.DataFrame, int]]:
+        """``(frame, depth)`` another instance published under ``key``, if deep enough."""
+        shared = get_shared_cache()
+        if shared is None or key[-1] is None:
+            return None
+        payload = shared.get(shared_key(_STATS_NAME, key))
+        found = None
+        if payload is not None:
+            try:
+                meta, arrays = decode_arrays(payload)
+                found = _unpack(arrays["block"]), int(meta["depth"])
+            except Exception as exc:
+                _LOGGER.warning("Ignoring unreadable shared OHLCV entry %s: %s", key, exc)
+        if found is None or found[1] < limit:
+            STATS.miss(_SHARED_STATS_NAME, timeframe)
+            return None
+        STATS.hit(_SHARED_STATS_NAME, timeframe)
+        return found
+
+    @staticmethod
+    def _shared_store(cache: Any, key: Tuple[Any, ...], df: pd.DataFrame, depth: int) -> None:
+        """Publish a freshly fetched frame to the other instances (same key and TTL)."""
+        shared = get_shared_cache()
+        if shared is None or key[-1] is None:
+            return
+        payload = encode_arrays({"depth": depth}, {"block": _pack(df)})
+        shared.set(shared_key(_STATS_NAME, key), payload, cache.ttl)
+
+    @staticmethod
+    def _fetch_depth(timeframe: str, limit: int) -> int:
+        """Rows to fetch on a miss: resample bases are fetched deep enough to feed them."""
+        return max(limit, RESAMPLE_BASE_LIMIT) if timeframe in RESAMPLE_BASES else limit
+
+    def _resample_from_cache(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """``limit`` candles of ``timeframe`` aggregated from a cached base series.
+
+        Tries the configured bases coarsest first (fewest rows to aggregate)
+        and only reads current cache entries; ``None`` sends the caller to the
+        exchange.
+        """
+        if not RESAMPLE_BASES or timeframe in RESAMPLE_BASES:
+            return None
+        # Imported here: ohlcv_resample builds on this module's grid tables.
+        from .ohlcv_resample import resample_ohlcv, resample_ratio
+
+        bases = sorted(
+            (tf for tf in RESAMPLE_BASES if resample_ratio(tf, timeframe, self.exchange_name)),
+            key=lambda tf: _TIMEFRAME_TO_SECONDS[tf],
+            reverse=True,
+        )
+        for base_tf in bases:
+            cache = self._get_cache(base_tf)
+            if cache is None:
+                continue
+            candle_ts = expected_last_closed_candle_ts(base_tf, exchange=self.exchange_name)
+            entry = cache.get((self.exchange_name, symbol, base_tf, candle_ts))
+            if entry is None:
+                continue
+            with entry.lock:
+                base = _unpack(entry.block)
+            df = resample_ohlcv(base, base_tf, timeframe, limit, self.exchange_name)
+            if df is not None:
+                return _read_only(df)
+        return None
+
+    def _publish(
+        self,
+        cache: Any,
+        key: Tuple[Any, ...],
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        depth: int,
+    ) -> pd.DataFrame:
+        """Store a freshly fetched frame under ``key``; returns it at full depth."""
+        block = _pack(df)
+        entry = cache.get(key)
+        if entry is not None:
+            # Grow the existing entry in place: smaller-limit callers
+            # holding it keep being served by tail slices.
+            with entry.lock:
+                if depth > entry.limit:
+                    entry.block, entry.limit = block, depth
+            with self._CACHE_LOCK:
+                self._BUDGET.resize(entry)
+        else:
+            entry = _CacheEntry(block, depth)
+            with self._CACHE_LOCK:
+                cache[key] = entry
+        with self._CACHE_LOCK:
+            if self._TAIL_FRAMES is not None:
+                self._TAIL_FRAMES[(self.exchange_name, symbol, timeframe)] = entry
+        self._enforce_budget()
+        return _unpack(block)
+
+    def _tail_refresh_plan(
+        self, symbol: str, timeframe: str, limit: int, candle_ts: Optional[int]
+    ) -> Optional[Tuple[pd.DataFrame, int, int, int, int]]:
+        """Plan a tail refresh: rebuild the previous frame with a ``since`` fetch.
+
+        Returns ``(previous frame, its last ts, missing candles, depth, candle
+        duration in ms)``; the
+        caller fetches ``missing + 1`` candles from that last ts and hands the
+        batch to :meth:`_splice_tail`. The refreshed frame keeps the previous
+        frame's depth (its fetch ``limit``, at least ``limit``), so every
+        endpoint that shared the old entry is served by the new one too.
+        ``None`` when refresh is disabled, there is no previous frame deep
+        enough for ``limit`` or too many candles are missing.
+        """
+        if not _TAIL_REFRESH_ENABLED or candle_ts is None or self._TAIL_FRAMES is None:
+            return None
+        with self._CACHE_LOCK:
+            previous = self._TAIL_FRAMES.get((self.exchange_name, symbol, timeframe))
+        if previous is None or previous.limit < limit:
+            return None
+        with previous.lock:
+            prev_df = previous.df
+        if prev_df.empty:
+            return None
+
+        duration_ms = _TIMEFRAME_TO_SECONDS[timeframe] * 1000
+        last_ts = int(prev_df["timestamp"].iloc[-1])
+        forming_open_ms = candle_ts + duration_ms
+        missing = (forming_open_ms - last_ts) // duration_ms + 1
+        depth = previous.limit
+        if missing < 1 or missing > min(self._TAIL_REFRESH_MAX_CANDLES, depth):
+            return None
+        return prev_df, last_ts, int(missing), depth, duration_ms
+
+    def _splice_tail(
+        self, plan: Tuple[pd.DataFrame, int, int, int, int], batch: List[List[Any]]
+    ) -> Optional[Tuple[pd.DataFrame, int]]:
+        """Splice ``batch`` onto the planned frame; ``(frame, depth)`` or ``None``.
+
+        The previous frame's last row is re-fetched too (it was the forming
+        candle back then and may have changed), so the batch must start
+        exactly at that row's timestamp, step one candle at a time with no
+        hole, and reach the candle forming now — anything else (a gap, a
+        duplicate, an exchange still lagging behind the close) means the
+        frames do not line up and ``None`` is returned so the caller does a
+        full fetch.
+        """
+        prev_df, last_ts, missing, depth, duration_ms = plan
+        if not batch or int(batch[0][0]) != last_ts:
+            return None
+        timestamps = np.asarray([int(row[0]) for row in batch], dtype=np.int64)
+        if (np.diff(timestamps) != duration_ms).any():
+            return None
+        if timestamps[-1] < last_ts + (missing - 1) * duration_ms:  # short of the forming candle
+            return None
+        merged = pd.concat([prev_df.iloc[:-1], self._to_frame(batch)])
+        return _read_only(_tail(merged, depth)), depth
+
+    @staticmethod
+    def _to_frame(raw_ohlcv: List[List[Any]]) -> pd.DataFrame:
+        """Raw ccxt rows as a read-only frame with the cached entries' dtypes.
+
+        int64 timestamps and float64 prices/volume, whether or not the frame
+        goes through the cache, so cached and uncached callers see the same
+        frame.
+        """
+        rows = np.asarray(raw_ohlcv, dtype=float).reshape(-1, len(_CANDLE_FIELDS))
+        block = np.empty(len(rows), dtype=_CANDLE_DTYPES["<f8"])
+        block["timestamp"] = rows[:, 0].astype(np.int64)
+        for i, name in enumerate(_CANDLE_FIELDS[1:], start=1):
+            block[name] = rows[:, i]
+        block.flags.writeable = False
+        return _unpack(block)
+
+    def fetch_history(self, symbol: str, timeframe: str, since_ms: int, end_ms: int) -> List[List[Any]]:
+        """Paginated history for backtests, served from the candle store first.
+
+        See :func:`fetch_ohlcv_history` — this binds it to this instance's
+        exchange client.
+        """
+        return fetch_ohlcv_history(
+            self.exchange,
+            exchange_name=self.exchange_name,
+            symbol=symbol,
+            timeframe=timeframe,
+            since_ms=since_ms,
+            end_ms=end_ms,
+        )
+
     @staticmethod
     def _drop_forming_candle(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
         """Drop the last row when its candle has not closed yet.
@@ -257,5 +1318,8 @@ class MarketDataService:
         close_ms = last_open_ms + duration_s * 1000
         now_ms = _now() * 1000.0
         if close_ms > now_ms:
-            return df.iloc[:-1]
+            return df.iloc[:-1].copy(deep=False)
         return df
+
+
+STATS.register_gauge(_STATS_NAME, MarketDataService._cache_gauge)
@@ -1,8 +1,8 @@
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence, Union
 
 from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
-from .indicators_service import IndicatorsService
+from .indicator_cache import enriched
 from .rules_service import RulesService
 
 
@@ -13,19 +13,73 @@ class MetricsController:
     def __init__(self, exchange: str = DEFAULT_EXCHANGE) -> None:
         self.exchange_name = exchange.lower()
 
-    def process_symbol(self, symbol: str, timeframe: str = "1h", limit: int = 500) -> Dict[str, Any]:
+    # Permite alias legibles para timeframe
+    _ALIASES = {"daily": "1d", "diario": "1d", "weekly": "1w", "semanal": "1w", "monthly": "1M", "mensual": "1M"}
+
+    def process_symbol(
+        self, symbol: str, timeframe: str = "1h", limit: int = 500, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         # 1. Datos de mercado
         market_service = MarketDataService(exchange_name=self.exchange_name)
-        # Permite alias legibles para timeframe
-        _aliases = {"daily": "1d", "diario": "1d", "weekly": "1w", "semanal": "1w", "monthly": "1M", "mensual": "1M"}
-        tf_ccxt = _aliases.get(timeframe.lower(), timeframe)
+        tf_ccxt = self._ALIASES.get(timeframe.lower(), timeframe)
         df = market_service.get_ohlcv(symbol=symbol, timeframe=tf_ccxt, limit=limit)
+        return self._build_payload(symbol, timeframe, df, fields)
+
+    async def process_symbol_async(
+        self, symbol: str, timeframe: str = "1h", limit: int = 500, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Igual que `process_symbol`, sin bloquear el event loop en la descarga."""
+        market_service = MarketDataService(exchange_name=self.exchange_name)
+        tf_ccxt = self._ALIASES.get(timeframe.lower(), timeframe)
+        df = await market_service.get_ohlcv_async(symbol=symbol, timeframe=tf_ccxt, limit=limit)
+        return self._build_payload(symbol, timeframe, df, fields)
+
+    async def process_symbols_async(
+        self,
+        symbols: Sequence[str],
+        timeframe: str = "1h",
+        limit: int = 500,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Union[Dict[str, Any], BaseException]]:
+        """`process_symbol` para varios pares con una sola descarga masiva.
+
+        Los fallos por par se devuelven como la excepción en su entrada.
+        """
+        market_service = MarketDataService(exchange_name=self.exchange_name)
+        tf_ccxt = self._ALIASES.get(timeframe.lower(), timeframe)
+        frames = await market_service.get_ohlcv_many_async(
+            [(symbol, tf_ccxt, limit) for symbol in symbols], return_exceptions=True
+        )
+        results: Dict[str, Union[Dict[str, Any], BaseException]] = {}
+        for symbol in symbols:
+            df = frames[(symbol, tf_ccxt, int(limit))]
+            if isinstance(df, BaseException):
+                results[symbol] = df
+                continue
+            try:
+                results[symbol] = self._build_payload(symbol, timeframe, df, fields)
+            except Exception as exc:
+                results[symbol] = exc
+        return results
 
-        # 2. Indicadores
-        indicators = IndicatorsService(df).calculate_all()
+    def _build_payload(
+        self, symbol: str, timeframe: str, df, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        # 2. Indicadores: con `fields` sólo se calculan esos campos más las
+        # entradas de las reglas (las señales no cambian con la proyección).
+        # El resultado se comparte entre peticiones de la misma vela
+        # (`indicator_cache`).
+        computed = enriched(
+            df,
+            exchange=self.exchange_name,
+            symbol=symbol,
+            timeframe=self._ALIASES.get(timeframe.lower(), timeframe),
+            fields=None if fields is None else RulesService.INPUTS.union(fields),
+        ).result
+        indicators = computed if fields is None else {key: computed[key] for key in fields}
 
         # 3. Reglas / señales
-        rules = RulesService(symbol=symbol).evaluate(indicators)
+        rules = RulesService(symbol=symbol).evaluate(computed)
 
         # 4. Construcción de payload
         payload = {
@@ -17,7 +17,7 @@ from typing import Any, Dict, Literal
 
 import pandas as pd
 
-from .indicators_service import IndicatorsService
+from .indicator_cache import enriched
 from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
 from .rules_service import RulesService
 from .sizing_profiles import ATR_PROFILES, RISK_PROFILES, RiskProfile
@@ -64,10 +64,24 @@ class MovementsService:
     # Public API
     # ------------------------------------------------------------------
     def execute(self) -> Dict[str, Any]:
-        df = self._load_market_data()
+        return self._build(self._load_market_data())
+
+    async def execute_async(self) -> Dict[str, Any]:
+        return self._build(await self._load_market_data_async())
+
+    def _build(self, df: pd.DataFrame) -> Dict[str, Any]:
         last_close = float(df["close"].iloc[-1])
 
-        indicators = IndicatorsService(df).calculate_all()
+        # Only the rule inputs plus ATR: Trend Speed, the owner BBWP and the
+        # 200-bar averages are never read here. Shared with the other live
+        # endpoints for the same candles (`indicator_cache`).
+        indicators = enriched(
+            df,
+            exchange=self.exchange,
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            fields=RulesService.INPUTS | {"atr"},
+        ).result
         rules = RulesService(symbol=self.symbol).evaluate(indicators)
 
         result: Dict[str, Any] = {
@@ -237,3 +251,7 @@ class MovementsService:
     def _load_market_data(self) -> pd.DataFrame:
         svc = MarketDataService(exchange_name=self.exchange)
         return svc.get_ohlcv(symbol=self.symbol, timeframe=self.timeframe, limit=self.candles_limit)
+
+    async def _load_market_data_async(self) -> pd.DataFrame:
+        svc = MarketDataService(exchange_name=self.exchange)
+        return await svc.get_ohlcv_async(symbol=self.symbol, timeframe=self.timeframe, limit=self.candles_limit)
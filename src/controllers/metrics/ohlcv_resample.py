@@ -0,0 +1,115 @@
+"""Local higher-timeframe candles built from a cached lower-timeframe series.
+
+`SetupEvaluationService` and `build_monitors_v020` ask for several
+timeframes of the same symbol, each one a separate exchange round trip. A
+higher-timeframe candle is just the aggregate of the base candles inside its
+window (first open, max high, min low, last close, summed volume), so when a
+deep enough base series is already cached the higher timeframe can be built
+locally instead.
+
+The aggregate only matches the exchange's native candle when the windows
+line up exactly, so :func:`resample_ohlcv` is deliberately strict and
+returns ``None`` — the caller then fetches natively — whenever it could
+differ:
+
+* the target duration must be a whole multiple of the base duration and the
+  two grids must share their anchors (`_GRID_ANCHOR_OFFSET_MS` /
+  `_EXCHANGE_GRID_ANCHOR_OFFSET_MS`: the Monday-anchored 1w, binance's
+  1-day-offset 3d). A 1w candle from 1d base candles works; a 3d candle from
+  2d ones would not;
+* every closed bucket must contain all of its base candles (a gap in the base
+  series means the exchange may hold trades the aggregate misses), and the
+  forming bucket must run without holes from its open to the base series'
+  last row;
+* there must be at least ``limit`` such buckets, the leading partial bucket
+  (the base window rarely starts on a target boundary) being discarded.
+
+Opt-in through ``OHLCV_RESAMPLE_BASE`` (see `MarketDataService`).
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .market_data_service import _TIMEFRAME_TO_SECONDS, _grid_offset_ms
+
+_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def resample_ratio(base_tf: str, target_tf: str, exchange: Optional[str] = None) -> Optional[int]:
+    """Base candles per target candle, or ``None`` if the grids do not nest."""
+    base_s = _TIMEFRAME_TO_SECONDS.get(base_tf)
+    target_s = _TIMEFRAME_TO_SECONDS.get(target_tf)
+    if base_s is None or target_s is None or target_s <= base_s or target_s % base_s:
+        return None
+    base_ms = base_s * 1000
+    offset_delta = _grid_offset_ms(target_tf, exchange) - _grid_offset_ms(base_tf, exchange)
+    if offset_delta % base_ms:
+        return None
+    return target_s // base_s
+
+
+def resample_ohlcv(
+    base: pd.DataFrame,
+    base_tf: str,
+    target_tf: str,
+    limit: int,
+    exchange: Optional[str] = None,
+) -> Optional[pd.DataFrame]:
+    """Last ``limit`` ``target_tf`` candles aggregated from ``base``.
+
+    ``base`` is a raw OHLCV frame (forming candle included, as fetched). The
+    result has the same layout — its last row is the forming target candle
+    when ``base`` ends inside one. ``None`` whenever the aggregate could
+    differ from the exchange's native candles (see the module docstring).
+    """
+    ratio = resample_ratio(base_tf, target_tf, exchange)
+    if ratio is None or base.empty:
+        return None
+    base_ms = _TIMEFRAME_TO_SECONDS[base_tf] * 1000
+    target_ms = _TIMEFRAME_TO_SECONDS[target_tf] * 1000
+    offset_ms = _grid_offset_ms(target_tf, exchange)
+
+    ts = base["timestamp"].to_numpy(dtype=np.int64)
+    if len(ts) > 1 and (np.diff(ts) <= 0).any():
+        return None
+    opens = (ts - offset_ms) // target_ms * target_ms + offset_ms
+    starts = np.flatnonzero(np.r_[True, opens[1:] != opens[:-1]])
+    counts = np.diff(np.r_[starts, len(ts)])
+    bucket_opens = opens[starts]
+
+    # Position of each base candle inside its bucket: a complete bucket has
+    # slots 0..ratio-1 exactly; the forming one 0..k without holes.
+    slots = (ts - opens) // base_ms
+    first_slot = slots[starts]
+    last_slot = slots[starts + counts - 1]
+    contiguous = (last_slot - first_slot + 1) == counts
+    complete = contiguous & (first_slot == 0) & (counts == ratio)
+    forming_ok = contiguous[-1] and first_slot[-1] == 0
+
+    # Drop the leading partial bucket; the last one may be forming.
+    keep = complete.copy()
+    keep[-1] = complete[-1] or forming_ok
+    first = 0 if keep[0] else 1
+    if not keep[first:].all() or len(bucket_opens) - first < limit:
+        return None
+    first = len(bucket_opens) - limit
+
+    columns = {name: base[name].to_numpy() for name in ("open", "high", "low", "close", "volume")}
+    ends = starts + counts
+    frame = pd.DataFrame(
+        {
+            "timestamp": bucket_opens[first:],
+            "open": columns["open"][starts[first:]],
+            "high": np.maximum.reduceat(columns["high"], starts)[first:],
+            "low": np.minimum.reduceat(columns["low"], starts)[first:],
+            "close": columns["close"][ends[first:] - 1],
+            "volume": np.add.reduceat(columns["volume"].astype(float), starts)[first:],
+        },
+        columns=_COLUMNS,
+    )
+    frame["datetime"] = pd.to_datetime(frame["timestamp"], unit="ms", utc=True)
+    return frame.set_index("datetime")
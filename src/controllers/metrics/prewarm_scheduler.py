@@ -0,0 +1,177 @@
+"""Background cache prewarm fired just after each candle close.
+
+The candle-bound cache keys rotate the instant a candle closes, so the first
+`/setups/evaluate` or `/metrics/get` call after every close used to pay the
+full exchange fetch plus `IndicatorsService.calculate_all` on the request
+path. `PrewarmScheduler` moves that cost off the request path: a daemon
+thread sleeps until the next close on the exchange grid (the same
+`expected_last_closed_candle_ts` + grid anchors the cache keys use), then
+refreshes the raw OHLCV entry and the enriched frame of every configured
+`(symbol, timeframe)` whose candle just closed. Requests arriving a moment
+later are cache hits.
+
+Opt-in: set ``PREWARM_SYMBOLS`` (comma-separated, e.g. ``BTC/USDT,ETH/USDT``).
+``PREWARM_TIMEFRAMES`` defaults to the v0.2.0 ladder (`LADDER_V020`),
+``PREWARM_DELAY_S`` (default 2s) gives the exchange time to publish the
+closed candle before it is fetched. A failing refresh is logged and retried
+with a short backoff (``PREWARM_RETRY_S``, doubling per failed attempt) until
+it succeeds or the next close comes; meanwhile the request path fetches as
+before.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from os import getenv
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import market_data_service
+from .exchange_clients import BACKGROUND, call_priority
+from .market_data_service import DEFAULT_EXCHANGE, _TIMEFRAME_TO_SECONDS, expected_last_closed_candle_ts
+from .rule_v020 import LADDER_V020
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _env_list(name: str, default: Sequence[str] = ()) -> List[str]:
+    raw = getenv(name, "").split("#", 1)[0].strip()
+    if not raw:
+        return list(default)
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(getenv(name, str(default)).split("#", 1)[0].strip())
+    except ValueError:
+        return default
+
+
+def next_close_s(timeframe: str, exchange: str, now: float) -> float:
+    """Wall-clock second at which the candle forming at ``now`` closes."""
+    last_closed_ms = expected_last_closed_candle_ts(timeframe, now, exchange)
+    return (last_closed_ms + 2 * _TIMEFRAME_TO_SECONDS[timeframe] * 1000) / 1000.0
+
+
+class PrewarmScheduler:
+    """Refreshes OHLCV + enriched frames for a watchlist at each candle close."""
+
+    def __init__(
+        self,
+        *,
+        symbols: Sequence[str],
+        timeframes: Sequence[str] = LADDER_V020,
+        exchange: str = DEFAULT_EXCHANGE,
+        delay_s: float = 2.0,
+        retry_s: float = 5.0,
+    ) -> None:
+        unknown = [tf for tf in timeframes if tf not in _TIMEFRAME_TO_SECONDS]
+        if unknown:
+            raise ValueError(f"Timeframes no soportados para el precalentado: {', '.join(unknown)}")
+        self.symbols = list(symbols)
+        self.timeframes = list(timeframes)
+        self.exchange = exchange.lower()
+        self.delay_s = max(0.0, float(delay_s))
+        self.retry_s = max(0.1, float(retry_s))
+        # Last closed candle already warmed per (symbol, timeframe).
+        self._warmed: Dict[Tuple[str, str], int] = {}
+        # Consecutive runs that left a refresh failed (retry backoff).
+        self._failed_runs = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["PrewarmScheduler"]:
+        """Scheduler configured by the ``PREWARM_*`` variables (``None`` if off)."""
+        symbols = _env_list("PREWARM_SYMBOLS")
+        if not symbols:
+            return None
+        return cls(
+            symbols=symbols,
+            timeframes=_env_list("PREWARM_TIMEFRAMES", LADDER_V020),
+            exchange=getenv("PREWARM_EXCHANGE", DEFAULT_EXCHANGE).split("#", 1)[0].strip() or DEFAULT_EXCHANGE,
+            delay_s=_env_float("PREWARM_DELAY_S", 2.0),
+            retry_s=_env_float("PREWARM_RETRY_S", 5.0),
+        )
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def seconds_until_next_run(self, now: Optional[float] = None) -> float:
+        """Delay until the earliest upcoming close (plus ``delay_s``)."""
+        now = market_data_service._now() if now is None else now
+        # Measured from `now - delay_s` so a wake-up a hair early still
+        # targets the close it was waiting for rather than the next one.
+        shifted = now - self.delay_s
+        next_run = min(next_close_s(tf, self.exchange, shifted) for tf in self.timeframes) + self.delay_s
+        return max(0.0, next_run - now)
+
+    def seconds_until_next_attempt(self, now: Optional[float] = None) -> float:
+        """Delay until the next :meth:`run_once`: the next close, or sooner to
+        retry failed refreshes (``retry_s``, doubled per failed run, at most
+        32x)."""
+        now = market_data_service._now() if now is None else now
+        wait = self.seconds_until_next_run(now)
+        if self._failed_runs:
+            wait = min(wait, self.retry_s * 2 ** min(self._failed_runs - 1, 5))
+        return wait
+
+    def due(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """``(symbol, timeframe)`` pairs whose last closed candle is not warm yet."""
+        now = market_data_service._now() if now is None else now
+        pairs: List[Tuple[str, str]] = []
+        for tf in self.timeframes:
+            # A close only counts once `delay_s` has passed since it.
+            candle_ts = expected_last_closed_candle_ts(tf, now - self.delay_s, self.exchange)
+            for symbol in self.symbols:
+                if self._warmed.get((symbol, tf)) != candle_ts:
+                    pairs.append((symbol, tf))
+        return pairs
+
+    def run_once(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Warm every due pair; returns the pairs refreshed successfully."""
+        # Imported here: the evaluation service pulls in the whole setup stack.
+        from .setup_evaluation_service import SetupEvaluationService
+
+        now = market_data_service._now() if now is None else now
+        warmed: List[Tuple[str, str]] = []
+        failed = False
+        for symbol, tf in self.due(now):
+            candle_ts = expected_last_closed_candle_ts(tf, now - self.delay_s, self.exchange)
+            try:
+                # Fetches the raw OHLCV entry (shared with /metrics/get & co.
+                # through MarketDataService's cache) and enriches it into the
+                # evaluation service's frame cache. Live requests keep
+                # precedence on the exchange's rate-limit budget.
+                with call_priority(BACKGROUND):
+                    SetupEvaluationService(symbol=symbol, exchange=self.exchange).warm(tf)
+            except Exception as exc:
+                _LOGGER.warning("Prewarm of %s %s failed: %s", symbol, tf, exc)
+                failed = True
+                continue
+            self._warmed[(symbol, tf)] = candle_ts
+            warmed.append((symbol, tf))
+        self._failed_runs = self._failed_runs + 1 if failed else 0
+        return warmed
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.seconds_until_next_attempt())
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="candle-prewarm", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,253 @@
+"""Offline ccxt stand-in that replays the committed candle fixtures.
+
+Benchmarks and load tests of the market-data path (pool, rate-limit budget,
+single flight, caches, bulk and async fetches) need an exchange that answers
+the same way every run and never touches the network. With
+``REPLAY_EXCHANGE_ENABLED=1`` `ReplayExchange` is registered as the
+``replay`` exchange in `MarketDataService.SUPPORTED_EXCHANGES`
+(``?exchange=replay`` on any endpoint, or ``DEFAULT_EXCHANGE=replay``);
+otherwise it does not exist, so a deployment never serves fabricated candles
+as market data. It serves, like a ccxt client:
+
+* ``fetch_ohlcv(symbol, timeframe, since=None, limit=None)`` — the
+  ``tests/fixtures/btc_usdt_bitget_{tf}_*.json`` candles (30m, 1h, 4h, 1d,
+  1w). Without ``since`` the last ``limit`` candles; with it the first
+  ``limit`` candles opening at or after ``since``. ``limit`` is capped at
+  ``max_limit`` (1000, bitget's candles cap);
+* ``fetch_ticker`` / ``fetch_tickers`` — built from the last 30m candle.
+
+Knobs (constructor keyword or environment variable):
+
+* ``latency_ms`` / ``REPLAY_LATENCY_MS`` and ``jitter_ms`` /
+  ``REPLAY_JITTER_MS`` — simulated round-trip time per call (jitter drawn
+  uniformly from ``[0, jitter_ms]``);
+* ``min_candles`` / ``REPLAY_MIN_CANDLES`` — synthesize older history so
+  every series has at least that many candles: a seeded random walk
+  bootstrapped backwards from the real bodies, wicks and volumes, so scale
+  tests get long series with realistic statistics and identical output
+  every run;
+* ``align_to_now`` / ``REPLAY_ALIGN_TO_NOW`` (on by default) — shift each
+  series by a whole number of candles so its last fixture candle is the one
+  forming now (`market_data_service._now`), which makes the cache keys,
+  closed-candle filter and tail refresh behave as against a live exchange.
+  Each timeframe is shifted on its own grid, so the timeframes do not line
+  up with each other in time;
+* ``rate_limit_ms`` / ``REPLAY_RATE_LIMIT_MS`` — the ``rateLimit`` the
+  shared rate-limit budget is sized from (0 = unmetered);
+* ``fixtures_dir`` / ``REPLAY_FIXTURES_DIR`` — where the fixtures live.
+
+Only BTC/USDT is real; any other symbol replays the same candles rescaled by
+a deterministic per-symbol factor, enough to drive a multi-pair scan.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import zlib
+from os import getenv
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import ccxt
+import numpy as np
+
+_DEFAULT_FIXTURES_DIR = Path(__file__).resolve().parents[3] / "tests" / "fixtures"
+_FIXTURE_SYMBOL = "BTC/USDT"
+
+# Parsed fixture files, shared by every instance: {(dir, timeframe): rows}.
+_FIXTURES: Dict[Tuple[str, str], np.ndarray] = {}
+_FIXTURES_LOCK = threading.Lock()
+
+
+def _env(name: str, default: str) -> str:
+    return getenv(name, default).split("#", 1)[0].strip() or default
+
+
+def _load_fixture(directory: Path, timeframe: str) -> Optional[np.ndarray]:
+    """``(n, 6)`` float array of one timeframe's fixture (``None`` if absent)."""
+    key = (str(directory), timeframe)
+    with _FIXTURES_LOCK:
+        if key in _FIXTURES:
+            return _FIXTURES[key]
+    matches = sorted(directory.glob(f"btc_usdt_bitget_{timeframe}_*.json"))
+    rows = None
+    if matches:
+        with open(matches[-1], encoding="utf-8") as handle:
+            rows = np.asarray(json.load(handle), dtype=float)
+    with _FIXTURES_LOCK:
+        _FIXTURES[key] = rows
+    return rows
+
+
+def synthesize_history(rows: np.ndarray, candles: int, duration_ms: int, seed: int) -> np.ndarray:
+    """``rows`` extended backwards to ``candles`` candles (real rows kept as-is).
+
+    Each synthetic candle closes where the next one opens and draws its body
+    return, wick sizes and volume from the real candles (bootstrap), so the
+    series keeps the fixture's volatility profile.
+    """
+    extra = candles - len(rows)
+    if extra <= 0 or len(rows) == 0:
+        return rows
+    rng = np.random.RandomState(seed)
+    opens, highs, lows, closes, volumes = (rows[:, i] for i in range(1, 6))
+    body_max = np.maximum(opens, closes)
+    body_min = np.minimum(opens, closes)
+    returns = np.log(closes / opens)
+    upper = highs / body_max - 1.0
+    lower = 1.0 - lows / body_min
+
+    picks = rng.randint(0, len(rows), size=(extra, 4))
+    out = np.empty((extra, 6))
+    next_open = opens[0]
+    for i in range(extra - 1, -1, -1):
+        close = next_open
+        open_ = close / np.exp(returns[picks[i, 0]])
+        high = max(open_, close) * (1.0 + upper[picks[i, 1]])
+        low = min(open_, close) * (1.0 - lower[picks[i, 2]])
+        out[i] = (0.0, open_, high, low, close, volumes[picks[i, 3]])
+        next_open = open_
+    out[:, 0] = rows[0, 0] - duration_ms * np.arange(extra, 0, -1)
+    return np.vstack([out, rows])
+
+
+class ReplayExchange:
+    """Deterministic, offline ccxt client over the candle fixtures."""
+
+    id = "replay"
+    DEFAULT_LIMIT = 500
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **overrides: Any) -> None:
+        config = dict(config or {}, **overrides)
+        self.config = config
+        # ccxt's ``rateLimit`` (ms per request unit): sizes the pool's budget.
+        self.rateLimit = float(config.get("rate_limit_ms", _env("REPLAY_RATE_LIMIT_MS", "0")))
+        self.fixtures_dir = Path(config.get("fixtures_dir") or _env("REPLAY_FIXTURES_DIR", str(_DEFAULT_FIXTURES_DIR)))
+        self.latency_ms = float(config.get("latency_ms", _env("REPLAY_LATENCY_MS", "0")))
+        self.jitter_ms = float(config.get("jitter_ms", _env("REPLAY_JITTER_MS", "0")))
+        self.min_candles = int(config.get("min_candles", _env("REPLAY_MIN_CANDLES", "0")))
+        align = config.get("align_to_now", _env("REPLAY_ALIGN_TO_NOW", "1"))
+        self.align_to_now = align if isinstance(align, bool) else str(align).lower() not in ("0", "false", "no")
+        self.max_limit = int(config.get("max_limit", 1000))
+        self.timeframes = {tf: tf for tf in ("30m", "1h", "4h", "1d", "1w")}
+        self.markets: Optional[Dict[str, Any]] = None
+        self.currencies: Optional[Dict[str, Any]] = None
+        self._random = random.Random(0)
+        self._series: Dict[Tuple[str, str], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # ccxt surface
+    # ------------------------------------------------------------------
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        if self.markets is None or reload:
+            self._sleep()
+            self.markets = {
+                _FIXTURE_SYMBOL: {"id": "BTCUSDT", "symbol": _FIXTURE_SYMBOL, "base": "BTC", "quote": "USDT", "spot": True}
+            }
+            self.currencies = {}
+        return self.markets
+
+    def set_markets(self, markets: Dict[str, Any], currencies: Optional[Dict[str, Any]] = None) -> None:
+        self.markets = markets
+        self.currencies = currencies
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[List[float]]:
+        self._sleep()
+        series = self._shifted(symbol, timeframe)
+        limit = min(int(limit or self.DEFAULT_LIMIT), self.max_limit)
+        if since is None:
+            window = series[-limit:]
+        else:
+            start = int(np.searchsorted(series[:, 0], int(since), side="left"))
+            window = series[start:start + limit]
+        return [[int(row[0]), *row[1:].tolist()] for row in window]
+
+    def fetch_ticker(self, symbol: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._sleep()
+        return self._ticker(symbol)
+
+    def fetch_tickers(
+        self, symbols: Optional[Sequence[str]] = None, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        self._sleep()
+        return {symbol: self._ticker(symbol) for symbol in (symbols or [_FIXTURE_SYMBOL])}
+
+    def close(self) -> None:
+        """Nothing to release (ccxt clients close their HTTP session here)."""
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _sleep(self) -> None:
+        delay_ms = self.latency_ms
+        if self.jitter_ms > 0:
+            with self._lock:
+                delay_ms += self._random.uniform(0.0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+    def _series_for(self, symbol: str, timeframe: str) -> np.ndarray:
+        """Unshifted candles of ``symbol`` (synthetic history prepended)."""
+        key = (symbol, timeframe)
+        with self._lock:
+            cached = self._series.get(key)
+        if cached is not None:
+            return cached
+        from .market_data_service import _TIMEFRAME_TO_SECONDS
+
+        rows = _load_fixture(self.fixtures_dir, timeframe) if timeframe in self.timeframes else None
+        if rows is None:
+            raise ccxt.BadRequest(f"replay: no fixture candles for timeframe {timeframe}")
+        series = rows
+        seed = zlib.crc32(f"{symbol}|{timeframe}".encode())
+        series = synthesize_history(series, self.min_candles, _TIMEFRAME_TO_SECONDS[timeframe] * 1000, seed)
+        series = series.copy()
+        if symbol != _FIXTURE_SYMBOL:
+            # 0.001x .. 10x of BTC, stable per symbol.
+            series[:, 1:5] *= 10.0 ** ((zlib.crc32(symbol.encode()) % 5) - 3)
+        series.flags.writeable = False
+        with self._lock:
+            self._series[key] = series
+        return series
+
+    def _shifted(self, symbol: str, timeframe: str) -> np.ndarray:
+        series = self._series_for(symbol, timeframe)
+        if not self.align_to_now or len(series) == 0:
+            return series
+        from .market_data_service import _TIMEFRAME_TO_SECONDS, expected_last_closed_candle_ts
+
+        forming_open = expected_last_closed_candle_ts(timeframe, exchange=self.id)
+        shift = forming_open + _TIMEFRAME_TO_SECONDS[timeframe] * 1000 - int(series[-1, 0])
+        shifted = series.copy()
+        shifted[:, 0] += shift
+        return shifted
+
+    def _ticker(self, symbol: str) -> Dict[str, Any]:
+        last = self._shifted(symbol, "30m")[-1]
+        close = float(last[4])
+        spread = close * 0.0001
+        ts = int(last[0])
+        return {
+            "symbol": symbol,
+            "timestamp": ts,
+            "datetime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(ts / 1000)),
+            "last": close,
+            "close": close,
+            "bid": close - spread,
+            "ask": close + spread,
+            "open": float(last[1]),
+            "high": float(last[2]),
+            "low": float(last[3]),
+            "baseVolume": float(last[5]),
+        }
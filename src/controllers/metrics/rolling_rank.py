@@ -0,0 +1,87 @@
+"""Rolling percentile rank — pandas ``rank(pct=True)`` over a sliding window.
+
+The legacy BBWP (`IndicatorsService._calc_bbwp`) used to be
+
+    bbw.rolling(window, min_periods=1).apply(lambda x: x.rank(pct=True).iloc[-1])
+
+which builds a pandas Series and fully ranks it for every bar: the single
+most expensive step of `calculate_all`. `rolling_percentile_rank` returns
+the same numbers bit for bit from one sorted copy of the window, maintained
+incrementally (``bisect`` insert / evict, like `bbwp_owner`), so each bar
+costs two binary searches instead of a sort.
+
+Semantics replicated from pandas:
+
+* the window is the last ``window`` bars, the current one included;
+  fewer than ``min_periods`` non-NaN values in it -> NaN;
+* a NaN current value -> NaN (``na_option="keep"``); NaN values elsewhere in
+  the window are ignored and do not count towards the size. ``±inf`` count
+  as NaN: pandas' rolling windows replace them before calling ``apply``;
+* ties get their average rank (``method="average"``): with ``less`` values
+  below the current one and ``equal`` values equal to it (itself included),
+  the rank is ``less + (equal + 1) / 2``, divided by the number of non-NaN
+  values — computed in the same order pandas does, so the float results are
+  identical, not merely close.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right, insort_right
+from collections import deque
+from typing import Any, Dict, Deque, List
+
+import numpy as np
+import pandas as pd
+
+
+def rolling_percentile_rank(values: pd.Series, window: int, min_periods: int = 1) -> pd.Series:
+    """Percentile rank (0-1] of each value within its trailing ``window``.
+
+    Equivalent to ``values.rolling(window, min_periods=min_periods).apply(
+    lambda x: x.rank(pct=True).iloc[-1], raw=False)``. Pure function: the
+    returned float64 Series is aligned to ``values.index``.
+    """
+    rank = RollingPercentRank(window, min_periods)
+    data = values.to_numpy(dtype="float64")
+    out = np.fromiter((rank.update(value) for value in data), dtype="float64", count=len(data))
+    return pd.Series(out, index=values.index, dtype="float64")
+
+
+class RollingPercentRank:
+    """Streaming :func:`rolling_percentile_rank`: one value in, its rank out."""
+
+    def __init__(self, window: int, min_periods: int = 1) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        if not 0 <= min_periods <= window:
+            raise ValueError("min_periods must be between 0 and window")
+        self.window = window
+        self.min_periods = max(min_periods, 1)
+        self._raw: Deque[float] = deque()
+        self._ordered: List[float] = []  # the window's non-NaN values, sorted
+
+    def update(self, value: float) -> float:
+        current = float(value)
+        if math.isinf(current):
+            current = math.nan  # as pandas' rolling does
+        self._raw.append(current)
+        if not math.isnan(current):
+            insort_right(self._ordered, current)
+        if len(self._raw) > self.window:
+            oldest = self._raw.popleft()
+            if not math.isnan(oldest):
+                del self._ordered[bisect_left(self._ordered, oldest)]
+        size = len(self._ordered)
+        if math.isnan(current) or size < self.min_periods:
+            return math.nan
+        less = bisect_left(self._ordered, current)
+        equal = bisect_right(self._ordered, current) - less
+        return (less + (equal + 1) / 2) / size
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"raw": list(self._raw), "ordered": list(self._ordered)}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self._raw = deque(state["raw"])
+        self._ordered = list(state["ordered"])
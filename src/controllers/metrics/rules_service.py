@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List
 from os import getenv
 
 
@@ -26,6 +26,25 @@ class RulesService:
         "bbwp_low": 20.0,
     }
 
+    # `IndicatorsService` result keys `evaluate` reads: rule-driven callers
+    # compute only these (`IndicatorsService.calculate(RulesService.INPUTS)`).
+    INPUTS: FrozenSet[str] = frozenset({
+        "rsi14",
+        "bbwp",
+        "adx14",
+        "plus_di",
+        "minus_di",
+        "konkorde_value",
+        "ao",
+        "sma50",
+        "ema50",
+        "macd",
+        "macd_signal",
+        "stoch_rsi_k",
+        "stoch_rsi_d",
+        "volatility_20",
+    })
+
     DEFAULT_WEIGHTS: Dict[str, float] = {
         "konkorde": 3.0,
         "ao": 2.0,
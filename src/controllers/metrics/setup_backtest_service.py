@@ -33,8 +33,9 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
+from .exchange_clients import BACKTEST, call_priority
 from .indicators_service import IndicatorsService
-from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
+from .market_data_service import DEFAULT_EXCHANGE, MarketDataService, candle_gap_report
 from .setup_definitions import DEFAULT_SETUPS, SetupDefinition, VetoDefinition, validate_setup
 from .setup_service import TIMEFRAME_SECONDS, SetupService
 from .sizing_profiles import RiskProfile, atr_sizing_for
@@ -123,6 +124,8 @@ class SetupBacktestService:
         self.in_sample_fraction = float(in_sample_fraction)
         self.warmup_bars = max(50, warmup_bars)
         self._setup_service = SetupService(setups=self.setups)
+        # Holes in the downloaded history per timeframe (`_fetch_paginated`).
+        self.data_gaps: Dict[str, List[Dict[str, Any]]] = {}
 
     # ------------------------------------------------------------------
     # Public entrypoint
@@ -155,6 +158,7 @@ class SetupBacktestService:
                 "initial_capital": self.initial_capital,
             },
             "setups": {},
+            "data_gaps": {tf: self.data_gaps.get(tf, []) for tf in timeframes},
         }
 
         for setup in self.setups:
@@ -516,35 +520,16 @@ class SetupBacktestService:
         return service.df
 
     def _fetch_paginated(self, timeframe: str, since_dt: datetime) -> pd.DataFrame:
-        exchange = MarketDataService(exchange_name=self.exchange).exchange
         duration_ms = TIMEFRAME_SECONDS[timeframe] * 1000
         since_ms = int(since_dt.timestamp() * 1000)
         end_ms = int(self.end.timestamp() * 1000)
-        # 200, NOT 1000: for ranges beyond its recent window bitget routes to
-        # the history-candles endpoint, which serves at most 200 rows ending
-        # at `since + limit * duration` — with limit=1000 that returns a
-        # window that starts AFTER `since` (silent gap / ignored since;
-        # verified live 2026-07-07: 1d since 8 months back returned only the
-        # latest 200 candles). With limit=200 bitget honours `since` exactly,
-        # so forward pagination is gap-free at the cost of more requests.
-        limit = 200
-        rows: List[List[Any]] = []
-        cursor = since_ms
-
-        while cursor < end_ms:
-            batch = exchange.fetch_ohlcv(
-                symbol=self.symbol, timeframe=timeframe, since=cursor, limit=limit
-            )
-            if not batch:
-                break
-            rows.extend(batch)
-            last_ts = batch[-1][0]
-            next_cursor = last_ts + duration_ms
-            if next_cursor <= cursor:
-                break
-            cursor = next_cursor
-            if len(batch) < limit:
-                break
+        # Pages of 200 (bitget history-candles only honours `since` at that
+        # size — known-errors E13), downloaded concurrently and served from
+        # the persistent candle store first when CANDLE_STORE_PATH is set.
+        # Queued behind live traffic on the shared exchange budget.
+        market = MarketDataService(exchange_name=self.exchange)
+        with call_priority(BACKTEST):
+            rows: List[List[Any]] = market.fetch_history(self.symbol, timeframe, since_ms, end_ms)
 
         if not rows:
             raise ValueError(f"No OHLCV data returned for {self.symbol} {timeframe}")
@@ -554,6 +539,7 @@ class SetupBacktestService:
         df = df.drop_duplicates(subset="timestamp").sort_values("timestamp")
         df.set_index("datetime", inplace=True)
         df = df[df.index <= self.end]
+        self.data_gaps[timeframe] = candle_gap_report(df["timestamp"].tolist(), duration_ms)
 
         # Closed candles only (spec §0.1): drop the forming last row.
         now_ms = time.time() * 1000.0
@@ -11,27 +11,24 @@ Design notes:
   evaluator the F0 backtest replays. Nothing is re-implemented here; this
   module only loads data, aligns context frames (spec §0.2) and serialises.
 * Raw candles are cached by `MarketDataService`'s TTL cache; the enriched
-  (indicator-annotated) frame is additionally cached here keyed by
-  `(exchange, symbol, timeframe, last_closed_candle_ts)` — the key is bound
-  to the candle, so a cache hit can never serve a repainted value.
+  (indicator-annotated) frame comes from `indicator_cache`, the enriched-frame
+  cache every live endpoint shares, keyed by the candles it was computed
+  from — a cache hit can never serve a repainted value. With
+  ``SHARED_CACHE_URL`` set it is also shared across instances under that
+  same key (`shared_cache`), so only one instance runs `calculate_all` per
+  candle.
 """
 
 from __future__ import annotations
 
 import math
 import os
-import threading
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Sequence
 
 import pandas as pd
 
-try:
-    from cachetools import TTLCache
-except Exception:  # pragma: no cover - cachetools is a hard runtime dep
-    TTLCache = None  # type: ignore[assignment]
-
-from .indicators_service import IndicatorsService
+from . import indicator_cache
 from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
 from .setup_definitions import Condition, SetupDefinition
 from .setup_service import (
@@ -97,13 +94,6 @@ def _last(df: pd.DataFrame, column: str) -> Optional[float]:
 class SetupEvaluationService:
     """Evaluates the declarative setups live and serialises the API contract."""
 
-    # Enriched-frame cache. Keys embed the last closed candle timestamp, so
-    # entries can never go stale — the TTL only bounds memory/eviction.
-    _CACHE: Optional["TTLCache"] = (
-        TTLCache(maxsize=64, ttl=4 * 60 * 60) if TTLCache is not None else None
-    )
-    _CACHE_LOCK = threading.Lock()
-
     def __init__(
         self,
         *,
@@ -395,6 +385,12 @@ class SetupEvaluationService:
     # ------------------------------------------------------------------
     # Data loading (closed candles only + indicator enrichment)
     # ------------------------------------------------------------------
+    def warm(self, timeframe: str) -> None:
+        """Load ``timeframe``'s closed candles and enriched frame into the shared
+        caches, as an evaluation would, without evaluating anything (used by
+        the candle-close prewarm)."""
+        self._enriched_frame(timeframe)
+
     def _enriched_frame(self, timeframe: str) -> pd.DataFrame:
         market = MarketDataService(exchange_name=self.exchange)
         raw = market.get_ohlcv(
@@ -409,22 +405,9 @@ class SetupEvaluationService:
                 f"on {self.exchange}"
             )
 
-        key = (self.exchange, self.symbol, timeframe, int(raw["timestamp"].iloc[-1]))
-        cache = self._CACHE
-        if cache is not None:
-            with self._CACHE_LOCK:
-                cached = cache.get(key)
-            if cached is not None:
-                return cached
-
-        service = IndicatorsService(raw)
-        service.calculate_all()
-        enriched = service.df
-
-        if cache is not None:
-            with self._CACHE_LOCK:
-                cache[key] = enriched
-        return enriched
+        return indicator_cache.enriched(
+            raw, exchange=self.exchange, symbol=self.symbol, timeframe=timeframe
+        ).frame
 
 
 def _condition_value(cond: Condition, df: pd.DataFrame) -> Optional[float]:
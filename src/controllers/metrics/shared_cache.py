@@ -0,0 +1,337 @@
+"""Optional second-level cache shared by every service instance.
+
+Cloud Run runs several instances side by side, and each one kept its own
+in-memory caches: N instances meant N identical OHLCV downloads and N
+identical `IndicatorsService.calculate_all` runs at every candle close. The
+shared tier sits behind those in-process caches (`MarketDataService` for raw
+candles, `indicator_cache` for enriched frames): a
+local miss looks here before going to the exchange or recomputing, and a
+fresh result is written back for the other instances.
+
+Keys are the in-process keys rendered as text (``ohlcv|bitget|BTC/USDT|1h|
+<last closed ts>``), so the candle-bound invalidation carries over unchanged:
+an entry becomes unreachable the moment the next candle closes, and the TTL
+only bounds storage.
+
+Values are a compact binary encoding (`encode_arrays`): a small JSON header
+followed by the raw little-endian column buffers — no pickle, so a shared
+store can never execute code in the reader. Frames (`encode_frame`) store
+their datetime index as int64 nanoseconds and string columns as int32 codes
+into a value table; anything else is simply not shared.
+
+Backends are selected by ``SHARED_CACHE_URL``:
+
+* ``file:///path/to/dir`` — one file per key in a directory every instance
+  can reach (a mounted volume, or a local disk shared by worker processes).
+  Writes go through a temp file + ``os.replace``, so readers never see a torn
+  value. Candle-bound keys are rarely read again once their candle closes,
+  so expiry on read alone would let the directory grow forever: every
+  `SWEEP_EVERY_WRITES` writes `FileSharedCache.sweep` deletes expired files
+  and keeps the directory under ``SHARED_CACHE_MAX_MB``. It stands in for a
+  network store such as Redis: a new backend only implements
+  :meth:`SharedCache._read` / :meth:`SharedCache._write`.
+
+Unset (the default) disables the tier. The shared cache is best effort: a
+backend error is logged and treated as a miss, never failed to the caller.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from os import getenv
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"MMK1"
+_HEADER = struct.Struct("<4sI")  # magic, JSON header length
+_EXPIRY = struct.Struct("<d")  # file backend: absolute expiry (epoch seconds)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(getenv(name, str(default)).split("#", 1)[0].strip()))
+    except ValueError:
+        return default
+
+
+# File backend housekeeping: a sweep every this many writes (per instance),
+# and the directory size it keeps under.
+SWEEP_EVERY_WRITES = 64
+MAX_BYTES = _env_int("SHARED_CACHE_MAX_MB", 512) * 1024 * 1024
+_TMP_MAX_AGE_S = 60 * 60  # temp files left behind by a crashed writer
+
+
+# ----------------------------------------------------------------------
+# Serialization
+# ----------------------------------------------------------------------
+def encode_arrays(meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> bytes:
+    """``meta`` (JSON-able) and named numpy arrays as one binary payload."""
+    layout = []
+    buffers = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError(f"array {name!r} holds Python objects")
+        layout.append([name, np.lib.format.dtype_to_descr(array.dtype.newbyteorder("<")), list(array.shape)])
+        buffers.append(array.astype(array.dtype.newbyteorder("<"), copy=False).tobytes())
+    header = json.dumps({"meta": meta, "arrays": layout}, separators=(",", ":")).encode()
+    return b"".join([_HEADER.pack(_MAGIC, len(header)), header, *buffers])
+
+
+def decode_arrays(payload: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Inverse of :func:`encode_arrays`; arrays are read-only views of ``payload``."""
+    magic, size = _HEADER.unpack_from(payload)
+    if magic != _MAGIC:
+        raise ValueError("not a shared-cache payload")
+    offset = _HEADER.size
+    header = json.loads(payload[offset:offset + size])
+    offset += size
+    arrays: Dict[str, np.ndarray] = {}
+    for name, descr, shape in header["arrays"]:
+        dtype = np.lib.format.descr_to_dtype(_as_descr(descr))
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += array.nbytes
+        arrays[name] = array
+    return header["meta"], arrays
+
+
+def _as_descr(descr: Any) -> Any:
+    # JSON turns the structured-dtype tuples into lists.
+    if isinstance(descr, list):
+        return [tuple(_as_descr(part) for part in field) for field in descr]
+    return descr
+
+
+def encode_frame(df: pd.DataFrame, extra: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+    """``df`` as a payload, or ``None`` if a column cannot be encoded.
+
+    Numeric and boolean columns are stored as-is; string columns (``None``
+    for missing) as int32 codes into a value table. The index must be a
+    datetime index (the enriched frames' ``datetime``). ``extra`` (JSON-able)
+    travels in the header, see :func:`decode_frame_extra`.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        return None
+    index = df.index
+    meta: Dict[str, Any] = {
+        "index": index.name,
+        "tz": str(index.tz) if index.tz is not None else None,
+        "columns": [],
+        "extra": extra,
+    }
+    arrays: Dict[str, np.ndarray] = {"__index__": index.asi8}
+    for position, (name, series) in enumerate(df.items()):
+        slot = f"c{position}"
+        values = series.to_numpy()
+        if values.dtype.kind in "biuf":
+            meta["columns"].append([name, slot, None])
+            arrays[slot] = values
+            continue
+        if values.dtype != object or not all(v is None or isinstance(v, str) for v in values):
+            return None
+        codes, table = pd.factorize(values, use_na_sentinel=True)
+        meta["columns"].append([name, slot, [str(v) for v in table]])
+        arrays[slot] = codes.astype(np.int32)
+    return encode_arrays(meta, arrays)
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """Inverse of :func:`encode_frame` (numeric columns share ``payload``'s memory)."""
+    return decode_frame_extra(payload)[0]
+
+
+def decode_frame_extra(payload: bytes) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+    """:func:`decode_frame` plus the ``extra`` stored with the frame."""
+    meta, arrays = decode_arrays(payload)
+    index = pd.DatetimeIndex(arrays["__index__"].view("M8[ns]"), name=meta["index"])
+    if meta["tz"] is not None:
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    columns: Dict[Any, Any] = {}
+    for name, slot, table in meta["columns"]:
+        values = arrays[slot]
+        if table is not None:
+            lookup = np.array(table + [None], dtype=object)
+            values = lookup[values]  # code -1 picks the trailing None
+        columns[name] = values
+    return pd.DataFrame(columns, index=index, copy=False), meta.get("extra")
+
+
+# ----------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------
+class SharedCache:
+    """Byte store shared across instances; subclasses implement the I/O."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Value under ``key`` or ``None`` (missing, expired or backend error)."""
+        try:
+            return self._read(key)
+        except Exception as exc:
+            _LOGGER.warning("Shared cache read of %s failed: %s", key, exc)
+            return None
+
+    def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        """Store ``value`` for ``ttl_s`` seconds (errors are logged, not raised)."""
+        try:
+            self._write(key, value, ttl_s)
+        except Exception as exc:
+            _LOGGER.warning("Shared cache write of %s failed: %s", key, exc)
+
+    def _read(self, key: str) -> Optional[bytes]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def _write(self, key: str, value: bytes, ttl_s: float) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+
+class FileSharedCache(SharedCache):
+    """One file per key in ``directory``, prefixed by its expiry time.
+
+    Swept on start and every ``sweep_every`` writes (see `sweep`), so the
+    directory holds at most about ``max_bytes`` of live entries.
+    """
+
+    def __init__(self, directory: str, *, max_bytes: int = MAX_BYTES, sweep_every: int = SWEEP_EVERY_WRITES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._sweep_logged()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return None
+        (expires,) = _EXPIRY.unpack_from(data)
+        if expires <= time.time():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        return data[_EXPIRY.size:]
+
+    def _write(self, key: str, value: bytes, ttl_s: float) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_EXPIRY.pack(time.time() + ttl_s))
+                handle.write(value)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.sweep_every == 0
+        if due:
+            self._sweep_logged()
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Delete expired entries, then the soonest-expiring ones over ``max_bytes``.
+
+        Temp files older than an hour (a writer that crashed) go too.
+        Returns the number of files removed. Instances sweeping the same
+        directory concurrently only race on unlinks, which are tolerated.
+        """
+        now = time.time() if now is None else now
+        live, removed = self._drop_expired(now)
+        total = sum(size for _, size, _ in live)
+        live.sort()  # soonest expiry first
+        for _, size, path in live:
+            if total <= self.max_bytes:
+                break
+            removed += _unlink(path)
+            total -= size
+        return removed
+
+    def _drop_expired(self, now: float) -> Tuple[List[Tuple[float, int, str]], int]:
+        """``(expiry, size, path)`` of the live entries and the count removed."""
+        live: List[Tuple[float, int, str]] = []
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                    if entry.name.startswith(".tmp-"):
+                        if stat.st_mtime < now - _TMP_MAX_AGE_S:
+                            removed += _unlink(entry.path)
+                        continue
+                    with open(entry.path, "rb") as handle:
+                        header = handle.read(_EXPIRY.size)
+                except OSError:
+                    continue  # removed under us
+                expires = _EXPIRY.unpack(header)[0] if len(header) == _EXPIRY.size else 0.0
+                if expires <= now:
+                    removed += _unlink(entry.path)
+                else:
+                    live.append((expires, stat.st_size, entry.path))
+        return live, removed
+
+    def _sweep_logged(self) -> None:
+        try:
+            self.sweep()
+        except Exception as exc:
+            _LOGGER.warning("Shared cache sweep of %s failed: %s", self.directory, exc)
+
+
+def _unlink(path: str) -> int:
+    """1 if ``path`` was removed, 0 if it was already gone."""
+    try:
+        os.unlink(path)
+    except OSError:
+        return 0
+    return 1
+
+
+_SHARED: Optional[SharedCache] = None
+_SHARED_URL: Optional[str] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Process-wide backend from ``SHARED_CACHE_URL`` (``None`` when unset).
+
+    An unsupported URL is logged once and leaves the tier disabled.
+    """
+    global _SHARED, _SHARED_URL
+    url = getenv("SHARED_CACHE_URL", "").split("#", 1)[0].strip()
+    if not url:
+        return None
+    with _SHARED_LOCK:
+        if _SHARED_URL != url:
+            _SHARED_URL = url
+            _SHARED = None
+            if url.startswith("file://"):
+                _SHARED = FileSharedCache(url[len("file://"):])
+            else:
+                _LOGGER.error("Unsupported SHARED_CACHE_URL %r (expected file:///path); shared cache disabled", url)
+        return _SHARED
+
+
+def shared_key(kind: str, key: Tuple[Any, ...]) -> str:
+    """Text form of an in-process cache key, e.g. ``ohlcv|bitget|BTC/USDT|1h|<ts>``."""
+    return "|".join([kind, *(str(part) for part in key)])
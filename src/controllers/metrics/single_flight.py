@@ -0,0 +1,119 @@
+"""Per-key in-flight deduplication ("single flight") of expensive calls.
+
+At every candle close the dashboard, the F1 watcher and the MCP clients all
+miss the same market-data key within the same few hundred milliseconds.
+Without coordination each of them issues its own identical exchange call.
+`SingleFlight` lets the first caller for a key run the call while every
+concurrent caller for that key waits for, and shares, its outcome (result or
+exception). Once the call finishes the key is forgotten: the next caller
+runs a fresh call (by then the result normally sits in a cache).
+
+Threaded and asyncio callers share the same in-flight table: the shared
+handle is a `concurrent.futures.Future`, which a thread can block on and a
+coroutine can await through `asyncio.wrap_future`, so a sync request and an
+async one missing the same key at once still produce a single call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Abandoned(Exception):
+    """Set on a call's future when its leader was cancelled or interrupted."""
+
+
+class SingleFlight:
+    """In-flight table mapping a key to the future of its running call."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "Future[Any]"] = {}
+
+    def _join(self, key: Hashable) -> Tuple["Future[Any]", bool]:
+        """Return ``(future, leader)``; the leader must run the call."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: "Future[Any]", result: Any = None, error: Any = None) -> None:
+        """Forget ``key`` first, then publish the outcome to the waiters.
+
+        In that order, a waiter told to retry (`_Abandoned`) joins a fresh
+        call rather than the finished one.
+        """
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run ``fn`` once per concurrent ``key``; returns ``(result, shared)``.
+
+        ``shared`` is True for callers that waited on another caller's call
+        instead of running ``fn`` themselves. A leader that is interrupted
+        (not failed) hands the call over: a waiter runs ``fn`` again instead
+        of inheriting the interruption.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result(), True
+            except _Abandoned:
+                continue
+        try:
+            result = fn()
+        except Exception as exc:
+            self._finish(key, future, error=exc)
+            raise
+        except BaseException:
+            self._finish(key, future, error=_Abandoned())
+            raise
+        self._finish(key, future, result=result)
+        return result, False
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Async counterpart of :meth:`do` (same in-flight table).
+
+        A waiter awaits the call through `asyncio.shield`, so cancelling it
+        (a client disconnect) leaves the shared call, the leader and every
+        other waiter alone.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future)), True
+            except _Abandoned:
+                continue
+        try:
+            result = await fn()
+        except Exception as exc:
+            self._finish(key, future, error=exc)
+            raise
+        except BaseException:
+            self._finish(key, future, error=_Abandoned())
+            raise
+        self._finish(key, future, result=result)
+        return result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,949 @@
+"""Streaming indicators: advance `IndicatorsService` one closed candle at a time.
+
+`IndicatorsService.calculate_all` recomputes every indicator over the whole
+frame, so a live monitor or a backtest stepping candle by candle reprocesses
+~500 bars per step. `StreamingIndicators` keeps the state each indicator
+actually depends on — running averages, sliding windows, the BBWP sorted
+buffers, the Trend Speed wave — and folds one new closed candle into it in
+O(1) (O(log n) for the percentile windows):
+
+    engine = StreamingIndicators()
+    engine.run(history)            # warm up on the frame the batch would see
+    row = engine.update(candle)    # per new closed candle
+    engine.summary()               # == IndicatorsService(frame).calculate_all()
+
+Parity with the batch is exact, not approximate. The building blocks
+replicate, operation for operation, the pandas kernels the batch goes
+through (`Ewm` for ``ewm().mean()``, `RollingMean` / `RollingVar` /
+`RollingSum` with pandas' compensated sums and constant-window shortcuts,
+`RollingExtreme` for ``rolling().max()/min()``) and the pandas-ta formulas
+on top of them. Two batch quirks depend on the WHOLE frame and therefore
+cannot be streamed; both only matter in degenerate data:
+
+* pandas-ta's ``non_zero_range`` (true range, Stoch RSI) adds machine
+  epsilon to every bar when ANY bar of the frame has a zero range; the
+  stream adds it to the zero-range bars only (a 1-ulp difference elsewhere);
+* Konkorde's EMA(255) falls back to a frame-length EWM on frames shorter
+  than 255 bars; the stream stays in warmup (NaN) instead.
+
+Every component has ``snapshot()`` / ``restore()`` returning / accepting
+plain JSON-compatible values, so the engine state can be persisted next to
+the last processed candle and resumed later.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from bisect import bisect_right, insort_right
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bbwp_owner import DEFAULT_BASIS_LEN, DEFAULT_LOOKBACK, DEFAULT_MA_LEN
+from .indicators_service import IndicatorsService
+from .rolling_rank import RollingPercentRank
+from .trend_speed import (
+    _HMA_LEN,
+    _MIN_DYN_LENGTH,
+    _NORM_LEN,
+    _RMA_LEN,
+    DEFAULT_ACCEL_MULTIPLIER,
+    DEFAULT_LOOKBACK_PERIOD,
+    DEFAULT_MAX_LENGTH,
+    _stats,
+    _wma_denominator,
+)
+
+NAN = math.nan
+_EPSILON = sys.float_info.epsilon  # pandas-ta `sflt.epsilon`
+
+
+def _clean(value: Any) -> float:
+    """float64 input as pandas' window functions see it (±inf -> NaN)."""
+    value = float(value)
+    return NAN if math.isinf(value) else value
+
+
+def _div(numerator: float, denominator: float) -> float:
+    """IEEE division (``x/0`` -> ±inf or NaN) like numpy, never raising."""
+    if denominator != 0:
+        return numerator / denominator
+    if numerator == 0 or math.isnan(numerator) or math.isnan(denominator):
+        return NAN
+    return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+
+
+class _State:
+    """``snapshot()`` / ``restore()`` over the attributes named in ``_state``.
+
+    Nested components (anything with ``snapshot``) recurse; deques and
+    lists come back as lists, so a snapshot survives a JSON round trip.
+    """
+
+    _state: Tuple[str, ...] = ()
+
+    def snapshot(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name in self._state:
+            value = getattr(self, name)
+            if hasattr(value, "snapshot"):
+                out[name] = value.snapshot()
+            elif isinstance(value, (deque, list)):
+                out[name] = [list(item) if isinstance(item, tuple) else item for item in value]
+            elif isinstance(value, dict):
+                out[name] = dict(value)
+            else:
+                out[name] = value
+        return out
+
+    def restore(self, state: Mapping[str, Any]) -> None:
+        for name in self._state:
+            current = getattr(self, name)
+            value = state[name]
+            if hasattr(current, "restore"):
+                current.restore(value)
+            elif isinstance(current, deque):
+                setattr(self, name, deque(value, maxlen=current.maxlen))
+            elif isinstance(current, list):
+                setattr(self, name, list(value))
+            elif isinstance(current, dict):
+                setattr(self, name, dict(value))
+            else:
+                setattr(self, name, value)
+
+
+# ----------------------------------------------------------------------
+# pandas kernels
+# ----------------------------------------------------------------------
+class Ewm(_State):
+    """``Series.ewm(com=..., adjust=..., min_periods=...).mean()``, one value at a time."""
+
+    _state = ("_started", "_weighted", "_old_wt", "_nobs")
+
+    def __init__(self, *, com: float, adjust: bool, min_periods: int = 0) -> None:
+        alpha = 1.0 / (1.0 + com)
+        self._factor = 1.0 - alpha
+        self._new_wt = 1.0 if adjust else alpha
+        self._adjust = adjust
+        self._min_periods = max(min_periods, 1)
+        self._started = False
+        self._weighted = NAN
+        self._old_wt = 1.0
+        self._nobs = 0
+
+    @classmethod
+    def from_alpha(cls, alpha: float, *, adjust: bool = True, min_periods: int = 0) -> "Ewm":
+        return cls(com=(1.0 - alpha) / alpha, adjust=adjust, min_periods=min_periods)
+
+    @classmethod
+    def from_span(cls, span: float, *, adjust: bool = True, min_periods: int = 0) -> "Ewm":
+        return cls(com=(span - 1.0) / 2.0, adjust=adjust, min_periods=min_periods)
+
+    def update(self, value: float) -> float:
+        current = _clean(value)
+        observed = not math.isnan(current)
+        if not self._started:
+            self._started = True
+            self._weighted = current
+            self._nobs = int(observed)
+            self._old_wt = 1.0
+        else:
+            self._nobs += observed
+            if not math.isnan(self._weighted):
+                self._old_wt *= self._factor
+                if observed:
+                    if self._weighted != current:
+                        weighted = self._old_wt * self._weighted + self._new_wt * current
+                        self._weighted = weighted / (self._old_wt + self._new_wt)
+                    self._old_wt = self._old_wt + self._new_wt if self._adjust else 1.0
+            elif observed:
+                self._weighted = current
+        return self._weighted if self._nobs >= self._min_periods else NAN
+
+
+class _Rolling(_State):
+    """Fixed trailing window fed one value at a time (pandas ``rolling``)."""
+
+    _state = ("_values",)
+
+    def __init__(self, window: int, min_periods: Optional[int] = None) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values: Deque[float] = deque()
+        self._reset()
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+    def _add(self, value: float) -> None:
+        raise NotImplementedError
+
+    def _remove(self, value: float) -> None:
+        raise NotImplementedError
+
+    def _result(self) -> float:
+        raise NotImplementedError
+
+    def update(self, value: float) -> float:
+        current = _clean(value)
+        self._values.append(current)
+        if len(self._values) > self.window:
+            evicted = self._values.popleft()
+            if self.window == 1:
+                self._reset()  # pandas re-seeds a window disjoint from the previous one
+            else:
+                self._remove(evicted)
+        self._add(current)
+        return self._result()
+
+
+class RollingMean(_Rolling):
+    """``rolling(window, min_periods).mean()`` — pandas' Kahan-compensated sum."""
+
+    _state = _Rolling._state + ("_nobs", "_sum", "_neg", "_comp_add", "_comp_remove", "_same", "_prev")
+
+    def _reset(self) -> None:
+        self._nobs = 0
+        self._sum = 0.0
+        self._neg = 0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same = 0
+        self._prev = NAN
+
+    def _add(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self._nobs += 1
+        y = value - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg += 1
+        self._same = self._same + 1 if value == self._prev else 1
+        self._prev = value
+
+    def _remove(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self._nobs -= 1
+        y = -value - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg -= 1
+
+    def _result(self) -> float:
+        if self._nobs < max(self.min_periods, 1):
+            return NAN
+        if self._same >= self._nobs:
+            return self._prev
+        result = self._sum / self._nobs
+        if (self._neg == 0 and result < 0) or (self._neg == self._nobs and result > 0):
+            return 0.0
+        return result
+
+
+class RollingSum(RollingMean):
+    """``rolling(window, min_periods).sum()``."""
+
+    def _result(self) -> float:
+        if self._nobs == 0 == self.min_periods:
+            return 0.0
+        if self._nobs < self.min_periods:
+            return NAN
+        if self._same >= self._nobs:
+            return self._prev * self._nobs
+        return self._sum
+
+
+class RollingVar(_Rolling):
+    """``rolling(window, min_periods).var(ddof)`` — pandas' compensated Welford."""
+
+    _state = _Rolling._state + ("_nobs", "_mean", "_ssqdm", "_comp_add", "_comp_remove", "_same", "_prev")
+
+    def __init__(self, window: int, *, ddof: int = 1, min_periods: Optional[int] = None) -> None:
+        self.ddof = ddof
+        super().__init__(window, min_periods)
+
+    def _reset(self) -> None:
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same = 0
+        self._prev = NAN
+
+    def _add(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self._same = self._same + 1 if value == self._prev else 1
+        self._prev = value
+        self._nobs += 1
+        prev_mean = self._mean - self._comp_add
+        y = value - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean += t / self._nobs
+        self._ssqdm += (value - prev_mean) * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self._nobs -= 1
+        if not self._nobs:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+            return
+        prev_mean = self._mean - self._comp_remove
+        y = value - self._comp_remove
+        t = y - self._mean
+        self._comp_remove = t + self._mean - y
+        self._mean -= t / self._nobs
+        self._ssqdm -= (value - prev_mean) * (value - self._mean)
+
+    def _result(self) -> float:
+        if self._nobs < max(self.min_periods, 1) or self._nobs <= self.ddof:
+            return NAN
+        if self._nobs == 1 or self._same >= self._nobs:
+            return 0.0
+        return max(self._ssqdm / (self._nobs - self.ddof), 0.0)
+
+
+class RollingStd(RollingVar):
+    """``rolling(window, min_periods).std(ddof)``."""
+
+    def _result(self) -> float:
+        return math.sqrt(super()._result())
+
+
+class RollingExtreme(_State):
+    """``rolling(window, min_periods).max()`` (or ``.min()``): monotonic deque."""
+
+    _state = ("_index", "_flags", "_nobs", "_candidates")
+
+    def __init__(self, window: int, *, kind: str = "max", min_periods: Optional[int] = None) -> None:
+        if kind not in ("max", "min"):
+            raise ValueError("kind must be 'max' or 'min'")
+        self.window = window
+        self.min_periods = max(window if min_periods is None else min_periods, 1)
+        self._sign = 1.0 if kind == "max" else -1.0
+        self._index = -1
+        self._flags: Deque[bool] = deque()  # observed? per bar in the window
+        self._nobs = 0
+        self._candidates: Deque[Tuple[int, float]] = deque()
+
+    def update(self, value: float) -> float:
+        current = _clean(value)
+        self._index += 1
+        observed = not math.isnan(current)
+        self._flags.append(observed)
+        self._nobs += observed
+        if len(self._flags) > self.window:
+            self._nobs -= self._flags.popleft()
+        while self._candidates and self._candidates[0][0] <= self._index - self.window:
+            self._candidates.popleft()
+        if observed:
+            keyed = self._sign * current
+            while self._candidates and self._sign * self._candidates[-1][1] <= keyed:
+                self._candidates.pop()
+            self._candidates.append((self._index, current))
+        if self._nobs < self.min_periods:
+            return NAN
+        return self._candidates[0][1]
+
+
+# ----------------------------------------------------------------------
+# pandas-ta building blocks
+# ----------------------------------------------------------------------
+class Rma(Ewm):
+    """pandas-ta ``rma``: Wilder smoothing, ``ewm(alpha=1/length, min_periods=length)``."""
+
+    def __init__(self, length: int) -> None:
+        alpha = 1.0 / length
+        super().__init__(com=(1.0 - alpha) / alpha, adjust=True, min_periods=length)
+
+
+class Ema(_State):
+    """pandas-ta ``ema``: SMA of the first ``length`` values as seed, then ``adjust=False``."""
+
+    _state = ("_seed", "_ewm")
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self._seed: List[float] = []
+        self._ewm = Ewm.from_span(length, adjust=False)
+
+    def update(self, value: float) -> float:
+        current = float(value)
+        if len(self._seed) < self.length:
+            self._seed.append(current)
+            if len(self._seed) < self.length:
+                return self._ewm.update(NAN)
+            current = float(pd.Series(self._seed, dtype="float64").mean())
+        return self._ewm.update(current)
+
+
+class Rsi(_State):
+    """pandas-ta ``rsi``: ``100 * RMA(gains) / (RMA(gains) + |RMA(losses)|)``."""
+
+    _state = ("_prev", "_gains", "_losses")
+
+    def __init__(self, length: int = 14) -> None:
+        self._prev = NAN
+        self._gains = Rma(length)
+        self._losses = Rma(length)
+
+    def update(self, close: float) -> float:
+        diff = close - self._prev
+        self._prev = close
+        gain = self._gains.update(diff if math.isnan(diff) or diff >= 0 else 0.0)
+        loss = self._losses.update(diff if math.isnan(diff) or diff <= 0 else 0.0)
+        return _div(100.0 * gain, gain + abs(loss))
+
+
+class TrueRange(_State):
+    """pandas-ta ``true_range`` (drift 1): NaN on the first bar."""
+
+    _state = ("_prev_close",)
+
+    def __init__(self) -> None:
+        self._prev_close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close, self._prev_close = self._prev_close, close
+        if math.isnan(prev_close):
+            return NAN
+        high_low = high - low
+        if high_low == 0:
+            high_low += _EPSILON  # `non_zero_range`, per bar (see module doc)
+        return max(abs(high_low), abs(high - prev_close), abs(prev_close - low))
+
+
+class Adx(_State):
+    """pandas-ta ``adx`` + ``atr`` (Wilder, length 14): ``(adx, +DI, -DI, atr)``."""
+
+    _state = ("_true_range", "_atr", "_prev_high", "_prev_low", "_plus", "_minus", "_adx")
+
+    def __init__(self, length: int = 14) -> None:
+        self._true_range = TrueRange()
+        self._atr = Rma(length)
+        self._prev_high = NAN
+        self._prev_low = NAN
+        self._plus = Rma(length)
+        self._minus = Rma(length)
+        self._adx = Rma(length)
+
+    @staticmethod
+    def _directional(move: float, other: float) -> float:
+        # `((up > dn) & (up > 0)) * up` then `zero()`; NaN stays NaN.
+        if math.isnan(move):
+            return NAN
+        if move > other and move > 0 and abs(move) >= _EPSILON:
+            return move
+        return 0.0
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float, float]:
+        atr = self._atr.update(self._true_range.update(high, low, close))
+        up = high - self._prev_high
+        down = self._prev_low - low
+        self._prev_high, self._prev_low = high, low
+        k = _div(100.0, atr)
+        plus = k * self._plus.update(self._directional(up, down))
+        minus = k * self._minus.update(self._directional(down, up))
+        dx = _div(100.0 * abs(plus - minus), plus + minus)
+        return self._adx.update(dx), plus, minus, atr
+
+
+class Macd(_State):
+    """pandas-ta ``macd(12, 26, 9)``: ``(macd, signal, histogram)``."""
+
+    _state = ("_fast", "_slow", "_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self._fast = Ema(fast)
+        self._slow = Ema(slow)
+        self._signal = Ema(signal)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        macd = self._fast.update(close) - self._slow.update(close)
+        if math.isnan(macd):
+            return NAN, NAN, NAN
+        # The signal EMA starts at the first valid MACD value.
+        signal = self._signal.update(macd)
+        return macd, signal, macd - signal
+
+
+class StochRsi(_State):
+    """pandas-ta ``stochrsi(14, 14, 3, 3)`` over an RSI stream: ``(k, d)``."""
+
+    _state = ("_lowest", "_highest", "_k", "_d")
+
+    def __init__(self, length: int = 14, k: int = 3, d: int = 3) -> None:
+        self._lowest = RollingExtreme(length, kind="min")
+        self._highest = RollingExtreme(length, kind="max")
+        self._k = RollingMean(k)
+        self._d = RollingMean(d)
+
+    def update(self, rsi: float) -> Tuple[float, float]:
+        lowest = self._lowest.update(rsi)
+        highest = self._highest.update(rsi)
+        spread = highest - lowest
+        if spread == 0:
+            spread += _EPSILON  # `non_zero_range`, per bar (see module doc)
+        stoch = _div(100.0 * (rsi - lowest), spread)
+        k = self._k.update(stoch)
+        return k, self._d.update(k)
+
+
+class AwesomeOscillator(_State):
+    """pandas-ta ``ao(5, 34)`` plus the Pine colour reading: ``(ao, diff, colour)``."""
+
+    _state = ("_fast", "_slow", "_prev")
+
+    def __init__(self, fast: int = 5, slow: int = 34) -> None:
+        self._fast = RollingMean(fast)
+        self._slow = RollingMean(slow)
+        self._prev = NAN
+
+    def update(self, high: float, low: float) -> Tuple[float, float, Optional[str]]:
+        median = 0.5 * (high + low)
+        ao = self._fast.update(median) - self._slow.update(median)
+        diff = ao - self._prev
+        self._prev = ao
+        if math.isnan(diff):
+            return ao, diff, None
+        return ao, diff, "green" if diff > 0 else "red"
+
+
+class BollingerWidthPercentile(_State):
+    """Legacy BBWP (`IndicatorsService._calc_bbwp`): ``(bbw, bbwp, bbwp_ma4)``."""
+
+    _state = ("_mid", "_std", "_rank", "_ma")
+
+    def __init__(self, lookback: int = 252, length: int = 20) -> None:
+        self._mid = RollingMean(length)
+        self._std = RollingStd(length, ddof=0)
+        self._rank = RollingPercentRank(lookback, min_periods=1)
+        self._ma = RollingMean(4)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        mid = self._mid.update(close)
+        deviations = 2.0 * self._std.update(close)
+        bbw = _div((mid + deviations) - (mid - deviations), mid) * 100
+        bbwp = self._rank.update(bbw) * 100
+        return bbw, bbwp, self._ma.update(bbwp)
+
+
+class OwnerBbwp(_State):
+    """Streaming `bbwp_owner.bbwp_owner_series`: ``(bbw, bbwp, bbwp_ma)``."""
+
+    _state = ("_bars", "_basis", "_stdev", "_raw", "_sorted", "_ma")
+
+    def __init__(
+        self,
+        *,
+        basis_len: int = DEFAULT_BASIS_LEN,
+        lookback: int = DEFAULT_LOOKBACK,
+        ma_len: int = DEFAULT_MA_LEN,
+    ) -> None:
+        if basis_len < 1 or lookback < 1 or ma_len < 1:
+            raise ValueError("basis_len, lookback and ma_len must be >= 1")
+        self.basis_len = basis_len
+        self.lookback = lookback
+        self._bars = 0
+        self._basis = RollingMean(basis_len)
+        self._stdev = RollingStd(basis_len, ddof=0)
+        self._raw: Deque[float] = deque()
+        self._sorted: List[float] = []
+        self._ma = RollingMean(ma_len)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        bar = self._bars
+        self._bars += 1
+        bbw = _div(2.0 * self._stdev.update(close), self._basis.update(close))
+        bbwp = NAN
+        if bar >= self.basis_len and not math.isnan(bbw):
+            if self._sorted:
+                bbwp = bisect_right(self._sorted, bbw) * 100.0 / len(self._sorted)
+            self._raw.append(bbw)
+            insort_right(self._sorted, bbw)
+            if len(self._raw) > self.lookback:
+                oldest = self._raw.popleft()
+                del self._sorted[bisect_right(self._sorted, oldest) - 1]
+        return bbw, bbwp, self._ma.update(bbwp)
+
+
+class Konkorde(_State):
+    """Konkorde by Blai5 (`IndicatorsService._calc_konkorde`): ``(azul, verde, marron)``.
+
+    Takes the engine's RSI(14) instead of recomputing it.
+    """
+
+    _state = (
+        "_prev_close", "_prev_volume", "_pvi", "_nvi", "_ema_pvi", "_ema_nvi",
+        "_max_p", "_min_p", "_max_n", "_min_n", "_prev_typical", "_positive_flow",
+        "_negative_flow", "_sma25", "_std25",
+    )
+
+    def __init__(self) -> None:
+        self._prev_close = NAN
+        self._prev_volume = NAN
+        self._pvi = 1.0  # running products of the PVI / NVI factors
+        self._nvi = 1.0
+        self._ema_pvi = Ema(255)
+        self._ema_nvi = Ema(255)
+        self._max_p = RollingExtreme(90, kind="max", min_periods=1)
+        self._min_p = RollingExtreme(90, kind="min", min_periods=1)
+        self._max_n = RollingExtreme(90, kind="max", min_periods=1)
+        self._min_n = RollingExtreme(90, kind="min", min_periods=1)
+        self._prev_typical = NAN
+        self._positive_flow = RollingSum(14)
+        self._negative_flow = RollingSum(14)
+        self._sma25 = RollingMean(25)
+        self._std25 = RollingStd(25, ddof=0)
+
+    @staticmethod
+    def _oscillator(value: float, ema: float, highest: float, lowest: float) -> float:
+        span = highest - lowest
+        if span == 0:
+            return NAN
+        return _div((value - ema) * 100.0, span)
+
+    def update(
+        self, open_: float, high: float, low: float, close: float, volume: float, rsi: float
+    ) -> Tuple[float, float, float]:
+        tprice = (open_ + high + low + close) / 4.0
+
+        # `(close - prev_close) / prev_close.replace(0, nan)` then `fillna(0)`.
+        change = NAN if self._prev_close == 0 else (close - self._prev_close) / self._prev_close
+        change = 0.0 if math.isnan(change) else change
+        if volume > self._prev_volume:
+            self._pvi *= 1.0 + change
+        if volume < self._prev_volume:
+            self._nvi *= 1.0 + change
+        self._prev_close, self._prev_volume = close, volume
+        pvi = self._pvi * 1000.0
+        nvi = self._nvi * 1000.0
+        ema_pvi = self._ema_pvi.update(pvi)
+        ema_nvi = self._ema_nvi.update(nvi)
+        osc_p = self._oscillator(pvi, ema_pvi, self._max_p.update(ema_pvi), self._min_p.update(ema_pvi))
+        osc_n = self._oscillator(nvi, ema_nvi, self._max_n.update(ema_nvi), self._min_n.update(ema_nvi))
+
+        # pandas-ta mfi(high=low=close=tprice): typical price, raw money flow.
+        typical = (tprice + tprice + tprice) / 3.0
+        money_flow = typical * volume
+        direction = typical - self._prev_typical
+        self._prev_typical = typical
+        positive = self._positive_flow.update(money_flow if direction > 0 else 0.0)
+        negative = self._negative_flow.update(money_flow if direction < 0 else 0.0)
+        mfi = _div(100 * positive, positive + negative)
+
+        std25 = self._std25.update(tprice)
+        b1 = _div(tprice - self._sma25.update(tprice), 2 * (NAN if std25 == 0 else std25)) * 100.0
+
+        rsi_centered = rsi - 50.0
+        mfi_centered = mfi - 50.0
+        azul = osc_p
+        verde = (mfi_centered + b1 + osc_p) / 3.0
+        marron = (rsi_centered + mfi_centered + b1 + osc_p - osc_n) / 4.0
+        return azul, verde, marron
+
+
+class _Wma(_State):
+    """`trend_speed.pine_wma` over the last ``length`` values (na-strict)."""
+
+    _state = ("_window",)
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self._window: Deque[float] = deque(maxlen=length)
+        self._denominator = _wma_denominator(length)
+
+    def update(self, value: float) -> float:
+        self._window.append(value)
+        if len(self._window) < self.length:
+            return NAN
+        # Newest value first, as `pine_wma` sums (a na propagates).
+        total = self.length * self._window[-1]
+        for lag in range(1, self.length):
+            total = total + (self.length - lag) * self._window[-1 - lag]
+        return total / self._denominator
+
+
+class _PineRma(_State):
+    """`trend_speed.pine_rma`: SMA seed of the first ``length`` values, then Wilder."""
+
+    _state = ("_seed", "_value")
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self._alpha = 1.0 / length
+        self._seed: List[float] = []
+        self._value = NAN
+
+    def update(self, value: float) -> float:
+        if len(self._seed) < self.length:
+            self._seed.append(value)
+            if len(self._seed) == self.length:
+                self._value = float(np.mean(np.array(self._seed, dtype="float64")))
+            return self._value
+        self._value = self._alpha * value + (1.0 - self._alpha) * self._value
+        return self._value
+
+
+class TrendSpeed(_State):
+    """Streaming `trend_speed.trend_speed_analyzer`: ``(dyn_ema, speed, trend_speed, wave_dir)``.
+
+    The wave extremes come from running max / min over the current wave
+    (the batch kernel reduces each wave's range once, see `_waves`).
+    """
+
+    _state = (
+        "_bar", "_prev_close", "_max_abs", "_max_delta", "_close_rma", "_open_rma", "_dyn_ema",
+        "_x1", "_pos", "_speed", "_wave_high", "_wave_low", "_wave_nan", "_wave_bars",
+        "_half", "_full", "_hull", "_bullish_change", "_bearish_change", "_bullish_t", "_bearish_t",
+    )
+
+    def __init__(
+        self,
+        *,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        accel_multiplier: float = DEFAULT_ACCEL_MULTIPLIER,
+        lookback_period: int = DEFAULT_LOOKBACK_PERIOD,
+    ) -> None:
+        self.max_length = max_length
+        self.accel_multiplier = accel_multiplier
+        self._bar = -1
+        self._prev_close = NAN
+        self._max_abs = RollingExtreme(_NORM_LEN, kind="max")
+        self._max_delta = RollingExtreme(_NORM_LEN, kind="max")
+        self._close_rma = _PineRma(_RMA_LEN)
+        self._open_rma = _PineRma(_RMA_LEN)
+        self._dyn_ema = NAN
+        self._x1 = 0
+        self._pos = 0
+        self._speed = 0.0
+        # Speeds of the bars after the current wave's first bar: running
+        # extremes and whether any of them is na.
+        self._wave_high = -math.inf
+        self._wave_low = math.inf
+        self._wave_nan = False
+        self._wave_bars = 0
+        self._half = _Wma(max(1, _HMA_LEN // 2))
+        self._full = _Wma(_HMA_LEN)
+        self._hull = _Wma(max(1, round(math.sqrt(_HMA_LEN))))
+        self._bullish_change: Deque[float] = deque(maxlen=lookback_period)
+        self._bearish_change: Deque[float] = deque(maxlen=lookback_period)
+        self._bullish_t: Deque[int] = deque(maxlen=lookback_period)
+        self._bearish_t: Deque[int] = deque(maxlen=lookback_period)
+
+    def _alpha(self, close: float) -> float:
+        max_abs = self._max_abs.update(abs(close))
+        norm = _div(close + max_abs, 2.0 * max_abs)
+        dyn_length = _MIN_DYN_LENGTH + norm * (self.max_length - _MIN_DYN_LENGTH)
+        previous = 0.0 if self._bar == 0 else self._prev_close  # nz(close[1])
+        delta = abs(close - previous)
+        max_delta = self._max_delta.update(delta)
+        max_delta = 1.0 if max_delta == 0.0 else max_delta
+        alpha = (2.0 / (dyn_length + 1.0)) * (1.0 + _div(delta, max_delta) * self.accel_multiplier)
+        return alpha if math.isnan(alpha) else min(1.0, alpha)
+
+    def _wave_extreme(self, kind: str) -> float:
+        """Pine ``highest/lowest(speed, bar_index - x1)`` before ``speed`` updates."""
+        if self._wave_bars == 0:
+            return self._speed  # window of one: the previous bar's speed
+        if self._wave_nan:
+            return NAN
+        return self._wave_high if kind == "highest" else self._wave_low
+
+    def update(self, open_: float, close: float) -> Tuple[float, float, float, int]:
+        self._bar += 1
+        i = self._bar
+        alpha = self._alpha(close)
+        if i == 0 or math.isnan(self._dyn_ema):
+            dyn_ema = close
+        else:
+            dyn_ema = alpha * close + (1.0 - alpha) * self._dyn_ema
+        crossed_up = i >= 1 and close > dyn_ema and self._prev_close <= dyn_ema
+        crossed_down = i >= 1 and close < dyn_ema and self._prev_close >= dyn_ema
+        bar_delta = self._close_rma.update(close) - self._open_rma.update(open_)
+
+        if crossed_up:
+            self._bearish_change.appendleft(self._wave_extreme("lowest"))
+            self._bearish_t.appendleft(i - self._x1)
+            self._x1, self._pos, self._speed = i, 1, bar_delta
+        elif crossed_down:
+            self._bullish_change.appendleft(self._wave_extreme("highest"))
+            self._bullish_t.appendleft(i - self._x1)
+            self._x1, self._pos, self._speed = i, -1, bar_delta
+        else:
+            self._speed = self._speed + bar_delta
+
+        if i == self._x1:
+            self._wave_high, self._wave_low, self._wave_nan, self._wave_bars = -math.inf, math.inf, False, 0
+        else:
+            self._wave_bars += 1
+            if math.isnan(self._speed):
+                self._wave_nan = True
+            else:
+                self._wave_high = max(self._wave_high, self._speed)
+                self._wave_low = min(self._wave_low, self._speed)
+
+        self._dyn_ema = dyn_ema
+        self._prev_close = close
+        half = self._half.update(self._speed)
+        full = self._full.update(self._speed)
+        trend_speed = self._hull.update(2.0 * half - full)
+        return dyn_ema, self._speed, trend_speed, self._pos
+
+    def stats(self) -> Dict[str, Any]:
+        """The wave-table stats (`TrendSpeedResult.stats`)."""
+        return _stats(
+            speed=self._speed if self._bar >= 0 else NAN,
+            bullish_change=list(self._bullish_change),
+            bearish_change=list(self._bearish_change),
+            bullish_t=list(self._bullish_t),
+            bearish_t=list(self._bearish_t),
+        )
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+# Result keys reported as the last non-NaN value of their column.
+_LAST_VALID = {
+    "rsi14": "rsi14", "adx14": "adx14", "plus_di": "plus_di", "minus_di": "minus_di",
+    "bbw": "bbw", "bbwp": "bbwp", "bbwp_ma4": "bbwp_ma4",
+    "bbwp_owner": "bbwp_owner", "bbwp_owner_ma5": "bbwp_owner_ma5",
+    "ao": "ao", "ao_diff": "ao_diff",
+    "sma50": "sma50", "ema50": "ema50", "sma200": "sma200", "ema200": "ema200",
+    "konkorde_azul": "konkorde_azul", "konkorde_verde": "konkorde_verde", "konkorde_marron": "konkorde_marron",
+    "macd": "macd", "macd_signal": "macd_signal", "macd_histogram": "macd_histogram",
+    "stoch_rsi_k": "stoch_rsi_k", "stoch_rsi_d": "stoch_rsi_d",
+    "atr": "atr14", "volatility_20": "volatility_20",
+    "trend_speed": "tsa_trend_speed", "trend_speed_raw": "tsa_speed", "trend_speed_dyn_ema": "tsa_dyn_ema",
+}
+
+
+class StreamingIndicators(_State):
+    """Every `IndicatorsService.calculate_all` indicator, one closed candle at a time."""
+
+    _state = (
+        "_rsi", "_adx", "_macd", "_stoch", "_ao", "_bbwp", "_owner", "_konkorde", "_trend_speed",
+        "_sma50", "_ema50", "_sma200", "_ema200", "_prev_close", "_volatility", "_last", "_ao_diffs", "_bars",
+    )
+
+    def __init__(self, *, bbwp_lookback: int = 252) -> None:
+        self._rsi = Rsi(14)
+        self._adx = Adx(14)
+        self._macd = Macd()
+        self._stoch = StochRsi()
+        self._ao = AwesomeOscillator()
+        self._bbwp = BollingerWidthPercentile(bbwp_lookback)
+        self._owner = OwnerBbwp()
+        self._konkorde = Konkorde()
+        self._trend_speed = TrendSpeed()
+        self._sma50 = RollingMean(50)
+        self._ema50 = Ema(50)
+        self._sma200 = RollingMean(200)
+        self._ema200 = Ema(200)
+        self._prev_close = NAN
+        self._volatility = RollingStd(20, ddof=1)
+        self._last: Dict[str, float] = {}  # last non-NaN value per column
+        self._ao_diffs: Deque[float] = deque(maxlen=2)  # last two non-NaN AO diffs
+        self._bars = 0
+
+    @property
+    def bars(self) -> int:
+        """Candles folded in so far."""
+        return self._bars
+
+    def update(self, candle: Mapping[str, Any]) -> Dict[str, Any]:
+        """Fold one closed candle (``open/high/low/close/volume``) in; its indicator row."""
+        open_, high, low = float(candle["open"]), float(candle["high"]), float(candle["low"])
+        close, volume = float(candle["close"]), float(candle["volume"])
+
+        rsi = self._rsi.update(close)
+        adx, plus_di, minus_di, atr = self._adx.update(high, low, close)
+        macd, macd_signal, macd_histogram = self._macd.update(close)
+        stoch_k, stoch_d = self._stoch.update(rsi)
+        ao, ao_diff, ao_color = self._ao.update(high, low)
+        bbw, bbwp, bbwp_ma4 = self._bbwp.update(close)
+        _, bbwp_owner, bbwp_owner_ma5 = self._owner.update(close)
+        azul, verde, marron = self._konkorde.update(open_, high, low, close, volume, rsi)
+        dyn_ema, speed, trend_speed, wave_dir = self._trend_speed.update(open_, close)
+        returns = close / self._prev_close - 1 if self._prev_close else NAN
+        self._prev_close = close
+
+        row = {
+            "rsi14": rsi,
+            "adx14": adx,
+            "plus_di": plus_di,
+            "minus_di": minus_di,
+            "bbw": bbw,
+            "bbwp": bbwp,
+            "bbwp_ma4": bbwp_ma4,
+            "bbwp_owner": bbwp_owner,
+            "bbwp_owner_ma5": bbwp_owner_ma5,
+            "ao": ao,
+            "ao_diff": ao_diff,
+            "ao_color": ao_color,
+            "sma50": self._sma50.update(close),
+            "ema50": self._ema50.update(close),
+            "sma200": self._sma200.update(close),
+            "ema200": self._ema200.update(close),
+            "konkorde_azul": azul,
+            "konkorde_verde": verde,
+            "konkorde_marron": marron,
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd_histogram,
+            "stoch_rsi_k": stoch_k,
+            "stoch_rsi_d": stoch_d,
+            "atr14": atr,
+            "volatility_20": self._volatility.update(returns) * 100,
+            "tsa_dyn_ema": dyn_ema,
+            "tsa_speed": speed,
+            "tsa_trend_speed": trend_speed,
+            "tsa_wave_dir": wave_dir,
+        }
+        for column in _LAST_VALID.values():
+            value = row[column]
+            if not math.isnan(value):
+                self._last[column] = value
+        if not math.isnan(ao_diff):
+            self._ao_diffs.append(ao_diff)
+        self._bars += 1
+        return row
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fold every row of an OHLCV frame in; the indicator rows, aligned to ``df``."""
+        columns = [df[name].to_numpy(dtype="float64") for name in ("open", "high", "low", "close", "volume")]
+        rows = [
+            self.update({"open": o, "high": h, "low": lo, "close": c, "volume": v})
+            for o, h, lo, c, v in zip(*columns)
+        ]
+        return pd.DataFrame(rows, index=df.index)
+
+    def summary(self) -> Dict[str, Any]:
+        """The dict `IndicatorsService.calculate_all` returns for the candles so far."""
+        result: Dict[str, Any] = {key: float(self._last.get(column, 0.0)) for key, column in _LAST_VALID.items()}
+        result["ao_color"] = None
+        if self._ao_diffs:
+            result["ao_color"] = "green" if self._ao_diffs[-1] > 0 else "red"
+        result["ao_color_change"] = IndicatorsService._ao_color_change(pd.Series(list(self._ao_diffs), dtype="float64"))
+        result["konkorde_value"] = result["konkorde_marron"]
+        result["konkorde_signal"] = IndicatorsService._classify_konkorde(
+            result["konkorde_azul"], result["konkorde_verde"], result["konkorde_marron"]
+        )
+        result["trend_speed_stats"] = self._trend_speed.stats()
+        return result
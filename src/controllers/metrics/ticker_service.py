@@ -2,40 +2,182 @@
 
 The OHLCV `TTLCache` TTL is half a timeframe (up to 30 min on 1h bars), which
 made the "current price" derived from `charts` stale by up to 30 minutes. This
-service calls `fetch_ticker` directly (a separate ccxt endpoint) behind its own
-tiny TTL (<=10s) so bursts don't hit exchange rate limits. Handles perp symbols
-(`:USDT`) exactly like the OHLCV path (same exchange client config).
+service calls the ticker endpoints directly behind its own tiny TTL (<=10s)
+so bursts don't hit exchange rate limits. Handles perp symbols (`:USDT`)
+exactly like the OHLCV path (same pooled exchange client, see
+`exchange_clients`).
+
+The dashboard polls 30+ tickers every few seconds, one request per symbol.
+Two things keep that to a handful of exchange calls:
+
+* `fetch_many` (``/v1/ticker/batch``) serves a whole watchlist with one
+  ``fetch_tickers`` call for the symbols not in the cache;
+* single-symbol misses arriving within ``TICKER_BATCH_WINDOW_MS`` of each
+  other (default 5 ms, ``0`` disables) are merged by `_TickerBatcher` into one
+  ``fetch_tickers`` call as well — the first caller waits the window,
+  collects every symbol asked for meanwhile and fetches them together.
+
+The cache is an `InstrumentedTTLCache` bounded at ``TICKER_CACHE_MAXSIZE``
+symbols (default 1024), reported as ``ticker`` in ``/v1/cache/stats``.
 """
 
 from __future__ import annotations
 
+import asyncio
+import sys
 import threading
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import Future
+from os import getenv
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
+from .cache_stats import NO_TIMEFRAME, STATS, InstrumentedTTLCache
+from .call_accounting import call_service
+from .exchange_clients import get_exchange
 from .market_data_service import DEFAULT_EXCHANGE, MarketDataService
 
 _TTL_SECONDS = 5.0
-_CACHE: Dict[Any, Any] = {}
-_CLIENTS: Dict[str, Any] = {}
+_MAX_BATCH_SYMBOLS = 100
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(getenv(name, str(default)).split("#", 1)[0].strip())
+    except ValueError:
+        return default
+
+
+_BATCH_WINDOW_S = max(0.0, _env_float("TICKER_BATCH_WINDOW_MS", 5.0)) / 1000.0
+_CACHE: "InstrumentedTTLCache" = InstrumentedTTLCache(
+    maxsize=max(1, int(_env_float("TICKER_CACHE_MAXSIZE", 1024))),
+    ttl=_TTL_SECONDS,
+    name="ticker",
+    timeframe=NO_TIMEFRAME,
+)
 _LOCK = threading.Lock()
 
 
 def _shared_exchange(name: str):
-    if name not in _CLIENTS:
-        if name not in MarketDataService.SUPPORTED_EXCHANGES:
-            raise ValueError(f"Exchange no soportado: {name}")
-        _CLIENTS[name] = MarketDataService.SUPPORTED_EXCHANGES[name]({
-            "enableRateLimit": True,
-            "options": {"defaultType": "spot"},
-        })
-    return _CLIENTS[name]
+    if name not in MarketDataService.SUPPORTED_EXCHANGES:
+        raise ValueError(f"Exchange no soportado: {name}")
+    # Same process-wide pool as the OHLCV path (shared markets + throttle).
+    return get_exchange(name, MarketDataService.SUPPORTED_EXCHANGES[name])
 
 
 def _num(value: Any) -> Optional[float]:
     return float(value) if isinstance(value, (int, float)) else None
 
 
+class _TickerBatcher:
+    """Merges concurrent single-ticker misses into one ``fetch_tickers`` call.
+
+    Batches are keyed by ``key`` (exchange + client), one open batch per key:
+    the caller that opens it waits ``window_s``, closes it and runs ``fetch``
+    for every symbol collected; everyone else just waits for its result.
+    Threads and coroutines get separate batches (``submit`` /
+    ``submit_async``), each coroutine batch being bound to its event loop.
+    """
+
+    def __init__(self, window_s: float) -> None:
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self._open: Dict[Any, Dict[str, Future]] = {}
+        self._open_async: Dict[Any, Dict[str, "asyncio.Future[Dict[str, Any]]"]] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def submit(self, key: Any, symbol: str, fetch: Callable[[List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = {}
+            future = batch.get(symbol)
+            if future is None:
+                future = batch[symbol] = Future()
+        if leader:
+            time.sleep(self.window_s)
+            with self._lock:
+                del self._open[key]
+            _settle(batch, fetch)
+        return future.result()
+
+    async def submit_async(
+        self, key: Any, symbol: str, fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        with self._lock:
+            batch = self._open_async.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open_async[key] = {}
+            future = batch.get(symbol)
+            if future is None:
+                future = batch[symbol] = loop.create_future()
+        if leader:
+            # A task of its own: a cancelled leader must not strand the batch.
+            task = loop.create_task(self._close_async(key, batch, fetch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        # Shielded: waiters on the same symbol share one future.
+        return await asyncio.shield(future)
+
+    async def _close_async(
+        self,
+        key: Any,
+        batch: Dict[str, "asyncio.Future[Dict[str, Any]]"],
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+    ) -> None:
+        await asyncio.sleep(self.window_s)
+        with self._lock:
+            del self._open_async[key]
+        await _settle_async(batch, fetch)
+
+
+def _settle(batch: Dict[str, Future], fetch: Callable[[List[str]], Dict[str, Any]]) -> None:
+    try:
+        tickers: Any = fetch(list(batch))
+    except Exception as exc:
+        if len(batch) == 1:
+            tickers = exc
+        else:
+            # One bad symbol must not fail the requests it was merged with.
+            for name, pending in batch.items():
+                _settle({name: pending}, fetch)
+            return
+    for name, pending in batch.items():
+        _resolve(pending, name, tickers)
+
+
+async def _settle_async(
+    batch: Dict[str, "asyncio.Future[Dict[str, Any]]"], fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]]
+) -> None:
+    """Async :func:`_settle`."""
+    try:
+        tickers: Any = await fetch(list(batch))
+    except Exception as exc:
+        if len(batch) == 1:
+            tickers = exc
+        else:
+            for name, pending in batch.items():
+                await _settle_async({name: pending}, fetch)
+            return
+    for name, pending in batch.items():
+        _resolve(pending, name, tickers)
+
+
+def _resolve(future: Any, symbol: str, tickers: Any) -> None:
+    if future.done():
+        return
+    if isinstance(tickers, BaseException):
+        future.set_exception(tickers)
+    else:
+        future.set_result(tickers[symbol])
+
+
+_BATCHER = _TickerBatcher(_BATCH_WINDOW_S)
+
+
 class TickerService:
     def __init__(self, *, exchange: str = DEFAULT_EXCHANGE, client: Any = None):
         self.exchange_name = exchange.lower()
@@ -44,27 +186,133 @@ class TickerService:
     def _exchange(self):
         return self._client if self._client is not None else _shared_exchange(self.exchange_name)
 
+    def _batch_key(self) -> Tuple[str, int]:
+        return self.exchange_name, id(self._client)
+
     def fetch(self, symbol: str) -> Dict[str, Any]:
-        key = (self.exchange_name, symbol)
-        now = time.time()
+        cached = self._cached(symbol)
+        if cached is not None:
+            return cached
+        if _BATCHER.window_s > 0:
+            return _BATCHER.submit(self._batch_key(), symbol, self._fetch_batch)
+        return self._fetch_batch([symbol])[symbol]
+
+    async def fetch_async(self, symbol: str) -> Dict[str, Any]:
+        """Awaitable `fetch` (native asyncio client unless a client was injected)."""
+        cached = self._cached(symbol)
+        if cached is not None:
+            return cached
+        if _BATCHER.window_s > 0:
+            return await _BATCHER.submit_async(self._batch_key(), symbol, self._fetch_batch_async)
+        return (await self._fetch_batch_async([symbol]))[symbol]
+
+    def fetch_many(self, symbols: Sequence[str]) -> List[Dict[str, Any]]:
+        """Tickers of ``symbols`` (in order); the cache misses in one exchange call."""
+        symbols = _validate_symbols(symbols)
+        found = {symbol: self._cached(symbol) for symbol in symbols}
+        missing = [symbol for symbol, payload in found.items() if payload is None]
+        if missing:
+            found.update(self._fetch_batch(missing))
+        return [found[symbol] for symbol in symbols]
+
+    async def fetch_many_async(self, symbols: Sequence[str]) -> List[Dict[str, Any]]:
+        """Awaitable :meth:`fetch_many`."""
+        symbols = _validate_symbols(symbols)
+        found = {symbol: self._cached(symbol) for symbol in symbols}
+        missing = [symbol for symbol, payload in found.items() if payload is None]
+        if missing:
+            found.update(await self._fetch_batch_async(missing))
+        return [found[symbol] for symbol in symbols]
+
+    # ------------------------------------------------------------------
+    # Exchange calls
+    # ------------------------------------------------------------------
+    def _fetch_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """``{symbol: payload}`` for ``symbols`` (see :meth:`_fetch_raw`)."""
+        started = time.perf_counter()
+        tickers = self._fetch_raw(symbols)
+        return self._store_all(symbols, tickers, time.perf_counter() - started)
+
+    async def _fetch_batch_async(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Async :meth:`_fetch_batch`."""
+        started = time.perf_counter()
+        market = MarketDataService(exchange_name=self.exchange_name) if self._client is None else None
+        if market is None or market.async_exchange is None:
+            tickers = await asyncio.to_thread(self._fetch_raw, symbols)
+        else:
+            client = market.async_exchange
+            with call_service("ticker"):
+                tickers = dict(await client.fetch_tickers(symbols) or {}) if len(symbols) > 1 else {}
+                for symbol in symbols:
+                    if symbol not in tickers:
+                        tickers[symbol] = await client.fetch_ticker(symbol)
+        return self._store_all(symbols, tickers, time.perf_counter() - started)
+
+    def _fetch_raw(self, symbols: List[str]) -> Dict[str, Any]:
+        """Raw ccxt tickers: one ``fetch_tickers`` for several symbols.
+
+        Symbols the bulk answer leaves out (or a client without
+        ``fetch_tickers``) fall back to one ``fetch_ticker`` each.
+        """
+        client = self._exchange()
+        tickers: Dict[str, Any] = {}
+        with call_service("ticker"):
+            if len(symbols) > 1 and hasattr(client, "fetch_tickers"):
+                tickers = dict(client.fetch_tickers(symbols) or {})
+            for symbol in symbols:
+                if symbol not in tickers:
+                    tickers[symbol] = client.fetch_ticker(symbol)
+        return tickers
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def _cached(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with _LOCK:
+            cached = _CACHE.get((self.exchange_name, symbol))
+        if cached is not None:
+            STATS.hit("ticker", NO_TIMEFRAME)
+            return cached
+        STATS.miss("ticker", NO_TIMEFRAME)
+        return None
+
+    def _store_all(self, symbols: List[str], tickers: Dict[str, Any], seconds: float) -> Dict[str, Dict[str, Any]]:
+        STATS.fetched("ticker", NO_TIMEFRAME, seconds)
+        payloads = {symbol: self._payload(symbol, tickers[symbol]) for symbol in symbols}
         with _LOCK:
-            cached = _CACHE.get(key)
-            if cached is not None and cached[0] > now:
-                return cached[1]
+            for symbol, payload in payloads.items():
+                _CACHE[(self.exchange_name, symbol)] = payload
+        return payloads
 
-        ticker = self._exchange().fetch_ticker(symbol)
-        payload = {
+    @staticmethod
+    def _payload(symbol: str, ticker: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "symbol": symbol,
             "last": _num(ticker.get("last")),
             "bid": _num(ticker.get("bid")),
             "ask": _num(ticker.get("ask")),
             "timestamp": ticker.get("timestamp"),
         }
-        with _LOCK:
-            _CACHE[key] = (now + _TTL_SECONDS, payload)
-        return payload
 
     @classmethod
     def clear_cache(cls) -> None:
         with _LOCK:
             _CACHE.clear()
+
+
+def _validate_symbols(symbols: Sequence[str]) -> List[str]:
+    unique = list(dict.fromkeys(symbol.strip() for symbol in symbols if symbol and symbol.strip()))
+    if not unique:
+        raise ValueError("Indica al menos un símbolo")
+    if len(unique) > _MAX_BATCH_SYMBOLS:
+        raise ValueError(f"Máximo {_MAX_BATCH_SYMBOLS} símbolos por petición")
+    return unique
+
+
+def _ticker_cache_gauge() -> Dict[str, Any]:
+    with _LOCK:
+        payloads = list(_CACHE.values())
+    return {NO_TIMEFRAME: (len(payloads), sum(sys.getsizeof(p) for p in payloads))}
+
+
+STATS.register_gauge("ticker", _ticker_cache_gauge)
@@ -39,9 +39,8 @@ What it computes (per closed candle, float64, Pine warmup NaN included):
 from __future__ import annotations
 
 import math
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -79,19 +78,29 @@ def pine_rma(values: np.ndarray, length: int) -> np.ndarray:
 
 
 def pine_wma(values: np.ndarray, length: int) -> np.ndarray:
-    """Pine `ta.wma`: linear weights (most recent = `length`), na-strict."""
+    """Pine `ta.wma`: linear weights (most recent = `length`), na-strict.
+
+    Vectorised as a convolution: one pass over the series per weight,
+    summed newest value first like Pine's own loop, so the rounding does not
+    depend on the BLAS build. A na (or an inf pair) anywhere in the window
+    propagates through the sum, which keeps the na-strict semantics.
+    """
+    values = np.asarray(values, dtype="float64")
     n = len(values)
     out = np.full(n, np.nan)
-    weights = np.arange(1, length + 1, dtype="float64")
-    denominator = weights.sum()
-    for i in range(length - 1, n):
-        window = values[i - length + 1: i + 1]
-        if np.isnan(window).any():
-            continue
-        out[i] = float(np.dot(window, weights) / denominator)
+    if n < length:
+        return out
+    total = length * values[length - 1:]
+    for lag in range(1, length):
+        total = total + (length - lag) * values[length - 1 - lag: n - lag]
+    out[length - 1:] = total / _wma_denominator(length)
     return out
 
 
+def _wma_denominator(length: int) -> float:
+    return length * (length + 1) / 2
+
+
 def pine_hma(values: np.ndarray, length: int) -> np.ndarray:
     """Pine `ta.hma`: WMA(2*WMA(x, len/2) - WMA(x, len), round(sqrt(len)))."""
     half = pine_wma(values, max(1, length // 2))
@@ -109,19 +118,6 @@ def _rolling_highest(values: np.ndarray, length: int) -> np.ndarray:
     )
 
 
-def _wave_extreme(speed_hist: List[float], i: int, window_len: int, *, kind: str) -> float:
-    """Pine `ta.highest/lowest(speed, N)` at bar `i`, before `speed` updates.
-
-    At that line `speed` still carries the end-of-bar `i-1` value, so the
-    N-offsets window collapses to the end-of-bar values `[i-N+1, i-1]`
-    (offset 0 duplicates `speed_hist[i-1]`). na-strict like Pine.
-    """
-    window = speed_hist[max(0, i - window_len + 1): i] or [speed_hist[i - 1]]
-    if any(math.isnan(v) for v in window):
-        return math.nan
-    return max(window) if kind == "highest" else min(window)
-
-
 def trend_speed_analyzer(
     open_: pd.Series,
     close: pd.Series,
@@ -136,6 +132,10 @@ def trend_speed_analyzer(
     including the na warmup of the first ~200 bars: `speed` stays na until
     the first close/dyn_ema cross resets it — on a chart with long history
     (the owner's case) this warmup is invisible.
+
+    Linear time: only the dynamic EMA recursion runs per bar in Python.
+    Crosses, the per-wave speed accumulation and the wave extremes are
+    array operations over the wave boundaries (`_waves`).
     """
     if len(open_) != len(close):
         raise ValueError("open_ and close must have the same length")
@@ -153,74 +153,106 @@ def trend_speed_analyzer(
         ))
 
     alpha = _dyn_alpha(closes, max_length=max_length, accel_multiplier=accel_multiplier)
-    c = pine_rma(closes, _RMA_LEN)
-    o = pine_rma(opens, _RMA_LEN)
-
-    dyn_ema = np.full(n, np.nan)
-    speed_hist: List[float] = []
-    wave_dir = np.zeros(n, dtype="int64")
-    bullish_change: Deque[float] = deque(maxlen=lookback_period)
-    bearish_change: Deque[float] = deque(maxlen=lookback_period)
-    bullish_t: Deque[int] = deque(maxlen=lookback_period)
-    bearish_t: Deque[int] = deque(maxlen=lookback_period)
-
-    x1 = 0  # Pine: `if na(x1): x1 := bar_index` fires on the first bar
-    pos = 0
-    speed = 0.0  # Pine: `var speed = 0.0`
-
-    for i in range(n):
-        # -- dynamic EMA (na alpha replicates the Pine warmup verbatim) ----
-        if i == 0 or math.isnan(dyn_ema[i - 1]):
-            dyn_ema[i] = closes[i]
-        else:
-            dyn_ema[i] = alpha[i] * closes[i] + (1.0 - alpha[i]) * dyn_ema[i - 1]
-
-        # -- crosses of close over/under the CURRENT dyn_ema ---------------
-        crossed_up = i >= 1 and closes[i] > dyn_ema[i] and closes[i - 1] <= dyn_ema[i]
-        crossed_down = i >= 1 and closes[i] < dyn_ema[i] and closes[i - 1] >= dyn_ema[i]
-        bar_delta = c[i] - o[i]
-
-        if crossed_up:
-            window_len = max(1, i - x1)
-            bearish_change.appendleft(_wave_extreme(speed_hist, i, window_len, kind="lowest"))
-            bearish_t.appendleft(i - x1)
-            x1, pos, speed = i, 1, bar_delta
-        elif crossed_down:
-            window_len = max(1, i - x1)
-            bullish_change.appendleft(_wave_extreme(speed_hist, i, window_len, kind="highest"))
-            bullish_t.appendleft(i - x1)
-            x1, pos, speed = i, -1, bar_delta
-        else:
-            speed = speed + bar_delta
+    bar_delta = pine_rma(closes, _RMA_LEN) - pine_rma(opens, _RMA_LEN)
+    dyn_ema = _dyn_ema(closes, alpha)
+
+    # -- crosses of close over/under the CURRENT dyn_ema ---------------------
+    previous = np.concatenate(([np.nan], closes[:-1]))  # no cross on bar 0
+    crossed_up = (closes > dyn_ema) & (previous <= dyn_ema)
+    crossed_down = (closes < dyn_ema) & (previous >= dyn_ema)
+    crosses = np.flatnonzero(crossed_up | crossed_down)
+
+    speed, wave_dir, extremes = _waves(bar_delta, crosses, crossed_up[crosses])
+    # Pine: `if na(x1): x1 := bar_index` fires on the first bar.
+    durations = crosses - np.concatenate(([0], crosses[:-1]))
+    bullish = crossed_down[crosses]  # a bearish cross closes a bullish wave
+    # Newest first, capped like the Pine arrays (`unshift` + `pop`).
+    bullish_change = extremes[bullish][::-1][:lookback_period].tolist()
+    bearish_change = extremes[~bullish][::-1][:lookback_period].tolist()
+    bullish_t = durations[bullish][::-1][:lookback_period].tolist()
+    bearish_t = durations[~bullish][::-1][:lookback_period].tolist()
 
-        speed_hist.append(speed)
-        wave_dir[i] = pos
-
-    speed_arr = np.array(speed_hist, dtype="float64")
     frame = pd.DataFrame(
         {
             "dyn_ema": dyn_ema,
-            "speed": speed_arr,
-            "trend_speed": pine_hma(speed_arr, _HMA_LEN),
+            "speed": speed,
+            "trend_speed": pine_hma(speed, _HMA_LEN),
             "wave_dir": wave_dir,
         },
         index=close.index,
     )
     stats = _stats(
-        speed=speed_hist[-1] if speed_hist else math.nan,
-        bullish_change=list(bullish_change),
-        bearish_change=list(bearish_change),
-        bullish_t=list(bullish_t),
-        bearish_t=list(bearish_t),
+        speed=float(speed[-1]),
+        bullish_change=bullish_change,
+        bearish_change=bearish_change,
+        bullish_t=bullish_t,
+        bearish_t=bearish_t,
     )
     return TrendSpeedResult(
         frame=frame,
         stats=stats,
-        bullish_waves=list(bullish_change),
-        bearish_waves=list(bearish_change),
+        bullish_waves=bullish_change,
+        bearish_waves=bearish_change,
     )
 
 
+def _dyn_ema(closes: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """Dynamic EMA (na alpha replicates the Pine warmup verbatim).
+
+    The first bar, and any bar after a na value, restarts at ``close``.
+    """
+    out = np.empty(len(closes))
+    previous = math.nan
+    for i, (price, weight) in enumerate(zip(closes.tolist(), alpha.tolist())):
+        if math.isnan(previous):
+            previous = price
+        else:
+            previous = weight * price + (1.0 - weight) * previous
+        out[i] = previous
+    return out
+
+
+def _waves(
+    bar_delta: np.ndarray, crosses: np.ndarray, up: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Speed, wave direction and closing-wave extreme for each cross.
+
+    A wave runs from one cross to the bar before the next. ``speed``
+    accumulates ``bar_delta`` from the wave's first bar (`cumsum` per wave,
+    the same sequential sums as Pine's ``speed := speed + (c - o)``); before
+    the first cross it starts from Pine's ``var speed = 0.0``.
+
+    The cross at bar ``i`` closes the wave that started at ``x1`` and records
+    Pine's ``highest/lowest(speed, i - x1)`` — evaluated before ``speed``
+    updates, so over the end-of-bar values ``[x1 + 1, i - 1]``, or just
+    ``speed[i - 1]`` when that range is empty. Those ranges are disjoint, so
+    one `reduceat` computes every extreme; a na in the range propagates.
+    """
+    n = len(bar_delta)
+    bounds = np.concatenate(([0], crosses, [n]))
+    speed = np.empty(n)
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        if start == 0:
+            speed[:end] = np.cumsum(np.concatenate(([0.0], bar_delta[:end])))[1:]
+        else:
+            speed[start:end] = np.cumsum(bar_delta[start:end])
+
+    direction = np.zeros(n, dtype="int64")
+    direction[crosses] = np.where(up, 1, -1)
+    wave_dir = direction[np.maximum.accumulate(np.where(direction != 0, np.arange(n), 0))]
+
+    if len(crosses) == 0:
+        return speed, wave_dir, np.empty(0)
+    x1 = bounds[:-2]
+    first = np.where(crosses - x1 > 1, x1 + 1, crosses - 1)
+    # Interleaved [first_k, cross_k]: even slots reduce each wave's range,
+    # odd slots (the gaps in between) are discarded.
+    edges = np.column_stack((first, crosses)).ravel()
+    highest = np.maximum.reduceat(speed, edges)[::2]
+    lowest = np.minimum.reduceat(speed, edges)[::2]
+    return speed, wave_dir, np.where(up, lowest, highest)
+
+
 def _dyn_alpha(closes: np.ndarray, *, max_length: int, accel_multiplier: float) -> np.ndarray:
     """Per-bar smoothing alpha of the dynamic EMA (na during warmup)."""
     counts_diff = closes  # Pine: counts_diff = close
@@ -1,20 +1,52 @@
 import logging
 import functools
-from fastapi.responses import JSONResponse
+import math
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from controllers.metrics import call_accounting
+from controllers.metrics.circuit_breaker import CircuitOpenError, stale_scope
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def has_errors(func):
-    """Decorador que captura excepciones y devuelve un JSON de error estructurado."""
+    """Decorador que captura excepciones y devuelve un JSON de error estructurado.
+
+    Con el circuito del exchange abierto responde 503 con ``Retry-After`` sin
+    esperar al timeout; si la respuesta se sirvió con velas en caché
+    desactualizadas añade la cabecera ``X-Data-Stale``. Las llamadas al
+    exchange que hace el endpoint se contabilizan con su nombre como ruta
+    (``call_accounting``) y, con ``EXCHANGE_CALLS_HEADER=1``, se resumen en la
+    cabecera ``X-Exchange-Calls``.
+    """
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except ValueError as e:
-            _LOGGER.warning("Validation error in %s: %s", func.__name__, e)
-            return JSONResponse(status_code=400, content={"error": str(e)})
-        except Exception as e:
-            _LOGGER.exception("Unexpected error in %s", func.__name__)
-            return JSONResponse(status_code=500, content={"error": str(e)})
+        with stale_scope() as stale, call_accounting.request_scope(func.__name__) as calls:
+            try:
+                result = await func(*args, **kwargs)
+            except CircuitOpenError as e:
+                _LOGGER.warning("Circuit open in %s: %s", func.__name__, e)
+                result = JSONResponse(
+                    status_code=503,
+                    content={"error": str(e)},
+                    headers={"Retry-After": str(math.ceil(e.retry_after_s))},
+                )
+            except ValueError as e:
+                _LOGGER.warning("Validation error in %s: %s", func.__name__, e)
+                result = JSONResponse(status_code=400, content={"error": str(e)})
+            except Exception as e:
+                _LOGGER.exception("Unexpected error in %s", func.__name__)
+                result = JSONResponse(status_code=500, content={"error": str(e)})
+        headers = {}
+        if stale:
+            headers["X-Data-Stale"] = ",".join(sorted(stale))
+        if call_accounting.HEADER_ENABLED:
+            headers["X-Exchange-Calls"] = calls.header()
+        if not headers:
+            return result
+        if not isinstance(result, Response):
+            result = JSONResponse(content=jsonable_encoder(result))
+        result.headers.update(headers)
+        return result
     return wrapper
@@ -32,3 +32,7 @@ api_v1.include_router(prefix="/backtest", router=backtest_router)
 # Strategy setups (F0 live evaluation)
 from .setups_routing import setups_router  # noqa: E402
 api_v1.include_router(prefix="/setups", router=setups_router)
+
+# Observabilidad de caches (hits, misses, evicciones, tamaño)
+from .cache_routing import cache_router  # noqa: E402
+api_v1.include_router(prefix="/cache", router=cache_router)
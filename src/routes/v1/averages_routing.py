@@ -57,4 +57,4 @@ async def get_averages(
         indicators=indicator_list,
         top_n=top_n,
     )
-    return svc.execute()
+    return await svc.execute_async()
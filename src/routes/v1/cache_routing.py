@@ -0,0 +1,49 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from middlewares import has_errors
+
+# Imported for their side effect: each module registers its cache gauges.
+from controllers.metrics import market_data_service, setup_evaluation_service, ticker_service  # noqa: F401
+from controllers.metrics import exchange_clients
+from controllers.metrics.cache_stats import STATS
+from controllers.metrics.call_accounting import ACCOUNTING
+
+cache_router = APIRouter()
+
+tags = ["cache"]
+
+
+@cache_router.get("/stats", tags=tags)
+@has_errors
+async def get_cache_stats():
+    """Hit/miss/eviction counters, fetch cost and size per cache and timeframe."""
+    return STATS.snapshot()
+
+
+@cache_router.get("/metrics", tags=tags, response_class=PlainTextResponse)
+@has_errors
+async def get_cache_metrics():
+    """Cache, rate-limit and exchange-call counters in the Prometheus text format."""
+    body = STATS.render_prometheus() + exchange_clients.render_prometheus() + ACCOUNTING.render_prometheus()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@cache_router.get("/rate-limits", tags=tags)
+@has_errors
+async def get_rate_limits():
+    """Per-exchange rate-limit budget: tokens, queue depth and wait per priority."""
+    return exchange_clients.rate_limit_stats()
+
+
+@cache_router.get("/hedging", tags=tags)
+@has_errors
+async def get_hedging():
+    """Hedged fetch_ohlcv per exchange:timeframe:depth: calls, hedge rate, hedge wins, budget skips."""
+    return market_data_service.HEDGE.stats()
+
+
+@cache_router.get("/exchange-calls", tags=tags)
+@has_errors
+async def get_exchange_calls():
+    """ccxt calls, errors, seconds and budget weight per route, service, symbol and timeframe."""
+    return ACCOUNTING.snapshot()
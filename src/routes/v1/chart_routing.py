@@ -74,7 +74,7 @@ async def get_chart_data(
         max_points=max_points,
         preferred_timeframe=timeframe,
     )
-    return svc.execute()
+    return await svc.execute_async()
 
 
 @chart_router.get("/timeframes", tags=tags)
@@ -1,7 +1,11 @@
+import asyncio
+from typing import Optional
+
 from controllers.metrics.market_data_service import DEFAULT_EXCHANGE
 from fastapi import APIRouter, Query
 from middlewares import has_errors
 from controllers.metrics.dominance_service import DominanceService
+from .metrics_routing import parse_fields
 
 router = APIRouter()
 
@@ -15,22 +19,28 @@ async def get_dominance(
     exchange: str = Query(DEFAULT_EXCHANGE, description="Exchange a usar para análisis de indicadores"),
     timeframe: str = Query("daily", description="Marco temporal para indicadores: daily, weekly, etc."),
     limit: int = Query(500, description="Número de velas para indicadores"),
+    fields: Optional[str] = Query(
+        None, description="Campos de indicadores a devolver por par separados por coma; por defecto, todos"
+    ),
 ):
     symbols = [c.strip() for c in coins.split(",") if c.strip()]
 
-    # 1. Dominancia global
-    dominance = DominanceService().fetch(symbols)
-
-    # 2. Análisis de indicadores por par VS USDT
+    # 1. Dominancia global (CoinGecko vía `requests`, fuera del event loop)
+    # 2. Análisis de indicadores por par VS USDT, todos los pares a la vez
     from controllers.metrics.metrics_controller import MetricsController
     controller = MetricsController(exchange=exchange)
+    pairs = [f"{s.upper()}/USDT" for s in symbols]
+    dominance, results = await asyncio.gather(
+        asyncio.to_thread(DominanceService().fetch, symbols),
+        controller.process_symbols_async(pairs, timeframe=timeframe, limit=limit, fields=parse_fields(fields)),
+    )
     analysis = {}
-    for s in symbols:
-        pair = f"{s.upper()}/USDT"
-        try:
-            analysis[s.lower()] = controller.process_symbol(symbol=pair, timeframe=timeframe, limit=limit)
-        except Exception as e:
-            analysis[s.lower()] = {"error": str(e)}
+    for s, pair in zip(symbols, pairs):
+        result = results[pair]
+        if isinstance(result, BaseException):
+            analysis[s.lower()] = {"error": str(result)}
+        else:
+            analysis[s.lower()] = result
 
     return {
         "dominance": dominance,
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from controllers.metrics.market_data_service import DEFAULT_EXCHANGE
 from fastapi import APIRouter, Query
 from middlewares import has_errors
@@ -12,6 +14,14 @@ def _get_controller(exchange: str):
     return MetricsController(exchange=exchange)
 
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """`"rsi14, atr"` -> `["rsi14", "atr"]`; None / empty -> None (todos los campos)."""
+    if fields is None:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    return selected or None
+
+
 @metrics_router.get("/get", tags=tags)
 @has_errors
 async def get_metrics(
@@ -19,6 +29,13 @@ async def get_metrics(
     exchange: str = Query(DEFAULT_EXCHANGE, description="Exchange a usar"),
     timeframe: str = Query("1h", description="Marco temporal"),
     limit: int = Query(500, description="Número de velas"),
+    fields: Optional[str] = Query(
+        None,
+        description="Campos de indicadores a devolver separados por coma, ej: rsi14,atr. "
+        "Sólo se calcula lo necesario para ellos (y para las señales); por defecto, todos",
+    ),
 ):
     controller = _get_controller(exchange)
-    return controller.process_symbol(symbol=symbol, timeframe=timeframe, limit=limit)
+    return await controller.process_symbol_async(
+        symbol=symbol, timeframe=timeframe, limit=limit, fields=parse_fields(fields)
+    )
@@ -34,4 +34,4 @@ async def get_movements(
         risk_per_trade_pct=risk_per_trade_pct,
         use_atr_sizing=use_atr_sizing,
     )
-    return svc.execute()
+    return await svc.execute_async()
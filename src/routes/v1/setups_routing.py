@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
 from middlewares import has_errors
 
 from controllers.metrics.market_data_service import DEFAULT_EXCHANGE
@@ -45,4 +46,6 @@ async def evaluate_setups(
     service = SetupEvaluationService(
         symbol=symbol, exchange=exchange, rule_version=rule_version
     )
-    return service.evaluate()
+    # Six enriched timeframes per call: CPU-bound as much as I/O-bound, so
+    # the whole evaluation runs off the event loop.
+    return await run_in_threadpool(service.evaluate)
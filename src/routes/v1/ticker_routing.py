@@ -16,4 +16,15 @@ async def get_ticker(
     exchange: str = Query(DEFAULT_EXCHANGE, description="Exchange a usar"),
 ):
     """Fresh last/bid/ask via ccxt fetch_ticker (NO OHLCV cache)."""
-    return TickerService(exchange=exchange).fetch(symbol)
+    return await TickerService(exchange=exchange).fetch_async(symbol)
+
+
+@ticker_router.get("/batch", tags=tags)
+@has_errors
+async def get_tickers(
+    symbols: str = Query(..., description="Pares separados por comas, ej: BTC/USDT,ETH/USDT (máx. 100)"),
+    exchange: str = Query(DEFAULT_EXCHANGE, description="Exchange a usar"),
+):
+    """Fresh last/bid/ask for a watchlist: the cache misses in one fetch_tickers call."""
+    tickers = await TickerService(exchange=exchange).fetch_many_async(symbols.split(","))
+    return {"exchange": exchange.lower(), "tickers": tickers}
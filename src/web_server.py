@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 import time
 from logging import getLogger
 from os import getenv
@@ -26,6 +27,8 @@ if _PREFIX_PATH and not _PREFIX_PATH.startswith("/"):
 _HEALTHY_PATH = getenv("HEALTHY_PATH", "/healthy")
 _LIVENESS_PATH = getenv("LIVENESS_PATH", "/liveness")
 
+_EXCHANGE_PREWARM = getenv("EXCHANGE_PREWARM", "1").split("#", 1)[0].strip() not in ("0", "false", "no")
+
 _LOG_FORMAT = getenv("LOG_FORMAT", "text").lower()
 _REQUEST_LOGGER = getLogger("mmk.requests")
 
@@ -103,6 +106,50 @@ async def _log_request_middleware(request: Request, call_next):
         )
 
 
+def _prewarm_exchange_clients() -> None:
+    """Load the default exchange's markets into the client pool at startup.
+
+    Runs in a daemon thread so a slow/unreachable exchange never delays the
+    server from accepting requests (the pool then simply warms lazily).
+    """
+    if not _EXCHANGE_PREWARM:
+        return
+    from controllers.metrics.exchange_clients import warm_up
+    from controllers.metrics.market_data_service import DEFAULT_EXCHANGE, MarketDataService
+
+    threading.Thread(
+        target=warm_up,
+        args=([DEFAULT_EXCHANGE], MarketDataService.SUPPORTED_EXCHANGES),
+        name="exchange-prewarm",
+        daemon=True,
+    ).start()
+
+
+_PREWARM_SCHEDULER = None
+
+
+def _start_candle_prewarm() -> None:
+    """Start the candle-close cache prewarm when PREWARM_SYMBOLS is set."""
+    global _PREWARM_SCHEDULER
+    from controllers.metrics.prewarm_scheduler import PrewarmScheduler
+
+    _PREWARM_SCHEDULER = PrewarmScheduler.from_env()
+    if _PREWARM_SCHEDULER is not None:
+        _PREWARM_SCHEDULER.start()
+
+
+def _stop_candle_prewarm() -> None:
+    if _PREWARM_SCHEDULER is not None:
+        _PREWARM_SCHEDULER.stop(timeout=5)
+
+
+async def _close_async_exchange_clients() -> None:
+    """Close the asyncio ccxt clients (aiohttp sessions) opened by the routes."""
+    from controllers.metrics.exchange_clients import close_async_clients
+
+    await close_async_clients()
+
+
 def start_fastapi():
     from routes import routes
     from security import install_security
@@ -140,6 +187,10 @@ def start_fastapi():
     install_security(app)
     app.middleware("http")(_log_request_middleware)
     app.include_router(routes)
+    app.add_event_handler("startup", _prewarm_exchange_clients)
+    app.add_event_handler("startup", _start_candle_prewarm)
+    app.add_event_handler("shutdown", _stop_candle_prewarm)
+    app.add_event_handler("shutdown", _close_async_exchange_clients)
 
     getLogger("uvicorn.access").addFilter(Unless())
 
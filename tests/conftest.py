@@ -0,0 +1,9 @@
+"""Suite-wide setup.
+
+The offline ``replay`` exchange is only registered when enabled before
+`market_data_service` is imported; the endpoint and load tests run on it.
+"""
+
+import os
+
+os.environ.setdefault("REPLAY_EXCHANGE_ENABLED", "1")
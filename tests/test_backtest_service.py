@@ -5,6 +5,8 @@ deterministic synthetic OHLCV DataFrame that nevertheless exercises every
 branch of the engine (entries, target hits, stop hits and end-of-data exits).
 """
 
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import List
 
@@ -14,6 +16,7 @@ import pytest
 
 from controllers.metrics import backtest_service as bs_module
 from controllers.metrics.backtest_service import BacktestService
+from controllers.metrics.market_data_service import MarketDataService
 
 
 def _synthetic_history(n: int = 600, seed: int = 1) -> pd.DataFrame:
@@ -139,9 +142,10 @@ class _FakeExchange:
         return window[:limit]
 
 
-class _FakeMarketSvc:
-    def __init__(self, exchange):
-        self.exchange = exchange
+def _market_svc(exchange) -> MarketDataService:
+    svc = MarketDataService(exchange_name="bitget")
+    svc.exchange = exchange  # swap the real ccxt client out
+    return svc
 
 
 def test_e13_backtest_pagination_uses_limit_200_gap_free(monkeypatch):
@@ -158,7 +162,7 @@ def test_e13_backtest_pagination_uses_limit_200_gap_free(monkeypatch):
         risk_per_trade_pct=1.5, warmup_bars=10,
     )
 
-    df = svc._fetch_paginated(_FakeMarketSvc(exchange), start)
+    df = svc._fetch_paginated(_market_svc(exchange), start)
 
     # The fix: every page requests 200, never 1000.
     assert exchange.limits_seen, "pagination never called the exchange"
@@ -167,3 +171,69 @@ def test_e13_backtest_pagination_uses_limit_200_gap_free(monkeypatch):
     # Gap-free: every candle collected, in order.
     assert len(df) == 500
     assert list(df["timestamp"]) == [row[0] for row in candles]
+
+
+class _SlowExchange(_FakeExchange):
+    """Like `_FakeExchange`, but each page takes a while and overlap is tracked."""
+
+    def __init__(self, candles: List[list]):
+        super().__init__(candles)
+        self.since_seen: List[int] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        with self._lock:
+            self.since_seen.append(since)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return super().fetch_ohlcv(symbol, timeframe, since, limit)
+
+
+def _history_svc(candles: List[list]) -> BacktestService:
+    start = datetime.fromtimestamp(candles[0][0] / 1000, tz=timezone.utc)
+    end = datetime.fromtimestamp(candles[-1][0] / 1000, tz=timezone.utc) + timedelta(seconds=1)
+    return BacktestService(
+        symbol="BTC/USDT", timeframe="1h", exchange="bitget",
+        start=start, end=end, initial_capital=10000.0,
+        risk_per_trade_pct=1.5, warmup_bars=10,
+    )
+
+
+def test_history_pages_are_planned_up_front_and_fetched_concurrently():
+    base = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    step = 3_600_000
+    candles = [[base + i * step, 100.0, 101.0, 99.0, 100.0, 10.0] for i in range(1000)]
+    exchange = _SlowExchange(candles)
+    svc = _history_svc(candles)
+
+    df = svc._fetch_paginated(_market_svc(exchange), svc.start)
+
+    # One page per 200-candle window of the grid, no cursor chasing.
+    assert sorted(exchange.since_seen) == [base + k * 200 * step for k in range(5)]
+    assert exchange.max_active > 1
+    assert list(df["timestamp"]) == [row[0] for row in candles]
+    assert svc.data_gaps == []
+
+
+def test_history_gaps_are_reported():
+    base = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    step = 3_600_000
+    candles = [
+        [base + i * step, 100.0, 101.0, 99.0, 100.0, 10.0]
+        for i in range(500)
+        if not 250 <= i < 253  # exchange maintenance window
+    ]
+    svc = _history_svc(candles)
+
+    svc._fetch_paginated(_market_svc(_FakeExchange(candles)), svc.start)
+
+    assert svc.data_gaps == [{
+        "start": datetime.fromtimestamp((base + 250 * step) / 1000, tz=timezone.utc).isoformat(),
+        "end": datetime.fromtimestamp((base + 253 * step) / 1000, tz=timezone.utc).isoformat(),
+        "missing_candles": 3,
+    }]
@@ -0,0 +1,119 @@
+"""Tests for the cache observability counters and their endpoints."""
+
+from typing import Any, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.metrics.cache_stats import STATS, CacheStats, InstrumentedTTLCache
+from controllers.metrics.market_data_service import MarketDataService
+
+API_KEY = "test-key"
+
+
+class _FakeExchange:
+    def __init__(self, payload: List[List[Any]]):
+        self.payload = payload
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", limit: int = 500, **kwargs):
+        self.calls += 1
+        return list(self.payload)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    MarketDataService.clear_cache()
+    STATS.reset()
+    yield
+    MarketDataService.clear_cache()
+    STATS.reset()
+
+
+def _service() -> MarketDataService:
+    svc = MarketDataService(exchange_name="binance")
+    svc.exchange = _FakeExchange([[i * 3_600_000, 1, 2, 0.5, 1.5, 10] for i in range(5)])
+    return svc
+
+
+def test_hits_misses_and_fetch_cost_per_timeframe():
+    svc = _service()
+    svc.get_ohlcv("BTC/USDT", "1h", 5)
+    svc.get_ohlcv("BTC/USDT", "1h", 5)
+    svc.get_ohlcv("BTC/USDT", "1h", 5)
+
+    series = STATS.snapshot()["ohlcv"]["1h"]
+    assert series["misses"] == 1
+    assert series["hits"] == 2
+    assert series["hit_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+    assert series["fetches"] == 1
+    assert series["rows_fetched"] == 5
+    assert series["fetch_seconds"] >= 0
+    assert series["entries"] == 1
+    assert series["bytes"] > 0
+
+
+def test_capacity_evictions_are_counted():
+    cache = InstrumentedTTLCache(2, 60, name="probe", timeframe="4h")
+    for key in range(5):
+        cache[key] = key
+    assert STATS.snapshot()["probe"]["4h"]["evictions"] == 3
+
+
+def test_ttl_expirations_are_counted_per_key_timeframe():
+    clock = [0.0]
+    cache = InstrumentedTTLCache(
+        8, 10, name="probe", timeframe_of=lambda key: key[1], timer=lambda: clock[0]
+    )
+    cache[("a", "1h")] = 1
+    cache[("b", "4h")] = 2
+    clock[0] = 5.0
+    cache[("c", "1h")] = 3
+    clock[0] = 11.0
+    assert cache.expire() == [(("a", "1h"), 1), (("b", "4h"), 2)]
+    assert list(cache) == [("c", "1h")]
+    snapshot = STATS.snapshot()["probe"]
+    assert snapshot["1h"]["expirations"] == 1
+    assert snapshot["4h"]["expirations"] == 1
+    assert snapshot["1h"]["evictions"] == 0
+
+
+def test_prometheus_rendering():
+    stats = CacheStats()
+    stats.hit("ohlcv", "1h")
+    stats.miss("ohlcv", "1h")
+    stats.fetched("ohlcv", "1h", 0.25, rows=200)
+    stats.register_gauge("ohlcv", lambda: {"1h": (1, 4096)})
+
+    text = stats.render_prometheus()
+    assert "# TYPE mmk_cache_hits_total counter" in text
+    assert 'mmk_cache_hits_total{cache="ohlcv",timeframe="1h"} 1.0' in text
+    assert 'mmk_cache_fetch_seconds_max{cache="ohlcv",timeframe="1h"} 0.25' in text
+    assert 'mmk_cache_bytes{cache="ohlcv",timeframe="1h"} 4096.0' in text
+    assert text.endswith("\n")
+
+
+def _client(monkeypatch) -> TestClient:
+    monkeypatch.setenv("API_KEYS", API_KEY)
+    from routes import routes
+
+    app = FastAPI()
+    app.include_router(routes)
+    return TestClient(app)
+
+
+def test_cache_endpoints_require_api_key_and_report(monkeypatch):
+    _service().get_ohlcv("BTC/USDT", "1h", 5)
+    client = _client(monkeypatch)
+
+    assert client.get("/v1/cache/stats").status_code == 401
+
+    stats = client.get("/v1/cache/stats", headers={"X-API-Key": API_KEY})
+    assert stats.status_code == 200
+    assert stats.json()["ohlcv"]["1h"]["misses"] == 1
+
+    metrics = client.get("/v1/cache/metrics", headers={"X-API-Key": API_KEY})
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'mmk_cache_misses_total{cache="ohlcv",timeframe="1h"} 1.0' in metrics.text
@@ -0,0 +1,101 @@
+"""Exchange call accounting per route, service, symbol and timeframe."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from controllers.metrics import call_accounting, exchange_clients
+from controllers.metrics import market_data_service as mds
+from controllers.metrics.call_accounting import ACCOUNTING, call_tags, request_scope
+from controllers.metrics.market_data_service import MarketDataService
+
+API_KEY = "test-key"
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture(autouse=True)
+def _isolated():
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    ACCOUNTING.reset()
+    yield
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    ACCOUNTING.reset()
+
+
+def _client(monkeypatch) -> TestClient:
+    monkeypatch.setenv("API_KEYS", API_KEY)
+    from routes import routes
+
+    app = FastAPI()
+    app.include_router(routes)
+    return TestClient(app)
+
+
+def _header(resp) -> dict:
+    parts = (part.split("=") for part in resp.headers["X-Exchange-Calls"].split("; "))
+    return {name: float(value) for name, value in parts}
+
+
+def test_call_tags_read_symbol_and_timeframe():
+    assert call_tags("fetch_ohlcv", ("BTC/USDT", "1h"), {}) == ("BTC/USDT", "1h")
+    assert call_tags("fetch_ohlcv", (), {"symbol": "ETH/USDT", "timeframe": "4h"}) == ("ETH/USDT", "4h")
+    assert call_tags("fetch_ticker", ("BTC/USDT",), {}) == ("BTC/USDT", "-")
+    assert call_tags("fetch_tickers", (["BTC/USDT", "ETH/USDT"],), {}) == ("*", "-")
+    assert call_tags("load_markets", (), {}) == ("-", "-")
+
+
+def test_endpoint_calls_are_counted_and_reported_per_response(monkeypatch):
+    monkeypatch.setattr(call_accounting, "HEADER_ENABLED", True)
+    client = _client(monkeypatch)
+    params = {"symbol": "BTC/USDT", "exchange": "replay", "timeframe": "1h", "limit": 300}
+    headers = {"X-API-Key": API_KEY}
+
+    first = client.get("/v1/metrics/get", params=params, headers=headers)
+    assert first.status_code == 200
+    cost = _header(first)
+    assert cost["fetch_ohlcv"] >= 1 and cost["calls"] >= cost["fetch_ohlcv"]
+    assert cost["weight"] >= cost["calls"]
+
+    # Same candle window: answered from the cache, no exchange call.
+    second = client.get("/v1/metrics/get", params=params, headers=headers)
+    assert _header(second)["calls"] == 0
+
+    snapshot = client.get("/v1/cache/exchange-calls", headers=headers).json()
+    ohlcv = [row for row in snapshot["series"] if row["method"] == "fetch_ohlcv"]
+    assert {(row["route"], row["service"], row["exchange"], row["symbol"], row["timeframe"]) for row in ohlcv} == {
+        ("get_metrics", "market_data", "replay", "BTC/USDT", "1h")
+    }
+    assert snapshot["routes"]["get_metrics"]["calls"] == cost["calls"]
+
+    metrics = client.get("/v1/cache/metrics", headers=headers).text
+    assert 'mmk_exchange_call_calls_total{route="get_metrics",service="market_data"' in metrics
+
+
+def test_header_is_opt_in(monkeypatch):
+    client = _client(monkeypatch)
+    params = {"symbol": "BTC/USDT", "exchange": "replay", "timeframe": "1h", "limit": 300}
+    resp = client.get("/v1/metrics/get", params=params, headers={"X-API-Key": API_KEY})
+    assert resp.status_code == 200
+    assert "X-Exchange-Calls" not in resp.headers
+
+
+def test_history_pages_keep_the_caller_scope(monkeypatch):
+    monkeypatch.setattr(mds, "HISTORY_CONCURRENCY", 4)
+    monkeypatch.setattr(mds, "get_candle_store", lambda: None)
+    svc = MarketDataService(exchange_name="replay")
+    end_ms = 1_700_000_000_000 - 1_700_000_000_000 % HOUR_MS
+    with request_scope("run_backtest") as ledger:
+        rows = mds.fetch_ohlcv_history(
+            svc.exchange,
+            exchange_name="replay",
+            symbol="BTC/USDT",
+            timeframe="1h",
+            since_ms=end_ms - 2000 * HOUR_MS,
+            end_ms=end_ms,
+        )
+    assert rows
+    pages = [row for row in ACCOUNTING.snapshot()["series"] if row["method"] == "fetch_ohlcv"]
+    assert [(row["route"], row["service"]) for row in pages] == [("run_backtest", "ohlcv_history")]
+    assert pages[0]["calls"] == ledger.by_method["fetch_ohlcv"] > 1
@@ -0,0 +1,133 @@
+"""Persistent candle store: warm runs serve history from disk, gaps only."""
+
+from typing import List
+
+import pytest
+
+from controllers.metrics import market_data_service as mds
+from controllers.metrics import candle_store
+from controllers.metrics.candle_store import merge_intervals, subtract_intervals
+
+STEP = 3_600_000  # 1h in ms
+BASE = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+
+
+class _FakeExchange:
+    """Serves `since`-anchored windows and records every requested cursor."""
+
+    def __init__(self, candles: List[list]):
+        self._candles = candles
+        self.since_seen: List[int] = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.since_seen.append(since)
+        return [row for row in self._candles if row[0] >= since][:limit]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("CANDLE_STORE_PATH", str(tmp_path / "candles.sqlite"))
+    monkeypatch.setattr(candle_store, "_STORE", None)
+    # Freeze the clock 1000 candles after BASE, mid-candle.
+    monkeypatch.setattr(mds, "_now", lambda: (BASE + 1000 * STEP + STEP // 2) / 1000)
+    yield candle_store.get_candle_store()
+    candle_store.get_candle_store().close()
+    monkeypatch.setattr(candle_store, "_STORE", None)
+
+
+def _candles(n: int) -> List[list]:
+    return [[BASE + i * STEP, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0] for i in range(n)]
+
+
+def _history(exchange, since_ms, end_ms):
+    return mds.fetch_ohlcv_history(
+        exchange, exchange_name="bitget", symbol="BTC/USDT", timeframe="1h",
+        since_ms=since_ms, end_ms=end_ms,
+    )
+
+
+def test_interval_helpers():
+    assert merge_intervals([(5, 8), (0, 3), (3, 4), (7, 10)]) == [(0, 4), (5, 10)]
+    assert subtract_intervals(0, 12, [(2, 4), (6, 8)]) == [(0, 2), (4, 6), (8, 12)]
+    assert subtract_intervals(3, 7, [(0, 10)]) == []
+
+
+def test_warm_store_serves_history_without_exchange_calls(store):
+    exchange = _FakeExchange(_candles(1001))  # last row is the forming candle
+    end_ms = BASE + 600 * STEP
+
+    cold = _history(exchange, BASE, end_ms)
+    assert len(exchange.since_seen) >= 3  # 601 rows / 200 per page
+    assert [row[0] for row in cold][:601] == [BASE + i * STEP for i in range(601)]
+
+    exchange.since_seen.clear()
+    warm = _history(exchange, BASE, end_ms)
+    assert exchange.since_seen == []  # fully served from disk
+    assert sorted(row[0] for row in warm) == [BASE + i * STEP for i in range(601)]
+    assert warm[5] == cold[5]
+
+
+def test_only_missing_gap_is_fetched(store):
+    exchange = _FakeExchange(_candles(1001))
+    _history(exchange, BASE + 100 * STEP, BASE + 300 * STEP)
+
+    exchange.since_seen.clear()
+    rows = _history(exchange, BASE, BASE + 300 * STEP)
+    # Only the head [BASE, BASE + 100h) was downloaded again.
+    assert exchange.since_seen == [BASE]
+    assert sorted(row[0] for row in rows) == [BASE + i * STEP for i in range(301)]
+
+
+def test_holes_in_a_download_are_retried(store):
+    candles = _candles(1001)
+    holed = _FakeExchange(candles[:250] + candles[300:])  # e.g. an empty page
+    _history(holed, BASE, BASE + 400 * STEP)
+    assert store.missing_ranges("bitget", "BTC/USDT", "1h", BASE, BASE + 400 * STEP + 1) == [
+        (BASE + 250 * STEP, BASE + 300 * STEP)
+    ]
+
+    complete = _FakeExchange(candles)
+    rows = _history(complete, BASE, BASE + 400 * STEP)
+    assert complete.since_seen == [BASE + 250 * STEP]  # only the hole
+    assert sorted(row[0] for row in rows) == [BASE + i * STEP for i in range(401)]
+
+
+def test_confirmed_pre_listing_stretch_is_not_re_requested(store):
+    listed = _FakeExchange(_candles(1001)[300:])  # the pair lists at candle 300
+    _history(listed, BASE, BASE + 400 * STEP)
+    assert store.missing_ranges("bitget", "BTC/USDT", "1h", BASE, BASE + 400 * STEP + 1) == []
+
+    again = _FakeExchange(_candles(1001)[300:])
+    _history(again, BASE, BASE + 400 * STEP)
+    assert again.since_seen == []
+
+
+def test_unconfirmed_leading_stretch_is_retried(store):
+    class _Hiccup(_FakeExchange):
+        def fetch_ohlcv(self, symbol, timeframe, since, limit):
+            if since == BASE and BASE not in self.since_seen:
+                self.since_seen.append(since)
+                return []  # a transient empty first page
+            return super().fetch_ohlcv(symbol, timeframe, since, limit)
+
+    _history(_Hiccup(_candles(1001)), BASE, BASE + 400 * STEP)
+    assert store.missing_ranges("bitget", "BTC/USDT", "1h", BASE, BASE + 400 * STEP + 1) == [
+        (BASE, BASE + 200 * STEP)
+    ]
+
+
+def test_forming_candle_is_never_persisted(store):
+    exchange = _FakeExchange(_candles(1001))
+    rows = _history(exchange, BASE + 990 * STEP, BASE + 1000 * STEP)
+    forming = BASE + 1000 * STEP
+    assert forming in {row[0] for row in rows}  # returned live...
+    assert store.read("bitget", "BTC/USDT", "1h", forming, forming + STEP) == []  # ...not stored
+    assert store.missing_ranges("bitget", "BTC/USDT", "1h", BASE + 990 * STEP, forming) == []
+
+
+def test_without_store_path_pagination_is_unchanged(monkeypatch):
+    monkeypatch.delenv("CANDLE_STORE_PATH", raising=False)
+    exchange = _FakeExchange(_candles(500))
+    rows = _history(exchange, BASE, BASE + 499 * STEP)
+    assert len(rows) == 500
+    assert len(exchange.since_seen) == 3
@@ -0,0 +1,179 @@
+"""Per-exchange circuit breaker: trip, fail fast, stale fallback, half-open probe."""
+
+import importlib
+import time
+
+import ccxt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.metrics import exchange_clients
+from controllers.metrics import market_data_service as mds
+from controllers.metrics.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from controllers.metrics.market_data_service import MarketDataService
+
+healthy_module = importlib.import_module("controllers.healthy_controller")
+
+API_KEY = "test-key"
+HOUR_S = 3600
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+def _breaker(**kwargs):
+    clock = _Clock()
+    options = dict(window_s=30, min_calls=4, error_rate=0.5, slow_call_s=1.0, slow_rate=0.75, open_s=10)
+    options.update(kwargs)
+    return CircuitBreaker("x", clock=clock, **options), clock
+
+
+@pytest.fixture(autouse=True)
+def _isolated():
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    yield
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+
+
+def test_trips_on_error_rate_and_recovers_through_one_probe():
+    breaker, clock = _breaker()
+    for error in (None, ccxt.RequestTimeout("t"), None, ccxt.NetworkError("n")):
+        breaker.record(0.1, error)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after_s == pytest.approx(10)
+
+    clock.t += 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.before_call() is True  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record(0.1, None, probe=True)
+    assert breaker.state == CLOSED
+    assert breaker.before_call() is False
+
+
+def test_failed_probe_reopens():
+    breaker, clock = _breaker()
+    for _ in range(4):
+        breaker.record(0.1, ccxt.RequestTimeout("t"))
+    clock.t += 10
+    assert breaker.before_call() is True
+    breaker.record(0.1, ccxt.ExchangeNotAvailable("down"), probe=True)
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["opened"] == 2
+
+
+def test_trips_on_latency_and_ignores_caller_errors():
+    breaker, _ = _breaker()
+    for _ in range(4):
+        breaker.record(0.1, ccxt.BadSymbol("nope"))  # not the exchange's fault
+    assert breaker.state == CLOSED
+    breaker, _ = _breaker()
+    for seconds in (2.0, 0.1, 2.0, 2.0):
+        breaker.record(seconds)
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["reason"].startswith("slow calls")
+
+
+def test_old_outcomes_leave_the_window():
+    breaker, clock = _breaker()
+    for _ in range(3):
+        breaker.record(0.1, ccxt.RequestTimeout("t"))
+    clock.t += 31
+    for _ in range(3):
+        breaker.record(0.1)
+    assert breaker.state == CLOSED
+
+
+def _trip(exchange="replay"):
+    breaker = MarketDataService(exchange_name=exchange).exchange.pool.breaker
+    breaker._trip(time.monotonic(), "test")
+    return breaker
+
+
+def test_open_circuit_serves_the_last_frame_flagged_stale(monkeypatch):
+    clock = {"t": 1_800_000_000.0}
+    monkeypatch.setattr(mds, "_now", lambda: clock["t"])
+    svc = MarketDataService(exchange_name="replay")
+    fresh = svc.get_ohlcv("BTC/USDT", "1h", 50, drop_forming=False)
+
+    _trip()
+    clock["t"] += HOUR_S  # the key rotates: a miss
+    stale = svc.get_ohlcv("BTC/USDT", "1h", 50)
+    assert stale.attrs["stale"] is True
+    # The formerly forming candle is dropped even though it has closed now.
+    assert stale["timestamp"].tolist() == fresh["timestamp"].tolist()[:-1]
+
+    # No cached frame for this series: fail fast.
+    started = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        svc.get_ohlcv("ETH/USDT", "1h", 50)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_pool_calls_feed_the_breaker():
+    pooled = MarketDataService(exchange_name="replay").exchange
+    breaker = pooled.pool.breaker
+    breaker.min_calls = 2
+
+    def boom(*args, **kwargs):
+        raise ccxt.RequestTimeout("slow exchange")
+
+    pooled.load_markets()
+    with pooled.pool.lease() as client:
+        client.fetch_ohlcv = boom
+    for _ in range(2):
+        with pytest.raises(ccxt.RequestTimeout):
+            pooled.fetch_ohlcv("BTC/USDT", "1h", limit=5)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        pooled.fetch_ohlcv("BTC/USDT", "1h", limit=5)
+    assert exchange_clients.pool_stats()["replay"]["circuit"]["state"] == OPEN
+
+
+def _client(monkeypatch) -> TestClient:
+    monkeypatch.setenv("API_KEYS", API_KEY)
+    from routes import routes
+
+    app = FastAPI()
+    app.include_router(routes)
+    return TestClient(app)
+
+
+def test_endpoints_fail_fast_or_flag_stale(monkeypatch):
+    clock = {"t": 1_800_000_000.0}
+    monkeypatch.setattr(mds, "_now", lambda: clock["t"])
+    client = _client(monkeypatch)
+    params = {"symbol": "BTC/USDT", "exchange": "replay", "timeframe": "1h", "limit": 300}
+    headers = {"X-API-Key": API_KEY}
+    assert client.get("/v1/metrics/get", params=params, headers=headers).status_code == 200
+
+    _trip()
+    clock["t"] += HOUR_S
+    resp = client.get("/v1/metrics/get", params=params, headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["X-Data-Stale"] == "replay:BTC/USDT:1h"
+
+    resp = client.get("/v1/metrics/get", params={**params, "symbol": "ETH/USDT"}, headers=headers)
+    assert resp.status_code == 503
+    assert int(resp.headers["Retry-After"]) >= 1
+
+
+def test_healthy_shares_the_breaker(monkeypatch):
+    from controllers.metrics.market_data_service import DEFAULT_EXCHANGE
+
+    _trip(DEFAULT_EXCHANGE)
+    out = healthy_module.healthy()
+    assert out["status"] == "degraded"
+    assert out["exchange_status"] == "error: circuit open"
+    assert out["circuit"]["state"] == OPEN
@@ -0,0 +1,231 @@
+"""Shared ccxt client pool: one pool per exchange, bounded, markets loaded once."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from controllers.metrics import exchange_clients
+from controllers.metrics.exchange_clients import ExchangePool, get_exchange, warm_up
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.ticker_service import TickerService
+
+
+class _FakeClient:
+    """Minimal ccxt stand-in: counts instances and network calls."""
+
+    instances = 0
+    market_loads = 0
+    active = 0
+    max_active = 0
+    _lock = threading.Lock()
+
+    def __init__(self, config):
+        type(self).instances += 1
+        self.config = config
+        self.rateLimit = 0
+        self.markets = None
+        self.currencies = None
+
+    def load_markets(self, reload=False):
+        if self.markets is None:
+            type(self).market_loads += 1
+            self.markets = {"BTC/USDT": {"id": "BTCUSDT"}}
+        return self.markets
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+        self.currencies = currencies
+
+    def fetch_ticker(self, symbol):
+        self.load_markets()
+        cls = type(self)
+        with cls._lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.02)
+        with cls._lock:
+            cls.active -= 1
+        return {"symbol": symbol, "last": 1.0, "bid": 1.0, "ask": 1.0, "timestamp": 0}
+
+
+@pytest.fixture(autouse=True)
+def _fake_registry(monkeypatch):
+    for attr in ("instances", "market_loads", "active", "max_active"):
+        monkeypatch.setattr(_FakeClient, attr, 0)
+    monkeypatch.setitem(MarketDataService.SUPPORTED_EXCHANGES, "bitget", _FakeClient)
+    exchange_clients.reset_pools()
+    TickerService.clear_cache()
+    yield
+    exchange_clients.reset_pools()
+
+
+def test_services_share_one_pooled_client_per_exchange():
+    first = MarketDataService(exchange_name="bitget")
+    second = MarketDataService(exchange_name="bitget")
+    assert first.exchange is second.exchange
+    assert _FakeClient.instances == 0  # clients are created lazily, on first call
+    assert TickerService(exchange="bitget")._exchange() is first.exchange
+
+
+def test_pool_is_bounded_and_loads_markets_once():
+    pooled = get_exchange("bitget", _FakeClient)
+    pool = pooled.pool
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda i: pooled.fetch_ticker("BTC/USDT"), range(40)))
+
+    assert _FakeClient.instances <= pool.size
+    assert _FakeClient.max_active <= pool.size
+    assert _FakeClient.market_loads == 1  # later clients got set_markets()
+    assert pool.stats()["markets_loaded"] is True
+    assert _FakeClient.instances > 0
+
+
+def test_pooled_clients_disable_per_instance_throttle():
+    pooled = get_exchange("bitget", _FakeClient)
+    pooled.fetch_ticker("BTC/USDT")
+    with pooled.pool.lease() as client:
+        assert client.config["enableRateLimit"] is False
+        assert client.config["options"] == {"defaultType": "spot"}
+
+
+def test_attribute_reads_do_not_lease_a_client():
+    pool = ExchangePool("bitget", _FakeClient, size=1)
+    pooled = exchange_clients.PooledExchange(pool)
+    pooled.fetch_ticker("BTC/USDT")
+
+    with pool.lease() as busy:  # the only client is taken
+        assert pooled.rateLimit == 0  # read without waiting for it
+        assert pool.stats()["idle"] == 0
+        method = pooled.set_markets  # resolving a method does not lease either
+
+    method({"ETH/USDT": {"id": "ETHUSDT"}})  # invoking it does
+    assert busy.markets == {"ETH/USDT": {"id": "ETHUSDT"}}
+    assert pool.stats()["idle"] == pool.stats()["created"] == 1
+
+
+def test_shared_budget_spaces_calls_across_clients():
+    pool = ExchangePool("bitget", _FakeClient, size=4)
+    pool.budget = exchange_clients.TokenBucket(rate=1 / 0.03, capacity=1.0)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: pool.call("fetch_ticker", "BTC/USDT"), range(5)))
+    # 5 calls spaced 30 ms apart pool-wide, despite 4 parallel clients.
+    assert time.monotonic() - start >= 0.12
+
+
+def test_budget_charges_endpoint_weights():
+    bucket = exchange_clients.TokenBucket(rate=100.0, capacity=20.0)
+    start = time.monotonic()
+    bucket.acquire(exchange_clients.endpoint_weight("binance", "fetch_tickers"))  # 16 of 20
+    bucket.acquire(exchange_clients.endpoint_weight("binance", "fetch_ohlcv"))  # 0.4
+    assert time.monotonic() - start < 0.05
+    bucket.acquire(10.0)  # needs ~6.4 more units at 100/s
+    assert time.monotonic() - start >= 0.05
+    assert exchange_clients.endpoint_weight("kraken", "fetch_ohlcv") == exchange_clients.DEFAULT_WEIGHT
+
+
+def test_live_calls_preempt_queued_backtest_calls():
+    bucket = exchange_clients.TokenBucket(rate=50.0, capacity=1.0)
+    bucket.acquire(1.0)  # drain the bucket
+    order = []
+
+    def take(priority, tag):
+        bucket.acquire(1.0, priority)
+        order.append(tag)
+
+    backtest = [
+        threading.Thread(target=take, args=(exchange_clients.BACKTEST, f"bt{i}")) for i in range(3)
+    ]
+    for thread in backtest:
+        thread.start()
+    time.sleep(0.005)  # backtest pages queue first
+    live = threading.Thread(target=take, args=(exchange_clients.LIVE, "live"))
+    live.start()
+    for thread in backtest + [live]:
+        thread.join()
+
+    assert order[0] == "live"
+    stats = bucket.stats()["priorities"]
+    assert stats["backtest"]["granted"] == 3
+    assert stats["live"]["granted"] == 2
+    assert stats["backtest"]["wait_seconds"] > stats["live"]["wait_seconds"]
+    assert stats["backtest"]["queued"] == 0
+
+
+def _backtest_wait_under_live_load(aging_s):
+    """Seconds one backtest call queues while 4 threads keep live calls coming for 0.5s."""
+    bucket = exchange_clients.TokenBucket(rate=100.0, capacity=1.0, aging_s=aging_s)
+    stop = time.monotonic() + 0.5
+
+    def live_load():
+        while time.monotonic() < stop:
+            bucket.acquire(1.0, exchange_clients.LIVE)
+
+    threads = [threading.Thread(target=live_load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)  # the queue is saturated with live calls
+    start = time.monotonic()
+    bucket.acquire(1.0, exchange_clients.BACKTEST)
+    waited = time.monotonic() - start
+    for thread in threads:
+        thread.join()
+    return waited
+
+
+def test_queued_low_priority_calls_age_past_sustained_live_load():
+    # Strict priorities: the backtest call starves until the live load stops.
+    assert _backtest_wait_under_live_load(aging_s=0.0) >= 0.35
+    # With aging it is overtaken only by live calls arriving in the next
+    # 2 x 50ms, then served while the live load is still running.
+    assert _backtest_wait_under_live_load(aging_s=0.05) < 0.3
+
+
+def test_priority_follows_the_context_into_async_and_pages():
+    seen = []
+
+    class _Recorder:
+        def acquire(self, weight, priority):
+            seen.append(priority)
+
+    pooled = get_exchange("bitget", _FakeClient)
+    pooled.fetch_ticker("BTC/USDT")
+    pooled.pool.budget = _Recorder()
+    with exchange_clients.call_priority(exchange_clients.BACKTEST):
+        pooled.fetch_ticker("BTC/USDT")
+    pooled.fetch_ticker("BTC/USDT")
+    assert seen == ["backtest", "live"]
+    with pytest.raises(ValueError):
+        with exchange_clients.call_priority("urgent"):
+            pass
+
+
+def test_async_acquire_shares_the_queue():
+    bucket = exchange_clients.TokenBucket(rate=100.0, capacity=1.0)
+
+    async def run():
+        await asyncio.gather(*(bucket.acquire_async(1.0) for _ in range(4)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.025
+    assert bucket.stats()["priorities"]["live"]["granted"] == 4
+
+
+def test_rate_limit_metrics_render():
+    pooled = get_exchange("bitget", _FakeClient)
+    pooled.fetch_ticker("BTC/USDT")
+    # load_markets on the cold pool, then the ticker itself.
+    assert exchange_clients.rate_limit_stats()["bitget"]["priorities"]["live"]["granted"] == 2
+    text = exchange_clients.render_prometheus()
+    assert 'mmk_ratelimit_granted_total{exchange="bitget",priority="live"} 2.0' in text
+    assert "# TYPE mmk_ratelimit_wait_seconds_total counter" in text
+
+
+def test_warm_up_loads_markets_before_the_first_request():
+    assert warm_up(["bitget"], MarketDataService.SUPPORTED_EXCHANGES) == []
+    assert get_exchange("bitget", _FakeClient).pool.markets_loaded
+    assert _FakeClient.market_loads == 1
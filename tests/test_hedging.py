@@ -0,0 +1,183 @@
+"""Hedged fetch_ohlcv: percentile delay, first answer wins, budget-gated."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from controllers.metrics import exchange_clients
+from controllers.metrics import market_data_service as mds
+from controllers.metrics.hedging import HedgePolicy, latency_key, mark_round_trip
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.replay_exchange import ReplayExchange
+
+
+@pytest.fixture(autouse=True)
+def _isolated():
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    yield
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+
+
+def _policy(**kwargs):
+    options = dict(percentile=90, min_samples=5, min_delay_s=0.0)
+    options.update(kwargs)
+    policy = HedgePolicy(**options)
+    for _ in range(10):
+        policy.observe("x", 0.02)
+    return policy
+
+
+def _sleeper(seconds, value):
+    def run():
+        mark_round_trip()  # goes out at once, like a pooled call with budget
+        time.sleep(seconds)
+        return value
+
+    return run
+
+
+def test_delay_needs_history_and_follows_the_percentile():
+    policy = HedgePolicy(percentile=90, min_samples=5, min_delay_s=0.01)
+    assert policy.delay("x") is None
+    for seconds in (0.1, 0.1, 0.1, 0.1, 1.0):
+        policy.observe("x", seconds)
+    assert 0.1 < policy.delay("x") < 1.0
+    assert HedgePolicy(percentile=0).enabled is False
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=100)
+
+
+def test_hedge_wins_over_a_straggler():
+    policy = _policy()
+    started = time.perf_counter()
+    result = policy.call("x", _sleeper(1.0, "primary"), _sleeper(0.01, "hedge"), lambda: True)
+    assert result == "hedge"
+    assert time.perf_counter() - started < 0.5
+    stats = policy.stats()["x"]
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+    assert stats["hedge_rate"] == 1.0 and stats["hedge_win_rate"] == 1.0
+
+
+def test_no_hedge_without_budget_or_when_fast():
+    policy = _policy()
+    budget_checks = []
+
+    def no_budget():
+        budget_checks.append(1)
+        return False
+
+    assert policy.call("x", _sleeper(0.2, "primary"), _sleeper(0.0, "hedge"), no_budget) == "primary"
+    assert policy.call("x", _sleeper(0.0, "fast"), _sleeper(0.0, "hedge"), no_budget) == "fast"
+    assert budget_checks == [1]  # the fast call never reached the hedge point
+    stats = policy.stats()["x"]
+    assert stats["calls"] == 2 and stats["hedged"] == 0 and stats["budget_skips"] == 1
+
+
+def test_a_failed_primary_falls_back_to_the_hedge():
+    policy = _policy()
+
+    def failing():
+        mark_round_trip()
+        time.sleep(0.1)
+        raise TimeoutError("straggler died")
+
+    assert policy.call("x", failing, _sleeper(0.2, "hedge"), lambda: True) == "hedge"
+
+
+def test_async_loser_is_cancelled():
+    policy = _policy()
+    cancelled = []
+
+    async def slow():
+        mark_round_trip()
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "primary"
+
+    async def fast():
+        return "hedge"
+
+    async def run():
+        result = await policy.call_async("x", slow, fast, lambda: True)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "hedge"
+    assert cancelled == [1]
+
+
+def test_market_data_hedges_pooled_fetches(monkeypatch):
+    monkeypatch.setattr(mds, "HEDGE", _policy(percentile=50))
+    monkeypatch.setattr(mds.HEDGE, "_latencies", {})
+    for _ in range(10):
+        mds.HEDGE.observe(latency_key("replay", "1h", 20), 0.02)
+
+    original = ReplayExchange.fetch_ohlcv
+    calls = []
+    lock = threading.Lock()
+
+    def straggling(self, *args, **kwargs):
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(1.0)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ReplayExchange, "fetch_ohlcv", straggling)
+    svc = MarketDataService(exchange_name="replay")
+    started = time.perf_counter()
+    df = svc.get_ohlcv("BTC/USDT", "1h", 20, drop_forming=False)
+    assert time.perf_counter() - started < 0.8
+    assert len(df) == 20
+    assert mds.HEDGE.stats()["replay:1h:32"]["hedge_wins"] == 1
+    # Both calls were charged to the shared budget.
+    granted = exchange_clients.rate_limit_stats()["replay"]["priorities"]["live"]["granted"]
+    assert granted >= 2
+
+
+def test_latency_history_excludes_the_budget_wait():
+    policy = HedgePolicy(percentile=90, min_samples=1, min_delay_s=0.0)
+    pool = exchange_clients.get_exchange("replay", ReplayExchange).pool
+    pool.call("load_markets")
+    budget = pool.budget
+    with budget._cond:  # empty bucket: the next call queues ~0.2s for its token
+        budget.rate, budget.capacity, budget._tokens, budget._stamp = 5.0, 1.0, 0.0, time.monotonic()
+
+    def fetch():
+        return pool.call("fetch_ohlcv", "BTC/USDT", "1h", limit=5)
+
+    started = time.perf_counter()
+    policy.call("replay", fetch, fetch, lambda: False)
+    assert time.perf_counter() - started >= 0.15
+    assert policy.delay("replay") < 0.1  # only the round trip was observed
+
+
+def test_hedge_delay_starts_when_the_call_goes_out():
+    policy = _policy()  # hedges past ~20ms
+    pool = exchange_clients.get_exchange("replay", ReplayExchange).pool
+    pool.call("load_markets")
+    budget = pool.budget
+    with budget._cond:  # empty bucket: the primary queues ~0.2s for its token
+        budget.rate, budget.capacity, budget._tokens, budget._stamp = 5.0, 1.0, 0.0, time.monotonic()
+    budget_checks = []
+
+    def fetch():
+        return pool.call("fetch_ohlcv", "BTC/USDT", "1h", limit=5)
+
+    policy.call("x", fetch, fetch, lambda: budget_checks.append(1) or False)
+    assert budget_checks == []  # queued, not straggling: no hedge was due
+
+
+def test_latency_key_buckets_depth():
+    assert latency_key("bitget", "1h", 5) == "bitget:1h:8"
+    assert latency_key("bitget", "1h", 200) == latency_key("bitget", "1h", 256) == "bitget:1h:256"
+    assert latency_key("bitget", "1h", 1000) != latency_key("bitget", "4h", 1000)
+    assert latency_key("bitget", "1h", None) == "bitget:1h:0"
@@ -0,0 +1,179 @@
+"""Enriched-frame cache shared by the live endpoints (`indicator_cache`).
+
+Within one candle the indicators of a frame are computed once, whichever
+endpoint asks first; an entry grows by the steps a later caller needs; and
+any change to the candles (window, forming candle) is a different entry.
+"""
+
+import json
+import pathlib
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import numpy as np
+import pandas as pd
+import pytest
+
+from controllers.metrics import exchange_clients, indicator_cache
+from controllers.metrics.cache_stats import STATS
+from controllers.metrics.indicators_service import IndicatorsService
+from controllers.metrics.market_data_service import MarketDataService
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+API_KEY = "test-key"
+SOURCE = {"exchange": "bitget", "symbol": "BTC/USDT", "timeframe": "1h"}
+
+
+def _candles() -> pd.DataFrame:
+    raw = json.loads((FIXTURES / "btc_usdt_bitget_1h_20260713T1600.json").read_text())
+    df = pd.DataFrame(raw, columns=["timestamp", "open", "high", "low", "close", "volume"])
+    df.index = pd.to_datetime(df["timestamp"], unit="ms", utc=True).rename("datetime")
+    return df
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.delenv("SHARED_CACHE_URL", raising=False)
+    indicator_cache.clear()
+    STATS.reset()
+    yield
+    indicator_cache.clear()
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Step lists `IndicatorsService.run_steps` was asked to compute."""
+    ran = []
+    real_run_steps = IndicatorsService.run_steps
+
+    def spy(self, steps):
+        steps = list(steps)
+        ran.append(steps)
+        return real_run_steps(self, steps)
+
+    monkeypatch.setattr(IndicatorsService, "run_steps", spy)
+    return ran
+
+
+def test_a_frame_is_computed_once(runs):
+    df = _candles()
+    first = indicator_cache.enriched(df, **SOURCE)
+    second = indicator_cache.enriched(df.copy(), **SOURCE)
+
+    assert len(runs) == 1
+    assert second.result == first.result == IndicatorsService(df).calculate_all()
+    # A shallow copy per caller over the same cached arrays.
+    assert second.frame is not first.frame
+    assert np.shares_memory(second.frame["rsi14"].to_numpy(), first.frame["rsi14"].to_numpy())
+    assert STATS.snapshot()["enriched"]["1h"]["hits"] == 1
+
+
+def test_entries_grow_by_the_missing_steps_only(runs):
+    df = _candles()
+    full = IndicatorsService(df).calculate_all()
+    runs.clear()
+
+    atr = indicator_cache.enriched(df, fields={"atr"}, **SOURCE)
+    konkorde = indicator_cache.enriched(df, fields={"konkorde_value", "atr"}, **SOURCE)
+    again = indicator_cache.enriched(df, fields={"rsi14"}, **SOURCE)
+
+    assert runs == [["atr"], ["rsi", "konkorde"]]
+    assert atr.result == {"atr": full["atr"]}
+    assert konkorde.result == {"konkorde_value": full["konkorde_value"], "atr": full["atr"]}
+    assert again.result == {"rsi14": full["rsi14"]}
+    assert {"atr14", "rsi14", "konkorde_marron"} <= set(konkorde.frame.columns)
+
+    assert indicator_cache.enriched(df, **SOURCE).result == full
+    assert "rsi" not in runs[-1] and "trend_speed" in runs[-1]
+
+
+def test_cached_frames_are_read_only():
+    df = _candles()
+    frame = indicator_cache.enriched(df, **SOURCE).frame
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[frame.index[-1], "rsi14"] = 0.0
+    frame["mine"] = 1.0  # a caller's own column stays on its copy
+
+    again = indicator_cache.enriched(df, **SOURCE).frame
+    assert "mine" not in again.columns
+    assert again["rsi14"].iloc[-1] == IndicatorsService(df).calculate({"rsi14"})["rsi14"]
+
+
+def test_cached_results_are_copied_per_caller():
+    df = _candles()
+    first = indicator_cache.enriched(df, **SOURCE).result
+    pristine = IndicatorsService(df).calculate_all()
+    assert isinstance(first["trend_speed_stats"], dict)
+    first["trend_speed_stats"].clear()  # a caller editing its own payload
+    first["rsi14"] = None
+
+    assert indicator_cache.enriched(df, **SOURCE).result == pristine
+    assert indicator_cache.enriched(df, fields={"trend_speed_stats"}, **SOURCE).result == {
+        "trend_speed_stats": pristine["trend_speed_stats"]
+    }
+
+
+def test_different_candles_are_different_entries(runs):
+    df = _candles()
+    indicator_cache.enriched(df, fields={"atr"}, **SOURCE)
+
+    indicator_cache.enriched(df.iloc[1:], fields={"atr"}, **SOURCE)  # another `limit`
+    forming = df.copy()
+    forming.iloc[-1, forming.columns.get_loc("close")] += 1.0  # the forming candle moved
+    moved = indicator_cache.enriched(forming, fields={"atr"}, **SOURCE)
+    indicator_cache.enriched(df, fields={"atr"}, **{**SOURCE, "timeframe": "4h"})
+
+    assert len(runs) == 4
+    assert moved.result == IndicatorsService(forming).calculate({"atr"})
+
+
+def test_unidentified_frames_are_not_cached(runs):
+    df = _candles()
+    indicator_cache.enriched(df, fields={"atr"})
+    indicator_cache.enriched(df.drop(columns="timestamp"), fields={"atr"}, **SOURCE)
+
+    assert len(runs) == 2
+    assert len(indicator_cache._CACHE) == 0
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        indicator_cache.enriched(_candles(), fields={"nope"}, **SOURCE)
+
+
+def test_entries_are_shared_across_instances(monkeypatch, tmp_path, runs):
+    monkeypatch.setenv("SHARED_CACHE_URL", f"file://{tmp_path / 'shared'}")
+    df = _candles()
+    first = indicator_cache.enriched(df, fields={"atr", "rsi14"}, **SOURCE)
+
+    indicator_cache.clear()  # another instance: empty memory tier
+    second = indicator_cache.enriched(df, fields={"atr"}, **SOURCE)
+
+    assert len(runs) == 1
+    assert second.result == {"atr": first.result["atr"]}
+    pd.testing.assert_frame_equal(second.frame, first.frame, check_freq=False)
+    assert STATS.snapshot()["enriched_shared"]["1h"]["hits"] == 1
+
+
+def test_repeated_endpoint_calls_share_one_computation(monkeypatch, runs):
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    monkeypatch.setenv("API_KEYS", API_KEY)
+    from routes import routes
+
+    app = FastAPI()
+    app.include_router(routes)
+    client = TestClient(app)
+    headers = {"X-API-Key": API_KEY}
+    params = {"symbol": "BTC/USDT", "exchange": "replay", "timeframe": "1h"}
+    try:
+        first = client.get("/v1/metrics/get", params=params, headers=headers)
+        second = client.get("/v1/metrics/get", params=params, headers=headers)
+        movements = client.get("/v1/movements/", params=params, headers=headers)
+    finally:
+        MarketDataService.clear_cache()
+        exchange_clients.reset_pools()
+
+    assert first.status_code == second.status_code == movements.status_code == 200
+    assert second.json()["indicators"] == first.json()["indicators"]
+    assert len(runs) == 1  # movements' rule inputs are a subset of the full entry
@@ -0,0 +1,110 @@
+"""Dependency-aware projections of `IndicatorsService.calculate`.
+
+A projection must return exactly the requested keys with the same values
+as `calculate_all` and run only the steps those keys need, which is what
+the rule-driven endpoints (movements, backtest, metrics) rely on.
+"""
+
+import json
+import pathlib
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pandas as pd
+import pytest
+
+from controllers.metrics import exchange_clients, indicator_cache
+from controllers.metrics.indicators_service import IndicatorsService
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.rules_service import RulesService
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+API_KEY = "test-key"
+RULE_DRIVEN = RulesService.INPUTS | {"atr"}  # movements + backtest
+
+
+def _candles(timeframe: str = "1h") -> pd.DataFrame:
+    raw = json.loads((FIXTURES / f"btc_usdt_bitget_{timeframe}_20260713T1600.json").read_text())
+    return pd.DataFrame(raw, columns=["timestamp", "open", "high", "low", "close", "volume"])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    indicator_cache.clear()
+    monkeypatch.setenv("API_KEYS", API_KEY)
+    from routes import routes
+
+    app = FastAPI()
+    app.include_router(routes)
+    yield TestClient(app)
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    indicator_cache.clear()
+
+
+@pytest.mark.parametrize("timeframe", ["1h", "1d"])
+def test_projection_values_match_calculate_all(timeframe):
+    df = _candles(timeframe)
+    full = IndicatorsService(df).calculate_all()
+    assert set(full) == IndicatorsService.FIELDS
+    for fields in (RULE_DRIVEN, {"atr"}, {"konkorde_signal", "trend_speed_stats"}, {"bbwp_owner", "ema200"}):
+        assert IndicatorsService(df).calculate(fields) == {key: full[key] for key in fields}
+
+
+def test_only_the_needed_steps_run():
+    assert IndicatorsService.resolve_steps({"atr"}) == ["atr"]
+    # Konkorde reads the RSI column, so asking for it pulls RSI in first.
+    assert IndicatorsService.resolve_steps({"konkorde_value"}) == ["rsi", "konkorde"]
+    skipped = {"bbwp_owner", "ma200", "trend_speed"}
+    assert skipped.isdisjoint(IndicatorsService.resolve_steps(RULE_DRIVEN))
+
+    service = IndicatorsService(_candles())
+    service.calculate({"konkorde_value"})
+    assert {"rsi14", "konkorde_marron"} <= set(service.df.columns)
+    assert "tsa_speed" not in service.df.columns and "atr14" not in service.df.columns
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError, match="rsi99"):
+        IndicatorsService(_candles()).calculate({"rsi14", "rsi99"})
+
+
+def test_endpoints_skip_unused_steps(client, monkeypatch):
+    ran = []
+    real_run_steps = IndicatorsService.run_steps
+
+    def spy(self, steps):
+        steps = list(steps)
+        ran.append(steps)
+        return real_run_steps(self, steps)
+
+    monkeypatch.setattr(IndicatorsService, "run_steps", spy)
+    headers = {"X-API-Key": API_KEY}
+    params = {"symbol": "BTC/USDT", "exchange": "replay", "timeframe": "1h"}
+
+    assert client.get("/v1/movements/", params=params, headers=headers).status_code == 200
+    resp = client.get("/v1/metrics/get", params={**params, "fields": "rsi14, atr"}, headers=headers)
+    assert resp.status_code == 200
+    assert client.get("/v1/metrics/get", params=params, headers=headers).status_code == 200
+    # The projected metrics call needs no step movements did not already
+    # run on the same candles (`indicator_cache`); the full one adds only
+    # the missing steps.
+    movements, metrics_full = ran
+    assert "trend_speed" not in movements
+    assert set(movements) | set(metrics_full) == {step for step, _, _ in IndicatorsService.STEPS}
+    assert set(movements).isdisjoint(metrics_full)
+
+
+def test_metrics_fields_param_projects_the_payload(client):
+    headers = {"X-API-Key": API_KEY}
+    params = {"symbol": "BTC/USDT", "exchange": "replay", "timeframe": "1h"}
+    full = client.get("/v1/metrics/get", params=params, headers=headers).json()
+    projected = client.get("/v1/metrics/get", params={**params, "fields": "rsi14,atr"}, headers=headers).json()
+
+    assert projected["indicators"] == {"rsi14": full["indicators"]["rsi14"], "atr": full["indicators"]["atr"]}
+    assert projected["signals"] == full["signals"]  # rules always see their inputs
+
+    bad = client.get("/v1/metrics/get", params={**params, "fields": "rsi14,nope"}, headers=headers)
+    assert bad.status_code == 400 and "nope" in bad.json()["error"]
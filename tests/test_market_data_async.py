@@ -0,0 +1,115 @@
+"""asyncio market-data path: same caches and coalescing as the sync one."""
+
+import asyncio
+
+import pytest
+
+from controllers.metrics import exchange_clients
+from controllers.metrics.exchange_clients import AsyncPooledExchange, get_exchange
+from controllers.metrics.market_data_service import MarketDataService
+
+
+ROWS = [[i * 3_600_000, 1, 2, 0.5, 1.5, 10] for i in range(5)]
+
+
+class _SyncExchange:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", limit: int = 500):
+        self.calls += 1
+        return [list(r) for r in ROWS[-limit:]]
+
+
+class _AsyncFacade:
+    """Plays `AsyncPooledExchange` for a service whose pooled client is `sync`."""
+
+    def __init__(self, sync):
+        self.sync = sync
+        self.calls = 0
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", limit: int = 500):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return [list(r) for r in ROWS[-limit:]]
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    MarketDataService.clear_cache()
+    yield
+    MarketDataService.clear_cache()
+
+
+def test_async_and_sync_paths_share_one_cache_entry():
+    svc = MarketDataService(exchange_name="binance")
+    fake = _SyncExchange()
+    svc.exchange = fake  # injected client: async path runs it in a thread
+
+    first = asyncio.run(svc.get_ohlcv_async("BTC/USDT", "1h", 5, drop_forming=False))
+    second = svc.get_ohlcv("BTC/USDT", "1h", 3, drop_forming=False)
+    third = asyncio.run(svc.get_ohlcv_async("BTC/USDT", "1h", 4, drop_forming=False))
+    assert fake.calls == 1
+    assert len(first) == 5 and len(second) == 3 and len(third) == 4
+    assert list(third["timestamp"]) == [r[0] for r in ROWS[-4:]]
+
+
+def test_concurrent_async_misses_are_awaited_once_on_the_native_client():
+    svc = MarketDataService(exchange_name="bitget")
+    sync = _SyncExchange()
+    svc.exchange = sync
+    svc.async_exchange = facade = _AsyncFacade(sync)
+
+    async def burst():
+        return await asyncio.gather(
+            *(svc.get_ohlcv_async("BTC/USDT", "1h", 5, drop_forming=False) for _ in range(10))
+        )
+
+    frames = asyncio.run(burst())
+    assert facade.calls == 1
+    assert sync.calls == 0  # nothing went through the blocking client
+    assert all(len(df) == 5 for df in frames)
+
+
+class _FakeAsyncClient:
+    instances = 0
+
+    def __init__(self, config):
+        type(self).instances += 1
+        self.rateLimit = 0
+        self.markets = None
+        self.loads = 0
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+
+    async def load_markets(self):
+        self.loads += 1
+        self.markets = {"BTC/USDT": {}}
+        return self.markets
+
+    async def fetch_ticker(self, symbol):
+        return {"symbol": symbol, "last": 2.0}
+
+
+class _FakeSyncClient:
+    def __init__(self, config):
+        self.rateLimit = 0
+        self.markets = None
+
+
+def test_async_client_reuses_markets_loaded_by_the_threaded_pool():
+    exchange_clients.reset_pools()
+    pooled = get_exchange("bitget", _FakeSyncClient)
+    pooled.pool._markets = {"BTC/USDT": {"id": "BTCUSDT"}}
+    facade = AsyncPooledExchange(pooled, _FakeAsyncClient)
+
+    async def run():
+        tickers = await asyncio.gather(*(facade.fetch_ticker("BTC/USDT") for _ in range(5)))
+        return tickers, facade._client()
+
+    tickers, client = asyncio.run(run())
+    assert [t["last"] for t in tickers] == [2.0] * 5
+    assert client.loads == 0 and client.markets == {"BTC/USDT": {"id": "BTCUSDT"}}
+    assert _FakeAsyncClient.instances == 1  # one client per event loop
+    exchange_clients.reset_pools()
@@ -0,0 +1,102 @@
+"""`MarketDataService.get_ohlcv_many`: dedupe, cache reuse, concurrent misses."""
+
+import asyncio
+import threading
+import time
+from typing import Any, List
+
+import pytest
+
+from controllers.metrics.market_data_service import MarketDataService
+
+HOUR_MS = 3_600_000
+
+
+class _SlowExchange:
+    """Thread-safe ccxt stand-in: ``delay_s`` per call, closed 1h candles."""
+
+    def __init__(self, delay_s: float = 0.0, failing: str = ""):
+        self.delay_s = delay_s
+        self.failing = failing
+        self.calls: List[Any] = []
+        self._lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", limit: int = 500, **kwargs):
+        with self._lock:
+            self.calls.append((symbol, timeframe, limit))
+        time.sleep(self.delay_s)
+        if symbol == self.failing:
+            raise RuntimeError(f"{symbol} delisted")
+        return [[i * HOUR_MS, 1, 2, 0.5, 1.5, 10] for i in range(limit)]
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    MarketDataService.clear_cache()
+    yield
+    MarketDataService.clear_cache()
+
+
+def _service(exchange: _SlowExchange) -> MarketDataService:
+    svc = MarketDataService(exchange_name="binance")
+    svc.exchange = exchange
+    return svc
+
+
+def test_duplicates_fetch_each_series_once_at_the_deepest_limit():
+    fake = _SlowExchange()
+    svc = _service(fake)
+    frames = svc.get_ohlcv_many(
+        [("BTC/USDT", "1h", 5), ("BTC/USDT", "1h", 3), ("ETH/USDT", "1h", 4), ("BTC/USDT", "1h", 5)]
+    )
+    assert sorted(fake.calls) == [("BTC/USDT", "1h", 5), ("ETH/USDT", "1h", 4)]
+    assert set(frames) == {("BTC/USDT", "1h", 5), ("BTC/USDT", "1h", 3), ("ETH/USDT", "1h", 4)}
+    assert len(frames[("BTC/USDT", "1h", 5)]) == 5
+    assert len(frames[("BTC/USDT", "1h", 3)]) == 3
+    assert frames[("BTC/USDT", "1h", 3)]["timestamp"].iloc[-1] == 4 * HOUR_MS
+
+
+def test_hits_are_served_from_the_shared_cache():
+    fake = _SlowExchange()
+    svc = _service(fake)
+    svc.get_ohlcv("BTC/USDT", "1h", 5)
+    fake.calls.clear()
+
+    frames = svc.get_ohlcv_many([("BTC/USDT", "1h", 5), ("ETH/USDT", "1h", 5)])
+    assert fake.calls == [("ETH/USDT", "1h", 5)]
+    # ...and the bulk fetch populated the cache for single lookups.
+    svc.get_ohlcv("ETH/USDT", "1h", 5)
+    assert len(fake.calls) == 1
+    assert len(frames) == 2
+
+
+def test_misses_are_fetched_concurrently():
+    fake = _SlowExchange(delay_s=0.05)
+    svc = _service(fake)
+    requests = [(f"C{i}/USDT", tf, 10) for i in range(8) for tf in ("1h", "4h")]
+    start = time.monotonic()
+    frames = svc.get_ohlcv_many(requests)
+    elapsed = time.monotonic() - start
+    assert len(frames) == 16 and len(fake.calls) == 16
+    assert elapsed < 16 * 0.05 / 2
+
+
+def test_failed_series_raise_or_map_to_the_exception():
+    svc = _service(_SlowExchange(failing="LUNA/USDT"))
+    with pytest.raises(RuntimeError, match="delisted"):
+        svc.get_ohlcv_many([("BTC/USDT", "1h", 5), ("LUNA/USDT", "1h", 5)])
+
+    frames = svc.get_ohlcv_many(
+        [("BTC/USDT", "1h", 5), ("LUNA/USDT", "1h", 5)], return_exceptions=True
+    )
+    assert isinstance(frames[("LUNA/USDT", "1h", 5)], RuntimeError)
+    assert len(frames[("BTC/USDT", "1h", 5)]) == 5
+
+
+def test_async_variant_matches_the_sync_one():
+    fake = _SlowExchange(delay_s=0.02)
+    svc = _service(fake)
+    requests = [("BTC/USDT", "1h", 5), ("BTC/USDT", "1h", 2), ("ETH/USDT", "4h", 3)]
+    frames = asyncio.run(svc.get_ohlcv_many_async(requests))
+    assert len(fake.calls) == 2
+    assert [len(frames[r]) for r in requests] == [5, 2, 3]
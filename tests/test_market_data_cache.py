@@ -2,6 +2,7 @@
 
 from typing import Any, List
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -39,7 +40,7 @@ def test_cache_returns_same_data_without_extra_fetch():
     pd.testing.assert_frame_equal(first, second)
 
 
-def test_cache_returns_defensive_copy():
+def test_cache_hits_are_read_only_zero_copy_views():
     # Use distinct timestamps so the index is unique (the rows the fake
     # exchange returns in the other tests share the same timestamp on
     # purpose to make those assertions readable).
@@ -49,10 +50,17 @@ def test_cache_returns_defensive_copy():
     )
     svc.exchange = fake
 
-    first = svc.get_ohlcv("BTC/USDT", "1h", 3)
-    first.iat[0, first.columns.get_loc("close")] = 999  # mutate returned DF
-    second = svc.get_ohlcv("BTC/USDT", "1h", 3)
+    first = svc.get_ohlcv("BTC/USDT", "1h", 3, drop_forming=False)
+    with pytest.raises(ValueError, match="read-only"):
+        first.iat[0, first.columns.get_loc("close")] = 999  # mutate returned DF
+    second = svc.get_ohlcv("BTC/USDT", "1h", 2, drop_forming=False)
     assert second.iat[0, second.columns.get_loc("close")] != 999
+    # Same memory, no copy per hit.
+    assert np.shares_memory(first["close"].to_numpy(), second["close"].to_numpy())
+    # Adding a column stays local to the caller's frame.
+    second["extra"] = 1.0
+    third = svc.get_ohlcv("BTC/USDT", "1h", 3, drop_forming=False)
+    assert "extra" not in third.columns
 
 
 def test_cache_disabled_when_use_cache_false():
@@ -65,7 +73,7 @@ def test_cache_disabled_when_use_cache_false():
     assert fake.calls == 2
 
 
-def test_cache_keyed_by_symbol_timeframe_and_limit():
+def test_cache_keyed_by_symbol_and_timeframe_not_limit():
     svc = MarketDataService(exchange_name="binance")
     fake = _FakeExchange([[1, 1, 1, 1, 1, 1] for _ in range(2)])
     svc.exchange = fake
@@ -73,8 +81,38 @@ def test_cache_keyed_by_symbol_timeframe_and_limit():
     svc.get_ohlcv("BTC/USDT", "1h", 2)
     svc.get_ohlcv("ETH/USDT", "1h", 2)
     svc.get_ohlcv("BTC/USDT", "5m", 2)
-    svc.get_ohlcv("BTC/USDT", "1h", 3)
+    svc.get_ohlcv("BTC/USDT", "1h", 3)  # deeper than the cached frame: refetched
     assert fake.calls == 4
+    svc.get_ohlcv("BTC/USDT", "1h", 1)  # shallower: a slice of the same entry
+    svc.get_ohlcv("BTC/USDT", "1h", 2)
+    assert fake.calls == 4
+
+
+def test_smaller_limit_is_served_from_a_deeper_cached_frame():
+    svc = MarketDataService(exchange_name="binance")
+    fake = _FakeExchange([[i * 60_000, i, i, i, i, 1] for i in range(10)])
+    svc.exchange = fake
+
+    deep = svc.get_ohlcv("BTC/USDT", "1h", 10)
+    shallow = svc.get_ohlcv("BTC/USDT", "1h", 4)
+    assert fake.calls == 1
+    pd.testing.assert_frame_equal(shallow, deep.iloc[-4:])
+
+
+def test_larger_limit_grows_the_entry_in_place():
+    svc = MarketDataService(exchange_name="binance")
+    fake = _FakeExchange([[i * 60_000, i, i, i, i, 1] for i in range(10)])
+    svc.exchange = fake
+
+    svc.get_ohlcv("BTC/USDT", "1h", 4)
+    grown = svc.get_ohlcv("BTC/USDT", "1h", 10)
+    assert fake.calls == 2
+    assert len(grown) == 10
+    # Both depths are now served by the single grown entry.
+    svc.get_ohlcv("BTC/USDT", "1h", 4)
+    svc.get_ohlcv("BTC/USDT", "1h", 10)
+    assert fake.calls == 2
+    assert sum(len(cache) for cache in MarketDataService._CACHES.values()) == 1
 
 
 def test_stale_candle_not_reused_after_close_despite_long_ttl(monkeypatch):
@@ -181,3 +219,180 @@ def test_expected_last_closed_candle_ts_steps_at_candle_close():
     assert after_close == inside + 1800 * 1000  # advanced exactly one candle
     # Unknown timeframes have no alignment to bind to.
     assert expected_last_closed_candle_ts("??", base) is None
+
+
+# ---------------------------------------------------------------------------
+# Incremental tail refresh at candle close
+# ---------------------------------------------------------------------------
+
+class _GridExchange:
+    """30m candles on the real grid; honours `since` like ccxt does."""
+
+    STEP = 1800 * 1000
+
+    def __init__(self, first_open_ms: int, n: int):
+        self.rows = [[first_open_ms + i * self.STEP, i, i + 1, i - 1, i, 1] for i in range(n)]
+        self.calls: List[dict] = []
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "30m", since=None, limit: int = 500):
+        self.calls.append({"since": since, "limit": limit})
+        if since is None:
+            return [list(r) for r in self.rows[-limit:]]
+        return [list(r) for r in self.rows if r[0] >= since][:limit]
+
+
+def _grid_clock(monkeypatch, seconds: float):
+    from controllers.metrics import market_data_service as mds
+
+    clock = {"t": seconds}
+    monkeypatch.setattr(mds, "_now", lambda: clock["t"])
+    return clock
+
+
+def test_key_rotation_refreshes_only_the_tail(monkeypatch):
+    base_s = 900_000 * 1800  # a 30m boundary
+    clock = _grid_clock(monkeypatch, base_s + 600.0)
+    # 100 candles, the last one (opened at base_s) is forming.
+    ex = _GridExchange(base_s * 1000 - 99 * _GridExchange.STEP, 100)
+    svc = MarketDataService(exchange_name="bitget")
+    svc.exchange = ex
+
+    before = svc.get_ohlcv("BTC/USDT", "30m", 20, drop_forming=False)
+    assert ex.calls == [{"since": None, "limit": 20}]
+
+    # The forming candle closes (with a different close) and a new one opens.
+    ex.rows[-1][4] = 123.0
+    ex.rows.append([base_s * 1000 + _GridExchange.STEP, 0, 0, 0, 0, 1])
+    clock["t"] += 1800
+
+    after = svc.get_ohlcv("BTC/USDT", "30m", 20, drop_forming=False)
+    assert ex.calls[-1] == {"since": base_s * 1000, "limit": 3}
+    assert len(after) == 20
+    assert after["timestamp"].is_monotonic_increasing
+    assert after["timestamp"].iloc[0] == before["timestamp"].iloc[1]  # head dropped
+    assert after["close"].iloc[-2] == 123.0  # the repainted candle was refreshed
+    full = MarketDataService._to_frame(ex.fetch_ohlcv("BTC/USDT", "30m", limit=20))
+    pd.testing.assert_frame_equal(after, full)
+
+
+def test_tail_refresh_falls_back_to_full_fetch_when_frames_do_not_line_up(monkeypatch):
+    base_s = 900_000 * 1800
+    clock = _grid_clock(monkeypatch, base_s + 600.0)
+    ex = _GridExchange(base_s * 1000 - 99 * _GridExchange.STEP, 100)
+    svc = MarketDataService(exchange_name="bitget")
+    svc.exchange = ex
+    svc.get_ohlcv("BTC/USDT", "30m", 20)
+
+    # The exchange lost the previous forming candle: `since` no longer anchors.
+    ex.rows.pop()
+    ex.rows.append([base_s * 1000 + _GridExchange.STEP, 0, 0, 0, 0, 1])
+    clock["t"] += 1800
+
+    svc.get_ohlcv("BTC/USDT", "30m", 20)
+    assert ex.calls[-1] == {"since": None, "limit": 20}
+
+
+@pytest.mark.parametrize("defect", ["hole", "lagging"])
+def test_tail_refresh_falls_back_to_full_fetch_on_a_broken_batch(monkeypatch, defect):
+    base_s = 900_000 * 1800
+    clock = _grid_clock(monkeypatch, base_s + 600.0)
+    ex = _GridExchange(base_s * 1000 - 99 * _GridExchange.STEP, 100)
+    svc = MarketDataService(exchange_name="bitget")
+    svc.exchange = ex
+    svc.get_ohlcv("BTC/USDT", "30m", 20)
+
+    clock["t"] += 2 * 1800  # two closes later
+    if defect == "hole":  # the exchange skipped the first new candle
+        ex.rows.append([base_s * 1000 + 2 * _GridExchange.STEP, 0, 0, 0, 0, 1])
+    # "lagging": the exchange has not published any new candle yet.
+
+    svc.get_ohlcv("BTC/USDT", "30m", 20)
+    assert ex.calls[-2] == {"since": base_s * 1000, "limit": 4}
+    assert ex.calls[-1] == {"since": None, "limit": 20}
+
+
+def test_tail_refresh_skipped_when_too_many_candles_missing(monkeypatch):
+    base_s = 900_000 * 1800
+    clock = _grid_clock(monkeypatch, base_s + 600.0)
+    ex = _GridExchange(base_s * 1000 - 99 * _GridExchange.STEP, 100)
+    svc = MarketDataService(exchange_name="bitget")
+    svc.exchange = ex
+    svc.get_ohlcv("BTC/USDT", "30m", 20)
+
+    clock["t"] += 1800 * 30  # 30 candles later: more than the 20-row window
+    svc.get_ohlcv("BTC/USDT", "30m", 20)
+    assert ex.calls[-1] == {"since": None, "limit": 20}
+
+
+def test_cached_block_uses_float32_volume_only_when_lossless():
+    from controllers.metrics import market_data_service as mds
+
+    whole = mds._pack(mds.MarketDataService._to_frame([[i * 60_000, 1, 2, 0.5, 1.5, 7] for i in range(3)]))
+    fractional = mds._pack(mds.MarketDataService._to_frame([[i * 60_000, 1, 2, 0.5, 1.5, 0.1] for i in range(3)]))
+    assert whole.dtype["volume"] == np.dtype("<f4")
+    assert fractional.dtype["volume"] == np.dtype("<f8")
+
+    frame = mds._unpack(whole)
+    assert frame["volume"].dtype == np.float64
+    assert (frame["volume"] == 7.0).all()
+    with pytest.raises(ValueError, match="read-only"):
+        frame.iat[0, frame.columns.get_loc("volume")] = 1.0
+
+
+def test_byte_budget_evicts_the_least_recently_used_entries(monkeypatch):
+    from controllers.metrics.cache_stats import STATS
+
+    STATS.reset()
+    svc = MarketDataService(exchange_name="binance")
+    svc.exchange = _FakeExchange([[i * 60_000, 1, 1, 1, 1, 1] for i in range(400)])
+    svc.get_ohlcv("BTC/USDT", "1h", 400, drop_forming=False)
+    svc.exchange = _FakeExchange([[i * 60_000, 1, 1, 1, 1, 1] for i in range(10)])
+    svc.get_ohlcv("ETH/USDT", "1h", 10, drop_forming=False)
+    svc.get_ohlcv("SOL/USDT", "1h", 10, drop_forming=False)
+
+    sizes = MarketDataService._cache_gauge()
+    monkeypatch.setattr(MarketDataService, "_CACHE_BUDGET_BYTES", sizes["1h"][1] - 1)
+    svc.get_ohlcv("ETH/USDT", "1h", 10, drop_forming=False)  # touch
+    svc.get_ohlcv("XRP/USDT", "1h", 10, drop_forming=False)  # triggers the budget
+
+    calls = svc.exchange.calls
+    svc.get_ohlcv("ETH/USDT", "1h", 10, drop_forming=False)
+    svc.get_ohlcv("SOL/USDT", "1h", 10, drop_forming=False)
+    assert svc.exchange.calls == calls  # small entries survived
+    svc.exchange = _FakeExchange([[i * 60_000, 1, 1, 1, 1, 1] for i in range(400)])
+    svc.get_ohlcv("BTC/USDT", "1h", 400, drop_forming=False)
+    assert svc.exchange.calls == 1  # the large one was evicted
+    assert STATS.snapshot()["ohlcv"]["1h"]["evictions"] >= 1
+
+
+def test_budget_keeps_a_running_total_of_the_held_entries():
+    from controllers.metrics import market_data_service as mds
+
+    svc = MarketDataService(exchange_name="binance")
+    svc.exchange = _FakeExchange([[i * 60_000, 1, 1, 1, 1, 1] for i in range(400)])
+    svc.get_ohlcv("BTC/USDT", "1h", 400, drop_forming=False)
+    svc.exchange = _FakeExchange([[i * 60_000, 1, 1, 1, 1, 1] for i in range(10)])
+    svc.get_ohlcv("ETH/USDT", "1h", 10, drop_forming=False)
+
+    budget = MarketDataService._BUDGET
+    cache = MarketDataService._CACHES["1h"]
+    btc = next(entry for key, entry in cache.items() if key[1] == "BTC/USDT")
+    eth = next(entry for key, entry in cache.items() if key[1] == "ETH/USDT")
+    assert budget.bytes == btc.nbytes + eth.nbytes  # each counted once, tail map included
+    assert list(budget.lru) == [btc, eth]
+
+    cache.pop(next(key for key in cache if key[1] == "BTC/USDT"))
+    assert budget.bytes == btc.nbytes + eth.nbytes  # still held by the tail-refresh map
+    del MarketDataService._TAIL_FRAMES[("binance", "BTC/USDT", "1h")]
+    assert budget.bytes == eth.nbytes and list(budget.lru) == [eth]
+
+    clock = [0.0]
+    probe = mds._EntryCache(4, 10, budget=budget, name="probe", timer=lambda: clock[0])
+    probe["k"] = btc
+    assert budget.bytes == btc.nbytes + eth.nbytes
+    clock[0] = 11.0
+    assert probe.expire() == [("k", btc)]
+    assert budget.bytes == eth.nbytes
+
+    MarketDataService.clear_cache()
+    assert budget.bytes == 0 and not budget.lru
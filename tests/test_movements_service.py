@@ -4,7 +4,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from controllers.metrics import movements_service as ms_module
+from controllers.metrics import indicator_cache
+from controllers.metrics.indicators_service import IndicatorsService
 from controllers.metrics.movements_service import MovementsService
 
 
@@ -22,28 +23,41 @@ def _flat_df(price: float = 30000.0, n: int = 300) -> pd.DataFrame:
         index=pd.date_range("2025-01-01", periods=n, freq="h", tz="UTC"),
     )
     df.index.name = "datetime"
+    # Like MarketDataService frames: identifiable, so `indicator_cache` serves it.
+    df.insert(0, "timestamp", df.index.asi8 // 1_000_000)
     return df
 
 
+@pytest.fixture(autouse=True)
+def _empty_indicator_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
 def _patch_market_data(monkeypatch, df: pd.DataFrame):
     monkeypatch.setattr(MovementsService, "_load_market_data", lambda self: df)
 
 
+def _force_atr(monkeypatch, atr: float) -> None:
+    """Pin the ATR the indicator steps report (cached path included)."""
+    real_run_steps = IndicatorsService.run_steps
+
+    def run_steps(self, steps):
+        out = real_run_steps(self, steps)
+        if "atr" in out:
+            out["atr"] = atr
+        return out
+
+    monkeypatch.setattr(IndicatorsService, "run_steps", run_steps)
+
+
 def test_atr_sizing_stop_distance(monkeypatch):
     """`stop_distance` must equal ATR * atr_mult_stop."""
     df = _flat_df()
     _patch_market_data(monkeypatch, df)
 
-    captured: dict = {}
-    real_calc_all = ms_module.IndicatorsService.calculate_all
-
-    def fake_calc(self):
-        out = real_calc_all(self)
-        out["atr"] = 1000.0  # force a deterministic ATR
-        captured["atr"] = out["atr"]
-        return out
-
-    monkeypatch.setattr(ms_module.IndicatorsService, "calculate_all", fake_calc)
+    _force_atr(monkeypatch, 1000.0)  # force a deterministic ATR
 
     svc = MovementsService(
         symbol="BTC/USDT",
@@ -54,6 +68,7 @@ def test_atr_sizing_stop_distance(monkeypatch):
     )
     result = svc.execute()
     assert result["long"]["stop_distance"] == pytest.approx(1500.0, rel=1e-6)
+    assert len(indicator_cache._CACHE) == 1  # served through the shared cache
 
 
 def test_atr_sizing_r_multiple(monkeypatch):
@@ -61,12 +76,7 @@ def test_atr_sizing_r_multiple(monkeypatch):
     df = _flat_df()
     _patch_market_data(monkeypatch, df)
 
-    real_calc_all = ms_module.IndicatorsService.calculate_all
-    monkeypatch.setattr(
-        ms_module.IndicatorsService,
-        "calculate_all",
-        lambda self: {**real_calc_all(self), "atr": 500.0},
-    )
+    _force_atr(monkeypatch, 500.0)
     svc = MovementsService(
         symbol="BTC/USDT",
         capital=10000.0,
@@ -104,12 +114,7 @@ def test_position_size_respects_risk(monkeypatch):
     """`dollar_risk` should equal capital * risk_per_trade_pct / 100."""
     df = _flat_df()
     _patch_market_data(monkeypatch, df)
-    real_calc_all = ms_module.IndicatorsService.calculate_all
-    monkeypatch.setattr(
-        ms_module.IndicatorsService,
-        "calculate_all",
-        lambda self: {**real_calc_all(self), "atr": 800.0},
-    )
+    _force_atr(monkeypatch, 800.0)
     svc = MovementsService(
         symbol="BTC/USDT",
         capital=10000.0,
@@ -127,12 +132,7 @@ def test_position_size_usd_is_notional_not_risk(monkeypatch):
     must NOT be the same figure as `dollar_risk`."""
     df = _flat_df()
     _patch_market_data(monkeypatch, df)
-    real_calc_all = ms_module.IndicatorsService.calculate_all
-    monkeypatch.setattr(
-        ms_module.IndicatorsService,
-        "calculate_all",
-        lambda self: {**real_calc_all(self), "atr": 800.0},
-    )
+    _force_atr(monkeypatch, 800.0)
     svc = MovementsService(
         symbol="BTC/USDT",
         capital=10000.0,
@@ -0,0 +1,126 @@
+"""Local higher-timeframe resampling: grid anchors, strictness, service wiring."""
+
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from controllers.metrics import market_data_service as mds
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.ohlcv_resample import resample_ohlcv, resample_ratio
+
+HOUR_MS = 3_600_000
+DAY_MS = 24 * HOUR_MS
+MONDAY_MS = 1_767_571_200_000  # 2026-01-05T00:00:00Z
+
+
+def _base(start_ms: int, step_ms: int, n: int) -> pd.DataFrame:
+    ts = start_ms + step_ms * np.arange(n, dtype=np.int64)
+    i = np.arange(n, dtype=float)
+    df = pd.DataFrame(
+        {"timestamp": ts, "open": 100 + i, "high": 101 + i, "low": 99 + i, "close": 100.5 + i, "volume": 1.0 + i}
+    )
+    df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
+    return df.set_index("datetime")
+
+
+def test_ratio_requires_nesting_grids():
+    assert resample_ratio("1h", "4h") == 4
+    assert resample_ratio("1d", "1w") == 7
+    assert resample_ratio("6h", "1w") == 28  # Monday anchor is a 6h boundary
+    assert resample_ratio("8h", "3d", "binance") == 9  # 1-day offset is an 8h boundary
+    assert resample_ratio("4h", "6h") is None
+    assert resample_ratio("3d", "1w") is None
+    assert resample_ratio("4h", "1h") is None
+    assert resample_ratio("1h", "1M") is None
+
+
+def test_weekly_buckets_open_on_monday():
+    # 38 daily candles starting on a Wednesday: the first partial week is
+    # dropped, every bucket opens on a Monday.
+    base = _base(MONDAY_MS + 2 * DAY_MS, DAY_MS, 38)
+    weekly = resample_ohlcv(base, "1d", "1w", limit=5)
+    assert weekly is not None and len(weekly) == 5
+    assert (weekly.index.dayofweek == 0).all()
+    week_open = weekly["timestamp"].iloc[0]
+    first = base[(base["timestamp"] >= week_open) & (base["timestamp"] < week_open + 7 * DAY_MS)]
+    row = weekly.iloc[0]
+    assert row["open"] == first["open"].iloc[0]
+    assert row["high"] == first["high"].max()
+    assert row["low"] == first["low"].min()
+    assert row["close"] == first["close"].iloc[-1]
+    assert row["volume"] == pytest.approx(first["volume"].sum())
+    # The last bucket is the forming week (partial, without holes).
+    assert len(base[base["timestamp"] >= weekly["timestamp"].iloc[-1]]) == 5
+
+
+def test_three_day_grid_follows_the_exchange_anchor():
+    base = _base(MONDAY_MS, DAY_MS, 30)
+    binance = resample_ohlcv(base, "1d", "3d", limit=5, exchange="binance")
+    bitget = resample_ohlcv(base, "1d", "3d", limit=5, exchange="bitget")
+    assert ((binance["timestamp"] - DAY_MS) % (3 * DAY_MS) == 0).all()
+    assert (bitget["timestamp"] % (3 * DAY_MS) == 0).all()
+
+
+def test_gaps_and_short_series_are_refused():
+    base = _base(MONDAY_MS, HOUR_MS, 48)
+    assert resample_ohlcv(base, "1h", "4h", limit=12) is not None
+    assert resample_ohlcv(base, "1h", "4h", limit=13) is None
+    holed = base.drop(base.index[10])
+    assert resample_ohlcv(holed, "1h", "4h", limit=5) is None
+
+
+# ---------------------------------------------------------------------------
+# MarketDataService wiring
+# ---------------------------------------------------------------------------
+
+class _GridExchange:
+    """Returns the ``limit`` candles of ``timeframe`` ending at the forming one."""
+
+    def __init__(self, now_ms: int):
+        self.now_ms = now_ms
+        self.calls: List[Any] = []
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", limit=500, **kwargs):
+        self.calls.append((timeframe, limit))
+        step = mds._TIMEFRAME_TO_SECONDS[timeframe] * 1000
+        forming = self.now_ms // step * step
+        df = _base(forming - (limit - 1) * step, step, limit)
+        return df[["timestamp", "open", "high", "low", "close", "volume"]].values.tolist()
+
+
+@pytest.fixture
+def resampling(monkeypatch):
+    now_ms = MONDAY_MS + 10 * DAY_MS + 90 * 60_000  # 01:30 on a Thursday
+    monkeypatch.setattr(mds, "_now", lambda: now_ms / 1000)
+    monkeypatch.setattr(mds, "RESAMPLE_BASES", ("1h",))
+    monkeypatch.setattr(mds, "RESAMPLE_BASE_LIMIT", 200)
+    MarketDataService.clear_cache()
+    svc = MarketDataService(exchange_name="binance")
+    svc.exchange = _GridExchange(now_ms)
+    yield svc
+    MarketDataService.clear_cache()
+
+
+def test_higher_timeframe_is_built_from_the_cached_base(resampling):
+    svc = resampling
+    svc.get_ohlcv("BTC/USDT", "1h", 50)
+    assert svc.exchange.calls == [("1h", 200)]  # base fetched deep
+
+    four_h = svc.get_ohlcv("BTC/USDT", "4h", 40, drop_forming=False)
+    assert svc.exchange.calls == [("1h", 200)]  # no round trip
+    assert len(four_h) == 40
+    assert (four_h["timestamp"] % (4 * HOUR_MS) == 0).all()
+    native = svc.exchange.fetch_ohlcv("BTC/USDT", "4h", 40)
+    assert four_h["timestamp"].tolist() == [row[0] for row in native]
+    assert mds.STATS.snapshot()["ohlcv"]["4h"]["resampled"] >= 1
+
+
+def test_falls_back_to_a_native_fetch_when_the_base_is_too_short(resampling):
+    svc = resampling
+    svc.get_ohlcv("BTC/USDT", "1h", 50)
+    svc.get_ohlcv("BTC/USDT", "1d", 30)  # needs 720 hourly candles
+    assert svc.exchange.calls[-1] == ("1d", 30)
+    svc.get_ohlcv("BTC/USDT", "6h", 10, drop_forming=False)
+    assert svc.exchange.calls[-1] == ("1d", 30)  # 6h came from the base
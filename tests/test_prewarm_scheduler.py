@@ -0,0 +1,100 @@
+"""Candle-close prewarm scheduler: fires on the exchange grid, warms once per close."""
+
+from typing import List, Tuple
+
+import pytest
+
+from controllers.metrics.prewarm_scheduler import PrewarmScheduler
+from controllers.metrics.setup_evaluation_service import SetupEvaluationService
+
+# A Monday 00:00 UTC: every ladder timeframe (incl. the Monday-anchored 1w)
+# has a candle boundary here.
+MONDAY_S = 1_767_571_200  # 2026-01-05T00:00:00Z
+
+
+@pytest.fixture
+def warmed(monkeypatch) -> List[Tuple[str, str]]:
+    calls: List[Tuple[str, str]] = []
+
+    def fake_warm(self, timeframe):
+        calls.append((self.symbol, timeframe))
+
+    monkeypatch.setattr(SetupEvaluationService, "warm", fake_warm)
+    return calls
+
+
+def test_sleeps_until_the_next_close_plus_delay():
+    scheduler = PrewarmScheduler(symbols=["BTC/USDT"], timeframes=["15m", "4h"], delay_s=2)
+    assert scheduler.seconds_until_next_run(MONDAY_S + 60) == pytest.approx(14 * 60 + 2)
+    # Woken a hair early: still targets the close it was waiting for.
+    assert scheduler.seconds_until_next_run(MONDAY_S + 15 * 60 + 1.99) == pytest.approx(0.01)
+
+
+def test_weekly_close_follows_the_monday_anchor():
+    scheduler = PrewarmScheduler(symbols=["BTC/USDT"], timeframes=["1w"], delay_s=0)
+    # Thursday 00:00 UTC (the epoch weekday) is NOT a weekly close.
+    thursday = MONDAY_S + 3 * 86_400
+    assert scheduler.seconds_until_next_run(thursday) == pytest.approx(4 * 86_400)
+
+
+def test_each_close_is_warmed_once_and_only_for_closed_timeframes(warmed):
+    scheduler = PrewarmScheduler(
+        symbols=["BTC/USDT", "ETH/USDT"], timeframes=["15m", "1h"], delay_s=2
+    )
+    first = scheduler.run_once(MONDAY_S + 5)
+    assert sorted(first) == sorted(
+        [("BTC/USDT", "15m"), ("ETH/USDT", "15m"), ("BTC/USDT", "1h"), ("ETH/USDT", "1h")]
+    )
+
+    assert scheduler.run_once(MONDAY_S + 60) == []  # nothing closed since
+
+    warmed.clear()
+    scheduler.run_once(MONDAY_S + 15 * 60 + 2)  # 15m closed, 1h still forming
+    assert warmed == [("BTC/USDT", "15m"), ("ETH/USDT", "15m")]
+
+
+def test_failed_refresh_is_retried_on_the_next_run(monkeypatch):
+    attempts: List[str] = []
+
+    def flaky(self, timeframe):
+        attempts.append(timeframe)
+        if len(attempts) == 1:
+            raise RuntimeError("exchange down")
+
+    monkeypatch.setattr(SetupEvaluationService, "warm", flaky)
+    scheduler = PrewarmScheduler(symbols=["BTC/USDT"], timeframes=["1h"], delay_s=0)
+    assert scheduler.run_once(MONDAY_S + 10) == []
+    assert scheduler.run_once(MONDAY_S + 20) == [("BTC/USDT", "1h")]
+
+
+def test_failed_refresh_is_retried_with_backoff_before_the_next_close(monkeypatch):
+    def down(self, timeframe):
+        raise RuntimeError("exchange down")
+
+    monkeypatch.setattr(SetupEvaluationService, "warm", down)
+    scheduler = PrewarmScheduler(symbols=["BTC/USDT"], timeframes=["1h"], delay_s=0, retry_s=5)
+    assert scheduler.seconds_until_next_attempt(MONDAY_S + 10) == pytest.approx(3600 - 10)
+
+    scheduler.run_once(MONDAY_S + 10)
+    assert scheduler.seconds_until_next_attempt(MONDAY_S + 10) == pytest.approx(5)
+    scheduler.run_once(MONDAY_S + 15)
+    assert scheduler.seconds_until_next_attempt(MONDAY_S + 15) == pytest.approx(10)
+    for _ in range(10):
+        scheduler.run_once(MONDAY_S + 25)
+    assert scheduler.seconds_until_next_attempt(MONDAY_S + 25) == pytest.approx(160)  # capped at 32x
+    # The backoff never overshoots the next close.
+    assert scheduler.seconds_until_next_attempt(MONDAY_S + 3550) == pytest.approx(50)
+
+    monkeypatch.setattr(SetupEvaluationService, "warm", lambda self, timeframe: None)
+    assert scheduler.run_once(MONDAY_S + 30) == [("BTC/USDT", "1h")]
+    assert scheduler.seconds_until_next_attempt(MONDAY_S + 30) == pytest.approx(3600 - 30)
+
+
+def test_disabled_without_symbols(monkeypatch):
+    monkeypatch.delenv("PREWARM_SYMBOLS", raising=False)
+    assert PrewarmScheduler.from_env() is None
+    monkeypatch.setenv("PREWARM_SYMBOLS", "BTC/USDT, ETH/USDT")
+    monkeypatch.setenv("PREWARM_TIMEFRAMES", "1h,4h")
+    scheduler = PrewarmScheduler.from_env()
+    assert scheduler.symbols == ["BTC/USDT", "ETH/USDT"]
+    assert scheduler.timeframes == ["1h", "4h"]
@@ -0,0 +1,115 @@
+"""Offline replay exchange: ccxt-shaped answers from the committed fixtures."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import ccxt
+import numpy as np
+import pytest
+
+from controllers.metrics import exchange_clients
+from controllers.metrics import market_data_service as mds
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.replay_exchange import ReplayExchange, synthesize_history
+
+FIXTURES = Path(__file__).parent / "fixtures"
+H1 = json.loads((FIXTURES / "btc_usdt_bitget_1h_20260713T1600.json").read_text())
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture(autouse=True)
+def _isolated():
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+    yield
+    MarketDataService.clear_cache()
+    exchange_clients.reset_pools()
+
+
+def test_serves_fixture_candles_with_since_and_limit():
+    exchange = ReplayExchange(align_to_now=False)
+    tail = exchange.fetch_ohlcv("BTC/USDT", "1h", limit=5)
+    assert tail == [[int(row[0]), *row[1:]] for row in H1[-5:]]
+
+    since = int(H1[100][0])
+    page = exchange.fetch_ohlcv("BTC/USDT", "1h", since=since + 1, limit=3)
+    assert [row[0] for row in page] == [int(H1[i][0]) for i in (101, 102, 103)]
+    assert len(exchange.fetch_ohlcv("BTC/USDT", "1h", limit=5000)) == len(H1)
+
+
+def test_weekly_timestamps_are_integer_and_monday_aligned():
+    rows = ReplayExchange().fetch_ohlcv("BTC/USDT", "1w", limit=10)
+    assert all(isinstance(row[0], int) for row in rows)
+    offset = mds._GRID_ANCHOR_OFFSET_MS["1w"]
+    assert all((row[0] - offset) % (7 * 24 * HOUR_MS) == 0 for row in rows)
+
+
+def test_aligned_series_ends_with_the_forming_candle(monkeypatch):
+    now_s = 1_800_000_000.0
+    monkeypatch.setattr(mds, "_now", lambda: now_s)
+    svc = MarketDataService(exchange_name="replay")
+    raw = svc.get_ohlcv("BTC/USDT", "1h", 10, drop_forming=False)
+    closed = svc.get_ohlcv("BTC/USDT", "1h", 10)
+    assert int(raw["timestamp"].iloc[-1]) == int(now_s * 1000) // HOUR_MS * HOUR_MS
+    assert len(closed) == 9
+    # Prices untouched by the shift.
+    assert raw["close"].tolist() == [row[4] for row in H1[-10:]]
+
+
+def test_synthetic_history_is_long_deterministic_and_continuous():
+    exchange = ReplayExchange(min_candles=3000, align_to_now=False)
+    rows = np.asarray(exchange.fetch_ohlcv("BTC/USDT", "1h", since=0, limit=1000))
+    again = np.asarray(ReplayExchange(min_candles=3000, align_to_now=False).fetch_ohlcv("BTC/USDT", "1h", since=0, limit=1000))
+    np.testing.assert_array_equal(rows, again)
+    assert (np.diff(rows[:, 0]) == HOUR_MS).all()
+    np.testing.assert_allclose(rows[1:, 1], rows[:-1, 4])  # open == previous close
+    assert (rows[:, 2] >= np.maximum(rows[:, 1], rows[:, 4])).all()
+    assert (rows[:, 3] <= np.minimum(rows[:, 1], rows[:, 4])).all()
+
+    real = np.asarray(H1)
+    extended = synthesize_history(real, 3000, HOUR_MS, seed=1)
+    assert len(extended) == 3000
+    np.testing.assert_array_equal(extended[-len(real):], real)
+
+
+def test_other_symbols_are_rescaled_copies_and_tickers_work():
+    exchange = ReplayExchange(align_to_now=False)
+    btc = exchange.fetch_ohlcv("BTC/USDT", "4h", limit=3)
+    eth = exchange.fetch_ohlcv("ETH/USDT", "4h", limit=3)
+    assert [row[0] for row in btc] == [row[0] for row in eth]
+    ratio = eth[0][4] / btc[0][4]
+    assert eth[-1][4] / btc[-1][4] == pytest.approx(ratio)
+
+    ticker = exchange.fetch_ticker("BTC/USDT")
+    assert ticker["bid"] < ticker["last"] < ticker["ask"]
+    assert set(exchange.fetch_tickers(["BTC/USDT", "ETH/USDT"])) == {"BTC/USDT", "ETH/USDT"}
+
+
+def test_latency_and_unknown_timeframes():
+    exchange = ReplayExchange(latency_ms=30)
+    start = time.monotonic()
+    exchange.fetch_ohlcv("BTC/USDT", "1d", limit=2)
+    assert time.monotonic() - start >= 0.03
+
+    with pytest.raises(ccxt.BadRequest):
+        exchange.fetch_ohlcv("BTC/USDT", "15m", limit=2)
+
+
+def test_not_registered_unless_enabled():
+    # The registry is built at import time: check it in a fresh interpreter.
+    code = (
+        "from controllers.metrics.market_data_service import MarketDataService as M\n"
+        "assert 'replay' not in M.SUPPORTED_EXCHANGES\n"
+        "try:\n"
+        "    M(exchange_name='replay')\n"
+        "except ValueError as exc:\n"
+        "    print(exc)\n"
+    )
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env = {**os.environ, "REPLAY_EXCHANGE_ENABLED": "0", "PYTHONPATH": src}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert "Exchange no soportado: replay" in out.stdout
@@ -0,0 +1,70 @@
+"""Golden parity of `rolling_percentile_rank` against pandas `rank(pct=True)`.
+
+The reference is the exact expression the legacy BBWP used before the
+kernel existed; results must be identical bit for bit (NaN positions
+included), not merely close.
+"""
+
+import json
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pandas_ta_classic as ta
+import pytest
+
+from controllers.metrics.indicators_service import IndicatorsService
+from controllers.metrics.rolling_rank import rolling_percentile_rank
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+
+def _pandas_rank(values: pd.Series, window: int, min_periods: int = 1) -> pd.Series:
+    return values.rolling(window, min_periods=min_periods).apply(lambda x: x.rank(pct=True).iloc[-1], raw=False)
+
+
+def _assert_identical(actual: pd.Series, expected: pd.Series) -> None:
+    np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+    assert actual.index.equals(expected.index)
+
+
+@pytest.mark.parametrize(
+    "window, min_periods",
+    [(window, min_periods) for window in (1, 2, 5, 20, 252) for min_periods in (0, 1, 3) if min_periods <= window],
+)
+def test_random_series_with_ties_and_gaps(window, min_periods):
+    rng = np.random.default_rng(window * 10 + min_periods)
+    values = pd.Series(np.round(rng.normal(size=600), 1))  # plenty of exact ties
+    values.iloc[:19] = np.nan  # indicator warmup
+    values.iloc[rng.choice(np.arange(19, 600), 30, replace=False)] = np.nan
+    values.iloc[100] = np.inf  # pandas' rolling treats ±inf as NaN
+    values.iloc[200] = -np.inf
+    _assert_identical(rolling_percentile_rank(values, window, min_periods), _pandas_rank(values, window, min_periods))
+
+
+def test_constant_and_short_series():
+    _assert_identical(rolling_percentile_rank(pd.Series([3.0] * 10), 4), _pandas_rank(pd.Series([3.0] * 10), 4))
+    empty = pd.Series([], dtype="float64")
+    assert rolling_percentile_rank(empty, 5).empty
+    nans = pd.Series([np.nan] * 5)
+    _assert_identical(rolling_percentile_rank(nans, 3), _pandas_rank(nans, 3))
+
+
+@pytest.mark.parametrize("timeframe", ["1h", "4h", "1d"])
+def test_legacy_bbwp_on_real_candles(timeframe):
+    raw = json.loads((FIXTURES / f"btc_usdt_bitget_{timeframe}_20260713T1600.json").read_text())
+    df = pd.DataFrame(raw, columns=["timestamp", "open", "high", "low", "close", "volume"])
+    bb = ta.bbands(df["close"], length=20, std=2)
+    bbw = (bb["BBU_20_2.0"] - bb["BBL_20_2.0"]) / bb["BBM_20_2.0"] * 100
+    expected = bbw.rolling(252, min_periods=1).apply(lambda x: x.rank(pct=True).iloc[-1] * 100, raw=False)
+
+    service = IndicatorsService(df.copy())
+    service.calculate_oscillators()
+    np.testing.assert_array_equal(service.df["bbwp"].to_numpy(), expected.to_numpy())
+
+
+def test_rejects_bad_windows():
+    with pytest.raises(ValueError):
+        rolling_percentile_rank(pd.Series([1.0]), 0)
+    with pytest.raises(ValueError):
+        rolling_percentile_rank(pd.Series([1.0]), 3, min_periods=4)
@@ -0,0 +1,155 @@
+"""Cross-instance cache tier: binary encoding, file backend, service wiring."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from controllers.metrics import exchange_clients, indicator_cache
+from controllers.metrics import market_data_service as mds
+from controllers.metrics.cache_stats import STATS
+from controllers.metrics.indicators_service import IndicatorsService
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.setup_evaluation_service import SetupEvaluationService
+from controllers.metrics.shared_cache import (
+    FileSharedCache,
+    decode_arrays,
+    decode_frame,
+    encode_arrays,
+    encode_frame,
+    get_shared_cache,
+)
+
+
+class _CountingExchange:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=500):
+        self.calls += 1
+        return [list(r) for r in self.rows[-limit:]]
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    monkeypatch.setenv("SHARED_CACHE_URL", f"file://{tmp_path / 'shared'}")
+    MarketDataService.clear_cache()
+    indicator_cache.clear()
+    exchange_clients.reset_pools()
+    STATS.reset()
+    yield
+    MarketDataService.clear_cache()
+    indicator_cache.clear()
+    exchange_clients.reset_pools()
+
+
+def test_frame_round_trip_keeps_dtypes_strings_and_index():
+    index = pd.date_range("2026-01-01", periods=4, freq="h", tz="UTC", name="datetime")
+    df = pd.DataFrame(
+        {
+            "close": [1.5, np.nan, 3.0, 4.25],
+            "n": np.array([1, 2, 3, 4], dtype=np.int64),
+            "flag": [True, False, True, False],
+            "ao_color": [None, "red", "green", "red"],
+        },
+        index=index,
+    )
+    back = decode_frame(encode_frame(df))
+    pd.testing.assert_frame_equal(back, df, check_freq=False)
+
+    # Anything that is not numeric/bool/string is simply not shared.
+    assert encode_frame(df.assign(obj=[object()] * 4)) is None
+
+
+def test_structured_block_round_trip_is_compact():
+    block = mds._pack(MarketDataService._to_frame([[i * 60_000, 1, 2, 0.5, 1.5, 7] for i in range(100)]))
+    payload = encode_arrays({"depth": 100}, {"block": block})
+    meta, arrays = decode_arrays(payload)
+    assert meta == {"depth": 100}
+    np.testing.assert_array_equal(arrays["block"], block)
+    assert len(payload) < block.nbytes + 512  # raw buffer + a small header
+
+
+def test_file_backend_expires_entries(tmp_path):
+    store = FileSharedCache(str(tmp_path / "store"))
+    store.set("k", b"payload", 60)
+    assert store.get("k") == b"payload"
+    store.set("k", b"payload", -1)
+    assert store.get("k") is None
+    assert store.get("missing") is None
+
+
+def test_file_backend_sweeps_entries_nobody_reads_again(tmp_path):
+    directory = tmp_path / "store"
+    store = FileSharedCache(str(directory), sweep_every=4)
+    store.set("old-candle", b"x" * 10, -1)  # expired, never read again
+    store.set("live", b"x" * 10, 60)
+    (directory / ".tmp-crashed").write_bytes(b"half")
+    os.utime(directory / ".tmp-crashed", (0, 0))
+    assert len(os.listdir(directory)) == 3
+
+    store.set("a", b"x", 60)
+    store.set("b", b"x", 60)  # 4th write: sweep
+    assert sorted(os.listdir(directory)) == sorted(os.path.basename(store._path(k)) for k in ("live", "a", "b"))
+
+
+def test_file_backend_caps_the_directory_size(tmp_path):
+    store = FileSharedCache(str(tmp_path / "store"), max_bytes=3 * 108)
+    for i in range(6):
+        store.set(f"k{i}", b"x" * 100, 60 + i)  # 108 bytes on disk each
+    assert store.sweep() == 3
+    # The entries closest to expiry went first.
+    assert [store.get(f"k{i}") is not None for i in range(6)] == [False] * 3 + [True] * 3
+
+
+def test_second_instance_reads_candles_instead_of_fetching():
+    rows = [[i * 3_600_000, 1, 2, 0.5, 1.5, 10] for i in range(50)]
+    first = MarketDataService(exchange_name="binance")
+    first.exchange = _CountingExchange(rows)
+    expected = first.get_ohlcv("BTC/USDT", "1h", 50, drop_forming=False)
+
+    MarketDataService.clear_cache()  # a fresh instance: cold in-process cache
+    second = MarketDataService(exchange_name="binance")
+    second.exchange = _CountingExchange(rows)
+    got = second.get_ohlcv("BTC/USDT", "1h", 30, drop_forming=False)
+
+    assert second.exchange.calls == 0
+    pd.testing.assert_frame_equal(got, expected.tail(30))
+    assert STATS.snapshot()["ohlcv_shared"]["1h"]["hits"] == 1
+
+    # A deeper request than was shared goes to the exchange.
+    MarketDataService.clear_cache()
+    second.get_ohlcv("BTC/USDT", "1h", 60, drop_forming=False)
+    assert second.exchange.calls == 1
+
+
+def test_disabled_without_url(monkeypatch):
+    monkeypatch.delenv("SHARED_CACHE_URL")
+    assert get_shared_cache() is None
+    svc = MarketDataService(exchange_name="binance")
+    svc.exchange = _CountingExchange([[i * 3_600_000, 1, 1, 1, 1, 1] for i in range(5)])
+    svc.get_ohlcv("BTC/USDT", "1h", 5)
+    MarketDataService.clear_cache()
+    svc.get_ohlcv("BTC/USDT", "1h", 5)
+    assert svc.exchange.calls == 2
+
+
+def test_enriched_frame_is_computed_once_across_instances(monkeypatch):
+    computed = []
+    original = IndicatorsService.calculate_all
+
+    def counting(self, *args, **kwargs):
+        computed.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(IndicatorsService, "calculate_all", counting)
+    first = SetupEvaluationService(symbol="BTC/USDT", exchange="replay")._enriched_frame("4h")
+
+    indicator_cache.clear()
+    second = SetupEvaluationService(symbol="BTC/USDT", exchange="replay")._enriched_frame("4h")
+
+    assert len(computed) == 1
+    pd.testing.assert_frame_equal(second, first)
+    assert STATS.snapshot()["enriched_shared"]["4h"]["hits"] == 1
@@ -0,0 +1,152 @@
+"""Single-flight coalescing of concurrent cache misses (threads + asyncio)."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import pytest
+
+from controllers.metrics.market_data_service import MarketDataService
+from controllers.metrics.single_flight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    MarketDataService.clear_cache()
+    yield
+    MarketDataService.clear_cache()
+
+
+class _SlowExchange:
+    """Blocks inside fetch_ohlcv long enough for every caller to pile up."""
+
+    def __init__(self, payload: List[List[Any]], delay: float = 0.2):
+        self.payload = payload
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", limit: int = 500):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [list(row) for row in self.payload[-limit:]]
+
+
+def test_concurrent_misses_issue_a_single_fetch():
+    svc = MarketDataService(exchange_name="bitget")
+    fake = _SlowExchange([[i * 60_000, i, i, i, i, 1] for i in range(20)])
+    svc.exchange = fake
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(lambda _: svc.get_ohlcv("BTC/USDT", "1h", 20), range(8)))
+
+    assert fake.calls == 1
+    assert all(len(frame) == len(frames[0]) for frame in frames)
+
+
+def test_waiter_needing_more_rows_grows_after_the_leader():
+    svc = MarketDataService(exchange_name="bitget")
+    fake = _SlowExchange([[i * 60_000, i, i, i, i, 1] for i in range(20)])
+    svc.exchange = fake
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        small = pool.submit(svc.get_ohlcv, "BTC/USDT", "1h", 5)
+        time.sleep(0.05)  # the 5-row fetch is in flight
+        large = pool.submit(svc.get_ohlcv, "BTC/USDT", "1h", 20)
+        assert len(small.result()) <= 5
+        assert len(large.result()) >= 19
+
+    assert fake.calls == 2
+
+
+def test_leader_exception_is_shared_with_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def boom():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("exchange down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", boom)
+        started.wait()
+        waiter = pool.submit(flight.do, "k", lambda: "never runs")
+        with pytest.raises(RuntimeError):
+            leader.result()
+        with pytest.raises(RuntimeError):
+            waiter.result()
+    assert flight.in_flight() == 0
+
+
+def test_async_and_threaded_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "frame"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0.01)
+        async_waiter = flight.do_async("k", fetch)
+        thread_waiter = asyncio.to_thread(flight.do, "k", lambda: "unused")
+        return await asyncio.gather(leader, async_waiter, thread_waiter)
+
+    results = asyncio.run(scenario())
+    assert calls == [1]
+    assert results == [("frame", False), ("frame", True), ("frame", True)]
+
+
+def test_cancelled_waiter_leaves_the_shared_call_alone():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "frame"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.do_async("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()  # a client disconnects
+        with pytest.raises(asyncio.CancelledError):
+            await waiters[0]
+        return await asyncio.gather(leader, waiters[1])
+
+    assert asyncio.run(scenario()) == [("frame", False), ("frame", True)]
+    assert calls == [1]
+    assert flight.in_flight() == 0
+
+
+def test_cancelled_leader_hands_the_call_to_a_waiter():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "frame"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(flight.do_async("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    # One waiter re-runs the call, the other shares it.
+    assert sorted(asyncio.run(scenario())) == [("frame", False), ("frame", True)]
+    assert calls == [1, 1]
+    assert flight.in_flight() == 0
@@ -15,7 +15,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from controllers.metrics import movements_service as ms_module
+from controllers.metrics import indicator_cache
+from controllers.metrics.indicators_service import IndicatorsService
 from controllers.metrics.movements_service import MovementsService
 from controllers.metrics.backtest_service import BacktestService
 from controllers.metrics.sizing_profiles import ATR_PROFILES
@@ -42,9 +43,17 @@ def _flat_df(price: float = ENTRY_PRICE, n: int = 300) -> pd.DataFrame:
         index=pd.date_range("2025-01-01", periods=n, freq="h", tz="UTC"),
     )
     df.index.name = "datetime"
+    df.insert(0, "timestamp", df.index.asi8 // 1_000_000)  # cacheable, like live frames
     return df
 
 
+@pytest.fixture(autouse=True)
+def _empty_indicator_cache():
+    indicator_cache.clear()
+    yield
+    indicator_cache.clear()
+
+
 def _live_sizing(monkeypatch, risk_profile: str) -> dict:
     """Run MovementsService with a forced ATR and a fixed entry price."""
     df = _flat_df()
@@ -52,11 +61,13 @@ def _live_sizing(monkeypatch, risk_profile: str) -> dict:
     df.iloc[-1, df.columns.get_loc("close")] = ENTRY_PRICE
     monkeypatch.setattr(MovementsService, "_load_market_data", lambda self: df)
 
-    real_calc_all = ms_module.IndicatorsService.calculate_all
+    # Forced where the live path computes it: `indicator_cache` runs the
+    # steps on a miss.
+    real_run_steps = IndicatorsService.run_steps
     monkeypatch.setattr(
-        ms_module.IndicatorsService,
-        "calculate_all",
-        lambda self: {**real_calc_all(self), "atr": ATR},
+        IndicatorsService,
+        "run_steps",
+        lambda self, steps: {**real_run_steps(self, steps), "atr": ATR},
     )
 
     svc = MovementsService(
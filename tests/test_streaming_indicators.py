@@ -0,0 +1,143 @@
+"""Parity of `StreamingIndicators` with the batch `IndicatorsService`.
+
+The stream must reproduce the batch columns bit for bit (NaN warmup
+included) on real candles, produce the same `calculate_all` dict, and
+resume from a JSON snapshot exactly where it left off.
+"""
+
+import json
+import math
+import pathlib
+
+import numpy as np
+import pandas as pd
+import pandas_ta_classic as ta
+import pytest
+
+from controllers.metrics.indicators_service import IndicatorsService
+from controllers.metrics.streaming_indicators import (
+    Ewm,
+    RollingExtreme,
+    RollingMean,
+    RollingStd,
+    RollingSum,
+    RollingVar,
+    StreamingIndicators,
+)
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+TIMEFRAMES = ["1h", "4h", "1d"]
+
+
+def _candles(timeframe: str) -> pd.DataFrame:
+    raw = json.loads((FIXTURES / f"btc_usdt_bitget_{timeframe}_20260713T1600.json").read_text())
+    return pd.DataFrame(raw, columns=["timestamp", "open", "high", "low", "close", "volume"])
+
+
+def _assert_identical(actual, expected) -> None:
+    np.testing.assert_array_equal(np.asarray(actual, dtype="float64"), np.asarray(expected, dtype="float64"))
+
+
+def _feed(primitive, values):
+    return [primitive.update(value) for value in values]
+
+
+@pytest.mark.parametrize("timeframe", TIMEFRAMES)
+def test_columns_match_the_batch_bit_for_bit(timeframe):
+    df = _candles(timeframe)
+    service = IndicatorsService(df)
+    service.calculate_all()
+    rows = StreamingIndicators().run(df)
+
+    shared = [column for column in rows.columns if column in service.df.columns and column != "ao_color"]
+    assert len(shared) == 26
+    for column in shared:
+        _assert_identical(rows[column], service.df[column])
+    assert rows["ao_color"].tolist() == service.df["ao_color"].tolist()
+
+    stoch = ta.stochrsi(df["close"], length=14)
+    _assert_identical(rows["stoch_rsi_k"], stoch["STOCHRSIk_14_14_3_3"])
+    _assert_identical(rows["stoch_rsi_d"], stoch["STOCHRSId_14_14_3_3"])
+    _assert_identical(rows["volatility_20"], df["close"].pct_change().rolling(20).std() * 100)
+
+
+@pytest.mark.parametrize("timeframe", TIMEFRAMES)
+def test_summary_matches_calculate_all(timeframe):
+    df = _candles(timeframe)
+    engine = StreamingIndicators()
+    engine.run(df)
+    assert engine.summary() == IndicatorsService(df).calculate_all()
+
+
+def test_snapshot_round_trips_through_json_and_resumes():
+    df = _candles("1h")
+    straight = StreamingIndicators()
+    expected = straight.run(df)
+
+    first = StreamingIndicators()
+    head = first.run(df.iloc[:300])
+    resumed = StreamingIndicators()
+    resumed.restore(json.loads(json.dumps(first.snapshot())))
+    tail = resumed.run(df.iloc[300:])
+
+    assert resumed.bars == len(df)
+    combined = pd.concat([head, tail])
+    for column in expected.columns:
+        if column == "ao_color":
+            assert combined[column].tolist() == expected[column].tolist()
+        else:
+            _assert_identical(combined[column], expected[column])
+    assert resumed.summary() == straight.summary()
+
+
+def test_update_folds_one_candle():
+    df = _candles("4h")
+    engine = StreamingIndicators()
+    engine.run(df.iloc[:-1])
+    row = engine.update(df.iloc[-1][["open", "high", "low", "close", "volume"]].to_dict())
+    service = IndicatorsService(df)
+    service.calculate_all()
+    assert row["rsi14"] == service.df["rsi14"].iloc[-1]
+    assert row["tsa_trend_speed"] == service.df["tsa_trend_speed"].iloc[-1]
+    assert engine.bars == len(df)
+
+
+@pytest.mark.parametrize("window", [1, 3, 25])
+def test_rolling_primitives_match_pandas(window):
+    rng = np.random.default_rng(window)
+    data = np.r_[np.full(30, 3.3), rng.normal(size=80), np.full(20, -1.1), rng.normal(1e4, 1.0, size=80)]
+    data[rng.choice(len(data), 15, replace=False)] = np.nan
+    data[40], data[41] = np.inf, -np.inf
+    series = pd.Series(data)
+    rolling = series.rolling(window)
+    loose = series.rolling(window, min_periods=1)
+
+    _assert_identical(_feed(RollingMean(window), data), rolling.mean())
+    _assert_identical(_feed(RollingMean(window, min_periods=1), data), loose.mean())
+    _assert_identical(_feed(RollingSum(window), data), rolling.sum())
+    for ddof in (0, 1):
+        _assert_identical(_feed(RollingVar(window, ddof=ddof), data), rolling.var(ddof=ddof))
+        _assert_identical(_feed(RollingStd(window, ddof=ddof), data), rolling.std(ddof=ddof))
+    _assert_identical(_feed(RollingExtreme(window), data), rolling.max())
+    _assert_identical(_feed(RollingExtreme(window, kind="min", min_periods=1), data), loose.min())
+
+
+def test_ewm_matches_pandas():
+    rng = np.random.default_rng(7)
+    data = rng.normal(size=300)
+    data[[0, 1, 50, 51, 52]] = np.nan
+    series = pd.Series(data)
+    alpha = 1 / 14
+    _assert_identical(
+        _feed(Ewm.from_alpha(alpha, min_periods=14), data), series.ewm(alpha=alpha, min_periods=14).mean()
+    )
+    _assert_identical(_feed(Ewm.from_span(26, adjust=False), data), series.ewm(span=26, adjust=False).mean())
+
+
+def test_short_history_stays_in_warmup():
+    df = _candles("1d").iloc[:30]
+    rows = StreamingIndicators().run(df)
+    assert rows["ema200"].isna().all() and rows["sma50"].isna().all()
+    assert not math.isnan(rows["rsi14"].iloc[-1])
+    with pytest.raises(ValueError):
+        RollingExtreme(5, kind="median")
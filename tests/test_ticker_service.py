@@ -44,3 +44,122 @@ def test_non_numeric_fields_become_null():
     payload = svc.fetch("BTC/USDT")
     assert payload["last"] == 100.0
     assert payload["bid"] is None and payload["ask"] is None
+
+
+class _BulkExchange(_FakeExchange):
+    def __init__(self, bad=()):
+        super().__init__()
+        self.bulk_calls = []
+        self.bad = set(bad)
+
+    def fetch_ticker(self, symbol):
+        if symbol in self.bad:
+            raise ValueError(f"bad symbol {symbol}")
+        return super().fetch_ticker(symbol)
+
+    def fetch_tickers(self, symbols):
+        self.bulk_calls.append(sorted(symbols))
+        if self.bad & set(symbols):
+            raise ValueError("bad symbol in batch")
+        return {s: {"symbol": s, "last": 1.0, "bid": 0.9, "ask": 1.1, "timestamp": 1} for s in symbols}
+
+
+def test_fetch_many_fetches_only_the_misses_in_one_call():
+    ex = _BulkExchange()
+    svc = TickerService(exchange="bitget", client=ex)
+    svc.fetch("BTC/USDT")
+    payloads = svc.fetch_many(["ETH/USDT", "BTC/USDT", "SOL/USDT", "ETH/USDT"])
+    assert [p["symbol"] for p in payloads] == ["ETH/USDT", "BTC/USDT", "SOL/USDT"]
+    assert ex.bulk_calls == [["ETH/USDT", "SOL/USDT"]]
+    assert ex.calls == 1  # only the first single fetch
+
+
+def test_fetch_many_rejects_empty_and_oversized_requests():
+    import pytest
+
+    svc = TickerService(exchange="bitget", client=_BulkExchange())
+    with pytest.raises(ValueError, match="al menos"):
+        svc.fetch_many([" ", ""])
+    with pytest.raises(ValueError, match="Máximo"):
+        svc.fetch_many([f"C{i}/USDT" for i in range(101)])
+
+
+def test_concurrent_single_fetches_are_merged(monkeypatch):
+    import threading
+
+    from controllers.metrics import ticker_service
+
+    monkeypatch.setattr(ticker_service._BATCHER, "window_s", 0.1)
+    ex = _BulkExchange()
+    symbols = [f"C{i}/USDT" for i in range(8)]
+    results = {}
+
+    def worker(symbol):
+        results[symbol] = TickerService(exchange="bitget", client=ex).fetch(symbol)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in symbols]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert ex.bulk_calls == [sorted(symbols)]
+    assert ex.calls == 0
+    assert {s: p["symbol"] for s, p in results.items()} == {s: s for s in symbols}
+
+
+def test_bad_symbol_only_fails_its_own_request(monkeypatch):
+    import asyncio
+
+    import pytest
+
+    from controllers.metrics import ticker_service
+
+    monkeypatch.setattr(ticker_service._BATCHER, "window_s", 0.05)
+    ex = _BulkExchange(bad={"NOPE/USDT"})
+    svc = TickerService(exchange="bitget", client=ex)
+
+    async def run():
+        return await asyncio.gather(
+            svc.fetch_async("BTC/USDT"), svc.fetch_async("NOPE/USDT"), svc.fetch_async("ETH/USDT"),
+            return_exceptions=True,
+        )
+
+    btc, nope, eth = asyncio.run(run())
+    assert len(ex.bulk_calls) == 1  # merged, then retried one by one
+    assert btc["symbol"] == "BTC/USDT" and eth["symbol"] == "ETH/USDT"
+    assert isinstance(nope, ValueError)
+    with pytest.raises(ValueError):
+        svc.fetch("NOPE/USDT")
+
+
+def test_cache_is_bounded():
+    from controllers.metrics import ticker_service
+
+    assert ticker_service._CACHE.maxsize == 1024
+    assert ticker_service._CACHE.ttl <= 10
+
+
+def test_batch_endpoint(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from controllers.metrics import exchange_clients
+
+    monkeypatch.setenv("API_KEYS", "test-key")
+    from routes import routes
+
+    exchange_clients.reset_pools()
+    app = FastAPI()
+    app.include_router(routes)
+    client = TestClient(app)
+    resp = client.get(
+        "/v1/ticker/batch",
+        params={"symbols": "BTC/USDT,ETH/USDT", "exchange": "replay"},
+        headers={"X-API-Key": "test-key"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["exchange"] == "replay"
+    assert [t["symbol"] for t in body["tickers"]] == ["BTC/USDT", "ETH/USDT"]
+    assert all(t["last"] > 0 for t in body["tickers"])
+    exchange_clients.reset_pools()
@@ -58,6 +58,23 @@ def test_pine_hma_composition():
     assert np.isnan(out[:5]).all()  # wma(5) na until bar 4, hma adds one more
 
 
+def test_pine_wma_sums_newest_first_and_stays_na_strict():
+    rng = np.random.default_rng(11)
+    values = np.cumsum(rng.normal(0, 1e3, 500))
+    values[[7, 300]] = np.nan
+    for length in (1, 2, 3, 5):
+        out = pine_wma(values, length)
+        for i in range(len(values)):
+            window = values[max(0, i - length + 1): i + 1]
+            if i < length - 1 or np.isnan(window).any():
+                assert np.isnan(out[i]), (length, i)
+                continue
+            total = length * values[i]
+            for lag in range(1, length):
+                total = total + (length - lag) * values[i - lag]
+            assert out[i] == total / (length * (length + 1) / 2), (length, i)
+
+
 # ---------------------------------------------------------------------------
 # Dynamic EMA warmup (bar-exact Pine semantics)
 # ---------------------------------------------------------------------------
@@ -190,6 +207,38 @@ def test_wave_records_and_stats_recomputed_independently():
         assert stats["current_ratio_avg"] == pytest.approx(last_speed / abs(np.mean(clean_bear)))
 
 
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_wave_records_are_exact_on_long_series(seed):
+    """The per-wave reductions reproduce Pine's `highest/lowest(speed, N)`
+    window bit for bit over thousands of waves, including back-to-back
+    crosses (empty range: the previous bar's speed) and the na warmup."""
+    open_, close = _ohlc(5000, seed=seed)
+    result = trend_speed_analyzer(open_, close, lookback_period=10_000)
+    closes = close.to_numpy()
+    dyn = result.frame["dyn_ema"].to_numpy()
+    speed_hist = result.frame["speed"].to_numpy().tolist()
+
+    bull, bear, bull_t, bear_t = [], [], [], []
+    x1 = 0
+    for i in range(1, len(closes)):
+        up = closes[i] > dyn[i] and closes[i - 1] <= dyn[i]
+        down = closes[i] < dyn[i] and closes[i - 1] >= dyn[i]
+        if not (up or down):
+            continue
+        window = speed_hist[max(0, i - max(1, i - x1) + 1): i] or [speed_hist[i - 1]]
+        extreme = math.nan if any(math.isnan(v) for v in window) else (min(window) if up else max(window))
+        (bear if up else bull).insert(0, extreme)
+        (bear_t if up else bull_t).insert(0, i - x1)
+        x1 = i
+
+    assert len(bull) + len(bear) > 500
+    assert 1 in bull_t + bear_t  # back-to-back crosses happen
+    np.testing.assert_array_equal(result.bullish_waves, bull)
+    np.testing.assert_array_equal(result.bearish_waves, bear)
+    assert result.stats["bull_avg_duration"] == pytest.approx(np.mean(bull_t))
+    assert result.stats["bear_avg_duration"] == pytest.approx(np.mean(bear_t))
+
+
 def test_stats_are_json_safe_none_not_nan():
     open_, close = _ohlc(50)  # far too short: everything stays na / empty
     stats = trend_speed_analyzer(open_, close).stats